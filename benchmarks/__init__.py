@@ -0,0 +1 @@
+"""Standalone performance benchmarks. Run a module with `python -m benchmarks.<name>`."""
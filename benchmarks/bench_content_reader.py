@@ -0,0 +1,96 @@
+"""
+Benchmark: reading a mixed-encoding corpus with the old and tiered decoders.
+
+The corpus is the text of test_data plus synthetic source files: mostly
+ASCII and UTF-8, with folders of Latin-1, cp1252, Shift-JIS and UTF-16
+files in the proportions a legacy codebase might have.
+
+- legacy: chardet.detect on every file's full bytes (the old reader)
+- tiered: FileContentReader with TextDecoder
+
+    python -m benchmarks.bench_content_reader [--copies N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import chardet
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.infrastructure.filesystem.text_decoder import TextDecoder
+
+TEST_DATA = Path(__file__).resolve().parent.parent / 'test_data'
+
+_ASCII = "def handler(request):\n    return respond(request.args, status=200)\n" * 300
+_UTF8 = "# Überprüfung der Eingabe — naïve café résumé ✓\nvalue = compute()\n" * 300
+_LATIN = "# Überprüfung der Eingabe, café résumé\nvalue = compute()\n" * 300
+_JAPANESE = "# 入力の検証を行います。日本語のコメントです。\nvalue = compute()\n" * 200
+
+# folder, suffix, text, encoding, files per copy
+_MIX = [
+    ('src', '.py', _ASCII, 'ascii', 60),
+    ('i18n', '.py', _UTF8, 'utf-8', 25),
+    ('legacy', '.txt', _LATIN, 'latin-1', 8),
+    ('win', '.ini', _LATIN, 'cp1252', 4),
+    ('jp', '.txt', _JAPANESE, 'shift_jis', 2),
+    ('wide', '.rc', _ASCII, 'utf-16', 1),
+]
+
+
+def _build_corpus(root: Path, copies: int) -> list[Path]:
+    files = []
+    for copy in range(copies):
+        for folder, suffix, text, encoding, count in _MIX:
+            directory = root / f'c{copy:02}' / folder
+            directory.mkdir(parents=True)
+            for i in range(count):
+                path = directory / f'f{i:03}{suffix}'
+                path.write_bytes(text.encode(encoding))
+                files.append(path)
+        for source in sorted(p for p in TEST_DATA.rglob('*') if p.is_file()):
+            target = root / f'c{copy:02}' / 'test_data' / source.relative_to(TEST_DATA)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(source.read_bytes())
+            files.append(target)
+    return files
+
+
+def _legacy_read(path: Path) -> str:
+    raw = path.read_bytes()
+    if not raw:
+        return ''
+    encoding = chardet.detect(raw).get('encoding') or 'utf-8'
+    return raw.decode(encoding, errors='replace')
+
+
+def _time(read, files) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    texts = [read(path) for path in files]
+    return time.perf_counter() - start, texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = _build_corpus(Path(tmp), args.copies)
+        megabytes = sum(p.stat().st_size for p in files) / 1e6
+
+        legacy, legacy_texts = _time(_legacy_read, files)
+        decoder = TextDecoder()
+        tiered, tiered_texts = _time(FileContentReader(decoder).read, files)
+
+        differing = sum(a != b for a, b in zip(legacy_texts, tiered_texts))
+        print(f"{len(files)} files, {megabytes:.1f} MB")
+        print(f"{'legacy':>8} {legacy:7.2f}s {megabytes / legacy:8.1f} MB/s")
+        print(f"{'tiered':>8} {tiered:7.2f}s {megabytes / tiered:8.1f} MB/s  ({legacy / tiered:.0f}x)")
+        print(f"tiers: {dict(decoder.stats)}")
+        print(f"{differing} files decoded differently (chardet guesses on whole files vs. strict UTF-8)")
+
+
+if __name__ == '__main__':
+    main()
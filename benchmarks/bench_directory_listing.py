@@ -0,0 +1,97 @@
+"""
+Benchmark: classifying directory entries with stat calls vs. os.scandir d_type.
+
+Builds a synthetic tree (100 top dirs x 10 subdirs x 100 files = 100k files)
+and walks it with IncludeEverythingFilter two ways:
+
+- legacy: os.listdir + Path.is_file / Path.is_dir per entry (the old walker)
+- typed:  DirectoryWalker over OsFilesystemQuery.scan_directory
+
+stat() calls are counted by wrapping os.stat, which pathlib uses for
+is_file / is_dir; os.scandir classifies entries in C without it.
+
+    python -m benchmarks.bench_directory_listing [--files_per_dir N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from gpt_automation.domain.filters.file_filter import IncludeEverythingFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+
+
+def _build_tree(root: Path, top: int, sub: int, files: int) -> None:
+    for i in range(top):
+        for j in range(sub):
+            d = root / f'd{i:03}' / f's{j:02}'
+            d.mkdir(parents=True)
+            for k in range(files):
+                (d / f'f{k:03}.txt').touch()
+
+
+def _legacy_walk(current: Path, collected: list) -> None:
+    """The pre-scandir DirectoryWalker loop, minus filtering."""
+    if not current.is_dir():
+        return
+    for entry in sorted(current / name for name in os.listdir(current)):
+        if entry.is_file():
+            collected.append(entry)
+        elif entry.is_dir():
+            _legacy_walk(entry, collected)
+
+
+@contextmanager
+def _count_stat_calls():
+    counter = {'stat': 0}
+    real_stat = os.stat
+
+    def counting_stat(*args, **kwargs):
+        counter['stat'] += 1
+        return real_stat(*args, **kwargs)
+
+    os.stat = counting_stat
+    try:
+        yield counter
+    finally:
+        os.stat = real_stat
+
+
+def _measure(label: str, walk) -> None:
+    with _count_stat_calls() as counter:
+        start = time.perf_counter()
+        found = walk()
+        elapsed = time.perf_counter() - start
+    print(f"{label:>8}: {len(found):>7} files  {elapsed * 1000:>8.1f} ms  {counter['stat']:>7} stat() calls")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files_per_dir', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_tree(root, top=100, sub=10, files=args.files_per_dir)
+        walker = DirectoryWalker(OsFilesystemQuery())
+
+        def legacy():
+            collected = []
+            _legacy_walk(root, collected)
+            return collected
+
+        def typed():
+            return walker.collect_matching_files(root, IncludeEverythingFilter())
+
+        # Warm the dentry cache so both runs see the same page-cache state
+        legacy()
+        _measure('legacy', legacy)
+        _measure('scandir', typed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: cold walk vs. a walk answered from the persistent file index.
+
+Builds a synthetic project (100 top dirs x 10 subdirs x 100 files = 100k
+files, a .gitignore at the root and in every top dir) and runs the full
+ignore/include-only/blocklist filter chain three ways:
+
+- cold:   no index (every directory listed, every path matched)
+- warm:   second run against a saved index, nothing changed
+- edited: one file added and one nested .gitignore changed since the index
+
+Index load and save times are reported separately.
+
+    python -m benchmarks.bench_file_index [--files_per_dir N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from gpt_automation.container import AppContainer
+
+
+def _build_project(root: Path, top: int, sub: int, files: int) -> None:
+    (root / '.gitignore').write_text('*.log\nbuild/\n')
+    for i in range(top):
+        (root / f'd{i:03}').mkdir()
+        (root / f'd{i:03}' / '.gitignore').write_text('*.tmp\n')
+        for j in range(sub):
+            d = root / f'd{i:03}' / f's{j:02}'
+            d.mkdir()
+            for k in range(files):
+                (d / f'f{k:03}.{"log" if k % 10 == 0 else "txt"}').touch()
+
+
+def _age(*paths, seconds: int = 3600) -> None:
+    """Backdate mtimes so nothing falls inside the racy window."""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def _age_tree(root: Path) -> None:
+    for dirpath, dirnames, filenames in os.walk(root):
+        _age(*(os.path.join(dirpath, name) for name in dirnames + filenames))
+    _age(root)
+
+
+def _measure(label: str, root: Path, use_cache: bool) -> list:
+    start = time.perf_counter()
+    container = AppContainer(root, use_cache=use_cache)
+    _ = container.file_index
+    loaded = time.perf_counter()
+
+    walker = container.directory_walker
+    file_filter = container.filter_builder.build_for_traversal(root, root, [])
+    found = walker.collect_matching_files(root, file_filter)
+    walked = time.perf_counter()
+
+    if container.file_index is not None:
+        container.file_index.save()
+    saved = time.perf_counter()
+
+    print(f"{label:>7}: {len(found):>7} files  load {(loaded - start) * 1000:>6.1f} ms"
+          f"  walk {(walked - loaded) * 1000:>8.1f} ms  save {(saved - walked) * 1000:>6.1f} ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files_per_dir', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        AppContainer(root).initialize_project.run([])
+        _build_project(root, top=100, sub=10, files=args.files_per_dir)
+        _age_tree(root)
+
+        cold = _measure('cold', root, use_cache=False)
+        _measure('first', root, use_cache=True)
+        warm = _measure('warm', root, use_cache=True)
+        assert warm == cold, "cached walk diverged from the cold walk"
+
+        (root / 'd050' / 's05' / 'new.txt').touch()
+        (root / 'd070' / '.gitignore').write_text('*.tmp\nf00*\n')
+        _age(root / 'd050' / 's05' / 'new.txt', root / 'd050' / 's05', root / 'd070' / '.gitignore',
+             seconds=60)
+        edited = _measure('edited', root, use_cache=True)
+        assert edited == _measure('check', root, use_cache=False)
+
+
+if __name__ == '__main__':
+    main()
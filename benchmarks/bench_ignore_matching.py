@@ -0,0 +1,63 @@
+"""
+Benchmark: per-path cost of ignore matching as the number of patterns grows.
+
+Compares the legacy behaviour (re-compile every stack level on every check)
+with the compiled stack IgnoreVisitor now keeps. Run from the repo root:
+
+    python -m benchmarks.bench_ignore_matching
+"""
+
+import os
+import tempfile
+import time
+
+from gpt_automation.plugins.ignore_plugin.filters import load_ignore_matches
+from gpt_automation.plugins.ignore_plugin.ignore_visitor import IgnoreVisitor
+
+PATTERN_COUNTS = [10, 50, 100, 200, 400]
+PATHS_PER_RUN = 500
+
+
+def _write_gitignore(root: str, count: int) -> None:
+    # Exact names, *.suffix globs and general wildcards in equal measure
+    patterns = [f"build_{i}/\n*.ext{i}\ntmp{i}_*.c\n" for i in range(count // 3)]
+    with open(os.path.join(root, '.gitignore'), 'w') as f:
+        f.writelines(patterns)
+
+
+def _sample_paths(root: str) -> list[str]:
+    return [os.path.join(root, 'src', f'pkg{i % 20}', f'module{i}.py') for i in range(PATHS_PER_RUN)]
+
+
+def _legacy_check(file_path, raw_stack) -> bool:
+    """The pre-compilation code path: build an IgnoreMatch per level per check."""
+    for pairs in reversed(raw_stack):
+        match = load_ignore_matches(pairs)
+        if match and match.match(file_path):
+            return True
+    return False
+
+
+def _time_per_path(fn, paths) -> float:
+    start = time.perf_counter()
+    for p in paths:
+        fn(p)
+    return (time.perf_counter() - start) / len(paths) * 1e6
+
+
+def main() -> None:
+    print(f"{'patterns':>8} {'legacy us/path':>15} {'compiled us/path':>17} {'speedup':>8}")
+    for count in PATTERN_COUNTS:
+        with tempfile.TemporaryDirectory() as root:
+            _write_gitignore(root, count)
+            visitor = IgnoreVisitor(root, root, ignore_filenames=['.gitignore'])
+            raw_stack = [m.base_pattern_pairs if m else [] for m in visitor.ignore_patterns_stack]
+            paths = _sample_paths(root)
+
+            legacy = _time_per_path(lambda p: _legacy_check(p, raw_stack), paths)
+            compiled = _time_per_path(visitor.should_visit_file, paths)
+            print(f"{count:>8} {legacy:>15.1f} {compiled:>17.1f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
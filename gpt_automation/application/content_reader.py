@@ -0,0 +1,159 @@
+"""
+Read file contents for prompts: text with its encoding, hash and tokens.
+
+Binary files are summarised without reading them whole, large files are
+excerpted, and with a ContentCache unchanged files are not read at all.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from gpt_automation.domain.tokens import estimate_tokens, estimate_tokens_from_size
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent, FileSignature
+from gpt_automation.infrastructure.filesystem.text_decoder import SNIFF_SIZE, TextDecoder, looks_binary
+
+
+# Tokens of the marker between the head and tail of an excerpt
+_MARKER_TOKENS = 16
+
+
+class FileContentReader:
+    """
+    Read a file's text content, handling encoding gracefully.
+
+    Only a leading block is read first; binary files end there and are
+    summarised with a one-line placeholder. Files above a caller's size
+    threshold are shown as their first and last excerpt_bytes, read with a
+    seek, around a marker saying how much was left out; a file the two
+    excerpts would cover anyway is read whole. stats counts both
+    kinds, and the bytes that were never read, for the whole run.
+
+    With a ContentCache, a file whose (mtime_ns, size, inode) is unchanged
+    since an earlier run is not read at all. Excerpts are not cached: the
+    threshold depends on the run's profiles.
+    """
+
+    def __init__(
+        self,
+        decoder: Optional[TextDecoder] = None,
+        cache: Optional[ContentCache] = None,
+        excerpt_bytes: int = 16 * 1024,
+    ):
+        self._decoder = decoder or TextDecoder()
+        self._cache = cache
+        self._excerpt_bytes = excerpt_bytes
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()  # read() runs on a thread pool
+
+    def read(self, file_path: Path) -> str:
+        """Return file content as a string, or a placeholder on error."""
+        return self.read_content(file_path).text
+
+    def read_content(
+        self,
+        file_path: Path,
+        st: Optional[os.stat_result] = None,
+        large_file_bytes: int = 0,
+    ) -> FileContent:
+        """
+        Text, encoding, raw-bytes hash and tokens of a file; a placeholder
+        (encoding 'error') on error.
+
+        st is the file's stat from the walk's listing, when known: the size
+        check and the cache lookup use it, so a cache hit costs no syscall
+        at all. Files larger than large_file_bytes (0 = no limit) are
+        excerpted, unless they are no larger than the two excerpts.
+        """
+        try:
+            return self._read_content(file_path, st, large_file_bytes)
+        except Exception as e:
+            placeholder = f'[Could not read {file_path.name}: {e}]'
+            return FileContent(placeholder, 'error', '', estimate_tokens(placeholder))
+
+    def estimated_tokens(self, file_path: Path, st: os.stat_result, large_file_bytes: int = 0) -> int:
+        """Tokens of a file without reading it: the cached count, else a guess from its size."""
+        if self._excerpted(st.st_size, large_file_bytes):
+            return estimate_tokens_from_size(2 * self._excerpt_bytes) + _MARKER_TOKENS
+        if self._cache is not None:
+            tokens = self._cache.tokens(file_path, FileSignature.of(st))
+            if tokens is not None:
+                return tokens
+        return estimate_tokens_from_size(st.st_size)
+
+    def _excerpted(self, size: int, large_file_bytes: int) -> bool:
+        # Head and tail would cover the whole file: an excerpt saves nothing
+        # and would lose the partial lines cut at either side
+        return bool(large_file_bytes) and size > large_file_bytes and size > 2 * self._excerpt_bytes
+
+    def _read_content(self, file_path: Path, st: Optional[os.stat_result], large_file_bytes: int) -> FileContent:
+        if st is None:
+            st = os.stat(file_path)
+        if self._excerpted(st.st_size, large_file_bytes):
+            with open(file_path, 'rb') as f:
+                return self._read_excerpt(f, file_path, st.st_size)
+
+        if self._cache is not None:
+            cached = self._cache.get(file_path, FileSignature.of(st))
+            if cached is not None:
+                return cached
+
+        with open(file_path, 'rb') as f:
+            # Not st: the file may have changed since the listing, and the
+            # cache must store the signature of the bytes actually read
+            signature = FileSignature.of(os.fstat(f.fileno()))
+            content = self._detect_and_read(f, file_path, signature.size)
+        if self._cache is not None:
+            self._cache.put(file_path, signature, content)
+        return content
+
+    def _read_excerpt(self, f: BinaryIO, file_path: Path, size: int) -> FileContent:
+        """The first and last whole lines within excerpt_bytes each, around an elision marker."""
+        head = f.read(self._excerpt_bytes)
+        if looks_binary(head[:SNIFF_SIZE]):
+            return self._binary_placeholder(size, len(head))
+        f.seek(max(len(head), size - self._excerpt_bytes))
+        tail = f.read(self._excerpt_bytes)
+
+        # Cut at line breaks, which also keeps multi-byte characters whole
+        end = head.rfind(b'\n')
+        if end >= 0:
+            head = head[:end + 1]
+        start = tail.find(b'\n')
+        if start >= 0:
+            tail = tail[start + 1:]
+        elided = size - len(head) - len(tail)
+        with self._stats_lock:
+            self.stats['excerpted_files'] += 1
+            self.stats['excerpt_bytes_elided'] += elided
+
+        head_text, encoding = self._decoder.decode_with_encoding(head, file_path)
+        marker = f"[... {elided} bytes elided ...]\n"
+        if head_text and not head_text.endswith('\n'):
+            marker = '\n' + marker
+        text = head_text + marker + self._decoder.decode(tail, file_path)
+        return FileContent(text, encoding, '', estimate_tokens(text))
+
+    def _binary_placeholder(self, size: int, read: int) -> FileContent:
+        with self._stats_lock:
+            self.stats['binary_files'] += 1
+            self.stats['binary_bytes_skipped'] += max(0, size - read)
+        placeholder = f'[Binary file, {size} bytes, not shown]'
+        return FileContent(placeholder, 'binary', '', estimate_tokens(placeholder))
+
+    def _detect_and_read(self, f: BinaryIO, file_path: Path, size: int) -> FileContent:
+        """Sniff the leading block; strict UTF-8 first, chardet on a sample only when that fails."""
+        raw = f.read(SNIFF_SIZE)
+        if looks_binary(raw):
+            return self._binary_placeholder(size, len(raw))
+        if len(raw) == SNIFF_SIZE:
+            raw += f.read()
+
+        content_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        if not raw:
+            return FileContent('', 'ascii', content_hash, 0)
+        text, encoding = self._decoder.decode_with_encoding(raw, file_path)
+        return FileContent(text, encoding, content_hash, estimate_tokens(text))
@@ -0,0 +1,123 @@
+"""
+Stages that rewrite file contents between reading and output.
+
+A transform maps a file's text to a shorter text (an outline, a minified
+copy). Computing one is CPU-bound pure Python that holds the GIL, so
+unlike reads it runs on a process pool: each worker gets a file's name and
+text and sends back the result. Results are stored in the content cache
+by the hash of the file's bytes and the transform's kind, so each version
+of a file is transformed once.
+"""
+
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent
+
+# Transforms queued per process, as in parallel_reads
+_QUEUED_PER_PROCESS = 4
+
+# (file name, text) -> (new text, its tokens), or None to keep the text
+TransformFunction = Callable[[str, str], Optional[tuple[str, int]]]
+
+
+class ContentTransformer:
+    """
+    Replaces file texts with function(name, text), keeping their order.
+
+    Subclasses set kind (the cache key), function (a module-level function,
+    so worker processes can import it) and may narrow applies(). Binaries,
+    excerpts and read errors always keep their content (no hash to cache
+    by, or no text to transform), as do files the function returns None
+    for or does not shorten.
+
+    processes <= 1 transforms on the calling thread; otherwise the pool is
+    started at the first file whose result is not cached. stats counts
+    transformed files, actual computations, cache hits and what was saved.
+    """
+
+    kind = ''
+    function: TransformFunction
+
+    def __init__(self, cache: Optional[ContentCache] = None, processes: int = 4):
+        self._cache = cache
+        self._processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats: Counter = Counter()
+
+    def applies(self, entry: DirectoryEntry, content: FileContent) -> bool:
+        return True
+
+    def transformed(
+        self,
+        files: Iterable[tuple[DirectoryEntry, FileContent]],
+        exclude_suffixes: tuple[str, ...] = (),
+    ) -> Iterator[tuple[DirectoryEntry, FileContent]]:
+        """Yield files with their texts transformed, in the same order; exclude_suffixes pass through."""
+        pending: deque = deque()   # (entry, content, future of (text, tokens) or None, computed)
+        limit = max(1, self._processes) * _QUEUED_PER_PROCESS
+        try:
+            for entry, content in files:
+                if entry.path.suffix in exclude_suffixes:
+                    pending.append((entry, content, _done(None), False))
+                else:
+                    pending.append((entry, content, *self._submit(entry, content)))
+                while pending and (len(pending) > limit or pending[0][2].done()):
+                    yield self._finish(*pending.popleft())
+            while pending:
+                yield self._finish(*pending.popleft())
+        finally:
+            if self._pool is not None:
+                # An abandoned generator must not leave work running
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def _submit(self, entry: DirectoryEntry, content: FileContent) -> tuple[Future, bool]:
+        """The future result for a file, and whether it is being computed (not cached)."""
+        if not content.content_hash or content.encoding in ('binary', 'error') \
+                or not self.applies(entry, content):
+            return _done(None), False
+        if self._cache is not None:
+            cached = self._cache.transformed(self.kind, content.content_hash)
+            if cached is not None:
+                self.stats['cached_files'] += 1
+                return _done(cached), False
+        self.stats['computed_files'] += 1
+        function = type(self).function
+        if self._processes <= 1:
+            return _done(function(entry.path.name, content.text)), True
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._processes, mp_context=_mp_context())
+        return self._pool.submit(function, entry.path.name, content.text), True
+
+    def _finish(
+        self, entry: DirectoryEntry, content: FileContent, future: Future, computed: bool,
+    ) -> tuple[DirectoryEntry, FileContent]:
+        result = future.result()
+        if result is not None and computed and self._cache is not None:
+            self._cache.put_transformed(self.kind, content.content_hash, *result)
+        if result is None or len(result[0]) >= len(content.text):
+            return entry, content
+        text, tokens = result
+        self.stats['transformed_files'] += 1
+        self.stats['bytes_saved'] += len(content.text.encode('utf-8', errors='replace')) \
+            - len(text.encode('utf-8', errors='replace'))
+        self.stats['tokens_saved'] += max(0, content.tokens - tokens)
+        return entry, FileContent(text, content.encoding, content.content_hash, tokens)
+
+
+def _done(result) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+def _mp_context():
+    # The reader's threads are running: forking the whole process could
+    # copy a held lock into the workers, so start them from a clean server
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
@@ -0,0 +1,50 @@
+"""
+Repeated files shown once: later copies become a reference to the first.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from gpt_automation.infrastructure.cache.content_cache import FileContent
+
+
+class Deduplicator:
+    """
+    Replaces a file's text with a reference to the first file shown with
+    the same raw bytes (same content hash).
+
+    Deterministic for a given order of files: GeneratePrompts feeds it in
+    walk order, so the first path in sorted order keeps the full text.
+    Files without a hash (binaries, excerpts, read errors) and files
+    shorter than the reference are always shown as they are.
+    """
+
+    def __init__(self, enabled: bool):
+        self._enabled = enabled
+        self._first: dict[str, Path] = {}
+        self.duplicates = 0
+        self.characters_saved = 0
+
+    def text(self, path: Path, content: FileContent) -> str:
+        """What to show for path; remembers it when it is a first occurrence."""
+        reference = self.reference(path, content)
+        if reference is None:
+            self.remember(path, content)
+            return content.text
+        self.duplicates += 1
+        self.characters_saved += len(content.text) - len(reference)
+        return reference
+
+    def reference(self, path: Path, content: FileContent) -> Optional[str]:
+        """The reference that would replace content, or None (nothing is remembered)."""
+        if not self._enabled or not content.content_hash:
+            return None
+        first = self._first.get(content.content_hash)
+        if first is None or first == path:
+            return None
+        reference = f"[Same content as {first}]"
+        return reference if len(reference) < len(content.text) else None
+
+    def remember(self, path: Path, content: FileContent) -> None:
+        if self._enabled and content.content_hash:
+            self._first.setdefault(content.content_hash, path)
@@ -5,14 +5,30 @@ Story: "Walk a directory, filter out irrelevant files, format results as
 a prompt that can be fed to a language model."
 """
 
+import os
 from pathlib import Path
-from dataclasses import dataclass
-
-from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Optional
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.application.deduplication import Deduplicator
+from gpt_automation.application.minifier import ContentMinifier
+from gpt_automation.application.outlines import PYTHON_SUFFIXES, PythonOutliner
+from gpt_automation.application.parallel_reads import read_in_order
+from gpt_automation.application.since_last import ChangesSince, deleted_header, file_header
+from gpt_automation.application.token_budget import BudgetedContents, BudgetReport
+from gpt_automation.application.tree_sizes import DirectorySizes
+from gpt_automation.domain.tokens import estimate_tokens
+from gpt_automation.domain.tree import Collapse, collapsed_tree, render_tree
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, DirectoryWalker, EntryKind
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.cache.prompt_snapshot import PromptSnapshots
 from gpt_automation.infrastructure.filesystem.project_paths import ProjectPaths
-from gpt_automation.infrastructure.config.settings_model import ProjectSettings
+from gpt_automation.infrastructure.config.settings_model import ContentPolicy, ProjectSettings
 from gpt_automation.infrastructure.plugins.filter_builder import FilterBuilder
 from gpt_automation.infrastructure.logging.logger import Logger
+from gpt_automation.infrastructure.output.sinks import BufferSink, OutputSink
 
 
 @dataclass
@@ -35,8 +51,13 @@ class GeneratePrompts:
     - logger: logs progress/errors
     - content_reader: reads file contents with encoding handling
     - paths: project directory structure
-    - settings: which plugins are enabled
+    - settings: which plugins are enabled, how contents are read
     - filter_builder: creates visitor filters from settings
+    - file_index: persistent walk index, saved after each run (optional)
+    - content_cache: persistent decoded contents, saved after each run (optional)
+    - prompt_snapshots: what earlier prompts showed, for since_last (optional)
+    - outliner: turns Python files into outlines, for outline (optional)
+    - minifier: strips comments and whitespace, for minify (optional)
 
     This use case has NO hidden construction — everything comes in.
     """
@@ -45,10 +66,15 @@ class GeneratePrompts:
         self,
         walker: DirectoryWalker,
         logger: Logger,
-        content_reader: 'FileContentReader',
+        content_reader: FileContentReader,
         paths: ProjectPaths,
         settings: ProjectSettings,
         filter_builder: FilterBuilder,
+        file_index: Optional[FileIndex] = None,
+        content_cache: Optional[ContentCache] = None,
+        prompt_snapshots: Optional[PromptSnapshots] = None,
+        outliner: Optional[PythonOutliner] = None,
+        minifier: Optional[ContentMinifier] = None,
     ):
         self._walker = walker
         self._logger = logger
@@ -56,6 +82,11 @@ class GeneratePrompts:
         self._paths = paths
         self._settings = settings
         self._filter_builder = filter_builder
+        self._file_index = file_index
+        self._content_cache = content_cache
+        self._prompt_snapshots = prompt_snapshots
+        self._outliner = outliner
+        self._minifier = minifier
 
     def run(
         self,
@@ -72,93 +103,390 @@ class GeneratePrompts:
         include_tree – whether to include directory structure
         include_contents – whether to include file contents
         """
-        self._logger.info(f"Generating prompts for {work_dir} (profiles={profiles})")
+        # Stream matching files; the tree needs them all, contents do not
+        files: Iterable[DirectoryEntry] = self._matching_files(work_dir, profiles, with_stat=include_contents)
+        if include_tree:
+            files = self._collect(files)
+
+        tree_block = self._tree_block(files) if include_tree else ''
+        contents = BufferSink()
+        if include_contents:
+            self._write_contents(files, contents, self._policy(profiles))
+        self._save_caches()
+        return PromptResult(directory_tree=tree_block, file_contents=contents.getvalue())
+
+    def run_tree_and_contents(
+        self,
+        work_dir: Path,
+        tree_profiles: list[str],
+        content_profiles: list[str],
+    ) -> PromptResult:
+        """
+        Generate the tree and the contents with one traversal per profile set.
+
+        When both outputs use the same profiles they are rendered from a
+        single filter build and walk. Otherwise two walks are needed (the
+        filters differ), but they share every directory listing.
+        """
+        if set(tree_profiles) == set(content_profiles):
+            return self.run(work_dir, tree_profiles, include_tree=True, include_contents=True)
+
+        with self._walker.shared_listings():
+            tree = self.run(work_dir, tree_profiles, include_tree=True, include_contents=False)
+            contents = self.run(work_dir, content_profiles, include_tree=False, include_contents=True)
+
+        return PromptResult(directory_tree=tree.directory_tree, file_contents=contents.file_contents)
+
+    def write(
+        self,
+        sink: OutputSink,
+        work_dir: Path,
+        tree_profiles: Optional[list[str]],
+        content_profiles: Optional[list[str]],
+        max_tokens: Optional[int] = None,
+        since_last: bool = False,
+        outline: bool = False,
+        minify: bool = False,
+        collapse: Optional[Collapse] = None,
+    ) -> Optional[BudgetReport]:
+        """
+        Stream the prompt into sink: the tree block, then one block per file.
+
+        None profiles skips that part. Only the tree's file list is held in
+        memory; each content block goes to the sink as soon as it is read,
+        so a file or pipe sink keeps memory flat. Walks are shared as in
+        run_tree_and_contents.
+
+        With max_tokens, file contents are selected to fit the budget (see
+        BudgetedContents) and the returned report says what was left out.
+
+        With since_last, only files added or modified since the last
+        since_last prompt for the same directory and content profiles are
+        written, followed by one block per deleted file (see ChangesSince).
+        The snapshot is then updated; without prompt_snapshots (caching
+        disabled) every file is written.
+
+        With outline, Python files are shown as outlines of their classes
+        and functions (see PythonOutliner); other files are unchanged.
+        With minify, comments and redundant whitespace are removed (see
+        ContentMinifier); outlined files are left as they are.
+
+        With collapse, the directories it selects appear in the tree as one
+        line with their file count and size, summed from the stat data of
+        the same walk (see DirectorySizes).
+        """
+        want_contents = content_profiles is not None
+        policy = self._policy(content_profiles or [])
+        if outline:
+            if self._outliner is None:
+                self._logger.warning("No outliner configured: writing full contents")
+            else:
+                policy = replace(policy, outline=True)
+        if minify:
+            if self._minifier is None:
+                self._logger.warning("No minifier configured: writing contents as they are")
+            else:
+                policy = replace(policy, minify=True)
+        changes = None
+        if since_last and want_contents:
+            if self._prompt_snapshots is None:
+                self._logger.warning("No snapshots without the cache: writing every file")
+            else:
+                changes = ChangesSince(self._prompt_snapshots.load(work_dir, content_profiles))
+        if tree_profiles is None or content_profiles is None or set(tree_profiles) == set(content_profiles):
+            profiles = tree_profiles if tree_profiles is not None else content_profiles
+            # A collapsed tree sums sizes from the walk's stat data too
+            with_stat = want_contents or (tree_profiles is not None and collapse is not None)
+            files: Iterable[DirectoryEntry] = self._matching_files(work_dir, profiles or [], with_stat=with_stat)
+            if tree_profiles is not None:
+                files = self._collect(files)
+            report = self._write_prompt(
+                sink,
+                tree_files=files if tree_profiles is not None else None,
+                content_files=files if want_contents else None,
+                policy=policy,
+                max_tokens=max_tokens,
+                changes=changes,
+                collapse=collapse,
+            )
+        else:
+            with self._walker.shared_listings():
+                tree_files = self._collect(
+                    self._matching_files(work_dir, tree_profiles, with_stat=collapse is not None)
+                )
+                content_files = self._matching_files(work_dir, content_profiles, with_stat=True)
+                report = self._write_prompt(
+                    sink, tree_files, content_files, policy, max_tokens, changes, collapse,
+                )
+        if changes is not None:
+            self._save_snapshot(changes)
+        self._save_caches()
+        return report
+
+    def render(
+        self,
+        tree_files: Optional[list[Path]] = None,
+        content_files: Optional[Iterable[Path]] = None,
+        content_profiles: Optional[list[str]] = None,
+    ) -> PromptResult:
+        """
+        Format files that were already collected; None skips that block.
 
-        # Build filter from settings
+        For callers that keep the matching files themselves (the watcher).
+        content_profiles picks the content policy (large files, duplicates).
+        """
+        tree_block = self._build_tree(tree_files, self._paths.root) if tree_files is not None else ''
+        contents = BufferSink()
+        if content_files is not None:
+            self._write_contents(
+                (DirectoryEntry(path, EntryKind.FILE) for path in content_files),
+                contents,
+                self._policy(content_profiles or []),
+            )
+        return PromptResult(directory_tree=tree_block, file_contents=contents.getvalue())
+
+    def _write_prompt(
+        self,
+        sink: OutputSink,
+        tree_files: Optional[list[DirectoryEntry]],
+        content_files: Optional[Iterable[DirectoryEntry]],
+        policy: ContentPolicy,
+        max_tokens: Optional[int],
+        changes: Optional[ChangesSince] = None,
+        collapse: Optional[Collapse] = None,
+    ) -> Optional[BudgetReport]:
+        """The tree block, then the content blocks (None skips either), with a blank line between."""
+        if max_tokens is not None:
+            return self._write_within_budget(
+                sink, max_tokens, tree_files, content_files, policy, changes, collapse,
+            )
+        separator = ''
+        if tree_files is not None:
+            tree_block = self._tree_block(tree_files, collapse)
+            if tree_block:
+                sink.write_block(tree_block)
+                separator = '\n\n'
+        if content_files is not None:
+            self._write_contents(content_files, sink, policy, separator, changes)
+        return None
+
+    def _write_within_budget(
+        self,
+        sink: OutputSink,
+        max_tokens: int,
+        tree_files: Optional[list[DirectoryEntry]],
+        content_files: Optional[Iterable[DirectoryEntry]],
+        policy: ContentPolicy,
+        changes: Optional[ChangesSince] = None,
+        collapse: Optional[Collapse] = None,
+    ) -> BudgetReport:
+        """
+        Like _write_prompt(), writing only as many file blocks as fit
+        max_tokens (see BudgetedContents). The tree block is always
+        written and counts first.
+        """
+        used = 0
+        separator = ''
+        if tree_files is not None:
+            tree_block = self._tree_block(tree_files, collapse)
+            if tree_block:
+                sink.write_block(tree_block)
+                used += estimate_tokens(tree_block)
+                separator = '\n\n'
+        if content_files is None:
+            return BudgetReport(budget=max_tokens, used=used, selected=0, dropped=[])
+
+        budget = BudgetedContents(max_tokens, self._content_reader, policy, changes)
+        report = budget.write(sink, content_files, lambda files: self._read_all(files, policy), used, separator)
+        self._logger.debug(f"Selected {report.selected} of {budget.candidates} files within {max_tokens} tokens")
+        self._log_reader_stats(budget.dedup)
+        return report
+
+    def _matching_files(
+        self, work_dir: Path, profiles: list[str], with_stat: bool = False,
+    ) -> Iterator[DirectoryEntry]:
+        """Build the filter for profiles and start a (lazy) walk of work_dir; with_stat for contents and sizes."""
+        self._logger.info(f"Generating prompts for {work_dir} (profiles={profiles})")
         file_filter = self._filter_builder.build_for_traversal(
             self._paths.root,
             work_dir,
             profiles,
         )
+        return self._walker.iter_matching_entries(work_dir, file_filter, with_stat=with_stat)
 
-        # Collect matching files
-        files = self._walker.collect_matching_files(work_dir, file_filter)
+    def _collect(self, files: Iterable[DirectoryEntry]) -> list[DirectoryEntry]:
+        files = list(files)
         self._logger.info(f"Collected {len(files)} files after filtering")
+        return files
 
-        # Format output blocks
-        tree_block = self._build_tree(files, self._paths.root) if include_tree else ''
-        content_block = self._build_contents(files) if include_contents else ''
-
-        return PromptResult(directory_tree=tree_block, file_contents=content_block)
+    def _policy(self, profiles: list[str]) -> ContentPolicy:
+        return self._settings.content_reading.policy(profiles)
 
-    # ────────────────────────── formatting ───────────────────────────
-
-    def _build_tree(self, files: list[Path], root: Path) -> str:
-        """Format files as a nested directory-tree string."""
-        if not files:
-            return ''
-
-        lines = ['Directory structure:', '']
-        tree: dict = {}
+    def _read_all(
+        self, files: Iterable[DirectoryEntry], policy: ContentPolicy,
+    ) -> Iterator[tuple[DirectoryEntry, FileContent]]:
+        """
+        read_in_order over walk entries, sized (for read-ahead) from their
+        stat data; then the transforms policy asks for: Python files become
+        outlines, and the rest (or everything) is minified.
+        """
+        reading = self._settings.content_reading
+        large_file_bytes = policy.large_file_bytes
+
+        def read(entry: DirectoryEntry) -> FileContent:
+            return self._content_reader.read_content(entry.path, entry.stat, large_file_bytes)
+
+        def size(entry: DirectoryEntry) -> int:
+            if entry.stat is None:
+                return 0
+            if large_file_bytes and entry.stat.st_size > large_file_bytes:
+                return min(entry.stat.st_size, 2 * reading.excerpt_bytes)
+            return entry.stat.st_size
+
+        contents = read_in_order(read, files, reading.threads, reading.max_buffered_bytes, size)
+        if policy.outline:
+            contents = self._outliner.transformed(contents)
+        if policy.minify:
+            contents = self._minifier.transformed(contents, PYTHON_SUFFIXES if policy.outline else ())
+        return contents
+
+    def _log_reader_stats(self, dedup: Deduplicator) -> None:
+        if dedup.duplicates:
+            self._logger.info(
+                f"Replaced {dedup.duplicates} duplicate files with references "
+                f"({dedup.characters_saved} characters saved)"
+            )
+        stats = getattr(self._content_reader, 'stats', None)
+        if stats and stats['binary_files']:
+            self._logger.info(
+                f"Skipped {stats['binary_files']} binary files "
+                f"({stats['binary_bytes_skipped']} bytes not read)"
+            )
+        if stats and stats['excerpted_files']:
+            self._logger.info(
+                f"Excerpted {stats['excerpted_files']} large files "
+                f"({stats['excerpt_bytes_elided']} bytes not read)"
+            )
+        stages = (('Outlined', 'parsed', self._outliner), ('Minified', 'processed', self._minifier))
+        for verb, work, transformer in stages:
+            counts = transformer.stats if transformer is not None else None
+            if counts and counts['transformed_files']:
+                # Files computed or cached but not shortened are kept as they
+                # are: they count in the total, not in the transformed files
+                total = counts['computed_files'] + counts['cached_files']
+                self._logger.info(
+                    f"{verb} {counts['transformed_files']} of {total} files "
+                    f"({counts['computed_files']} {work}, {counts['cached_files']} from cache; "
+                    f"{counts['bytes_saved']} bytes, ~{counts['tokens_saved']} tokens saved)"
+                )
+
+    def _save_snapshot(self, changes: ChangesSince) -> None:
+        counts = changes.counts
+        if changes.first_run:
+            self._logger.info(f"Recorded a snapshot of {counts['added']} files for --since_last")
+        elif counts['added'] or counts['modified'] or counts['deleted']:
+            self._logger.info(
+                f"Since the last prompt: {counts['added']} added, {counts['modified']} modified, "
+                f"{counts['deleted']} deleted ({counts['unchanged']} unchanged files not read)"
+            )
+        else:
+            self._logger.info("No changes since the last prompt")
+        try:
+            changes.save()
+        except OSError as e:
+            self._logger.warning(f"Could not save prompt snapshot: {e}")
 
-        for file_path in sorted(files):
+    def _save_caches(self) -> None:
+        """Persist what this run learned; a cache that cannot be written is not an error."""
+        if self._file_index is not None:
             try:
-                rel = file_path.relative_to(root)
-            except ValueError:
-                rel = file_path
-
-            node = tree
-            for part in rel.parts[:-1]:
-                node = node.setdefault(part, {})
-            node[rel.parts[-1]] = None
-
-        self._render_tree(tree, lines, prefix='')
-        return '\n'.join(lines)
-
-    def _render_tree(self, node: dict, lines: list[str], prefix: str) -> None:
-        """Recursively render tree dict into lines."""
-        items = sorted(node.items())
-        for i, (name, children) in enumerate(items):
-            connector = '└── ' if i == len(items) - 1 else '├── '
-            lines.append(f"{prefix}{connector}{name}")
-
-            if isinstance(children, dict):
-                extension = '    ' if i == len(items) - 1 else '│   '
-                self._render_tree(children, lines, prefix + extension)
-
-    def _build_contents(self, files: list[Path]) -> str:
-        """Format file contents as annotated blocks."""
-        if not files:
-            return ''
-
-        blocks: list[str] = []
-        for file_path in sorted(files):
-            content = self._content_reader.read(file_path)
-            blocks.append(f"### {file_path}\n{content}")
-
-        return '\n\n'.join(blocks)
+                self._file_index.save()
+            except OSError as e:
+                self._logger.warning(f"Could not save file index: {e}")
+        if self._content_cache is not None:
+            self._logger.debug(
+                f"Content cache: {self._content_cache.hits} hits, {self._content_cache.misses} misses"
+            )
+            try:
+                self._content_cache.save()
+            except OSError as e:
+                self._logger.warning(f"Could not save content cache: {e}")
 
+    # ────────────────────────── formatting ───────────────────────────
 
-class FileContentReader:
-    """Read a file's text content, handling encoding gracefully."""
+    def _tree_block(self, files: list[DirectoryEntry], collapse: Optional[Collapse] = None) -> str:
+        if collapse is None:
+            return self._build_tree([entry.path for entry in files], self._paths.root)
+        root = self._paths.root
+        paths = _tree_paths((entry.path for entry in files), root)
+        if not paths:
+            return ''
+        sizes = DirectorySizes(root, files, self._file_index)
+        block = '\n'.join(['Directory structure:', '', *collapsed_tree(paths, collapse, sizes)])
+        self._logger.debug(
+            f"Collapsed tree: sizes of {sizes.stats['cached_directories']} directories cached, "
+            f"{sizes.stats['summed_directories']} summed"
+        )
+        return block
 
-    def read(self, file_path: Path) -> str:
-        """Return file content as a string, or a placeholder on error."""
-        try:
-            return self._detect_and_read(file_path)
-        except Exception as e:
-            return f'[Could not read {file_path.name}: {e}]'
-
-    def _detect_and_read(self, file_path: Path) -> str:
-        """Try chardet encoding detection, fall back to utf-8 with replacement."""
-        raw = file_path.read_bytes()
-        if not raw:
+    def _build_tree(self, files: Iterable[Path], root: Path) -> str:
+        """Format files as a nested directory-tree string (see render_tree)."""
+        paths = _tree_paths(files, root)
+        if not paths:
             return ''
+        return '\n'.join(['Directory structure:', '', *render_tree(paths)])
 
-        try:
-            import chardet
-            detected = chardet.detect(raw)
-            encoding = detected.get('encoding') or 'utf-8'
-            return raw.decode(encoding, errors='replace')
-        except ImportError:
-            return raw.decode('utf-8', errors='replace')
+    def _write_contents(
+        self,
+        files: Iterable[DirectoryEntry],
+        sink: OutputSink,
+        policy: ContentPolicy,
+        separator: str = '',
+        changes: Optional[ChangesSince] = None,
+    ) -> None:
+        """
+        Write file contents to sink as annotated blocks, one at a time.
+
+        files may be the walker's live generator: each file is read as soon
+        as the walk yields it, on content_reading.threads threads, and the
+        blocks keep the walker's (sorted) order. policy decides which files
+        are excerpted and whether repeats become references. Blocks are
+        separated by a blank line; separator goes before the first one.
+        With changes, unchanged files are left out and deleted ones follow.
+        """
+        if changes is not None:
+            files = changes.changed(files)
+        count = 0
+        dedup = Deduplicator(policy.deduplicate)
+        for entry, content in self._read_all(files, policy):
+            if changes is not None and changes.unchanged(entry, content):
+                continue
+            sink.write_block(file_header(entry.path, changes), dedup.text(entry.path, content), separator)
+            separator = '\n\n'
+            count += 1
+            if changes is not None:
+                changes.shown(entry, content)
+        if changes is not None:
+            for path in changes.deleted():
+                sink.write_block(deleted_header(path), '', separator)
+                separator = '\n\n'
+
+        self._logger.debug(f"Read contents of {count} files")
+        self._log_reader_stats(dedup)
+
+
+def _tree_paths(files: Iterable[Path], root: Path) -> list[tuple[str, ...]]:
+    """files as sorted, unique component tuples relative to root (render_tree's input)."""
+    # Splitting the string is several times faster than Path.relative_to
+    prefix = os.path.join(str(root), '')
+    return sorted({
+        tuple(text[len(prefix):].split(os.sep)) if text.startswith(prefix) else _relative_parts(file_path, root)
+        for file_path, text in ((file_path, str(file_path)) for file_path in files)
+    })
+
+
+def _relative_parts(file_path: Path, root: Path) -> tuple[str, ...]:
+    try:
+        return file_path.relative_to(root).parts
+    except ValueError:
+        return file_path.parts
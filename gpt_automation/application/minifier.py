@@ -0,0 +1,24 @@
+"""
+Minify mode: comments and redundant whitespace removed (prompt --minify).
+
+Runs on ContentTransformer's process pool (tokenize is pure Python), and
+results are cached by the hash of the file's bytes, so each version of a
+file is minified once.
+"""
+
+from gpt_automation.application.content_transforms import ContentTransformer
+from gpt_automation.domain.minify import minify
+from gpt_automation.domain.tokens import estimate_tokens
+
+
+def minify_with_tokens(name: str, text: str) -> tuple[str, int]:
+    """minify() and its estimated tokens; runs in the worker processes."""
+    minified = minify(name, text)
+    return minified, estimate_tokens(minified)
+
+
+class ContentMinifier(ContentTransformer):
+    """Minifies every text file: Python with tokenize, the rest by whitespace only."""
+
+    kind = 'minify'
+    function = minify_with_tokens
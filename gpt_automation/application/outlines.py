@@ -0,0 +1,33 @@
+"""
+Outline mode: Python files shown as signature outlines (prompt --outline).
+
+Parsing with ast runs on ContentTransformer's process pool, and outlines
+are cached by the hash of the file's bytes, so a re-run only parses files
+whose bytes changed.
+"""
+
+from typing import Optional
+
+from gpt_automation.application.content_transforms import ContentTransformer
+from gpt_automation.domain.outline import python_outline
+from gpt_automation.domain.tokens import estimate_tokens
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry
+from gpt_automation.infrastructure.cache.content_cache import FileContent
+
+PYTHON_SUFFIXES = ('.py', '.pyi')
+
+
+def outline_with_tokens(name: str, source: str) -> Optional[tuple[str, int]]:
+    """python_outline() and its estimated tokens; runs in the worker processes."""
+    outline = python_outline(source)
+    return (outline, estimate_tokens(outline)) if outline is not None else None
+
+
+class PythonOutliner(ContentTransformer):
+    """Replaces the text of Python files with their outline; other files keep theirs."""
+
+    kind = 'outline'
+    function = outline_with_tokens
+
+    def applies(self, entry: DirectoryEntry, content: FileContent) -> bool:
+        return entry.path.suffix in PYTHON_SUFFIXES
@@ -0,0 +1,80 @@
+"""
+Read file contents on a thread pool, handing them back in input order.
+
+On a cold page cache or a network filesystem, reading is bound by I/O
+latency rather than CPU; a few reads in flight hide most of it. File reads
+and the C decoders release the GIL, so threads are enough (the rare
+chardet fallback is pure Python but runs on a small sample).
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+# Reads queued per worker: enough to keep every worker busy while the
+# consumer is still formatting the head of the queue
+_QUEUED_PER_WORKER = 4
+
+F = TypeVar('F')
+T = TypeVar('T')
+
+
+def read_in_order(
+    read: Callable[[F], T],
+    files: Iterable[F],
+    threads: int,
+    max_buffered_bytes: int,
+    size: Optional[Callable[[F], int]] = None,
+) -> Iterator[tuple[F, T]]:
+    """
+    Yield (file, read(file)) for every file, in the order files gives them.
+
+    files is consumed lazily (it may be the walker's live generator). Reads
+    run ahead of the consumer by at most threads * 4 files and, going by
+    their on-disk sizes, max_buffered_bytes; one file is always allowed
+    so a single huge file still gets read. threads <= 1 reads serially on
+    the calling thread.
+
+    files are paths, or anything else read accepts when size gives its
+    size in bytes (say, from stat data the walk already has).
+    """
+    if threads <= 1:
+        for file in files:
+            yield file, read(file)
+        return
+
+    size = size or _size
+    files = iter(files)
+    pending: deque = deque()   # (file, size, future), in input order
+    buffered = 0
+    exhausted = False
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='gpt-read')
+    try:
+        while True:
+            while not exhausted and len(pending) < threads * _QUEUED_PER_WORKER \
+                    and (not pending or buffered < max_buffered_bytes):
+                file = next(files, None)
+                if file is None:
+                    exhausted = True
+                    break
+                file_size = size(file)
+                pending.append((file, file_size, pool.submit(read, file)))
+                buffered += file_size
+
+            if not pending:
+                return
+            file, file_size, future = pending.popleft()
+            buffered -= file_size
+            yield file, future.result()
+    finally:
+        # An abandoned generator must not leave queued reads running
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _size(path: Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0  # The read itself reports the error
@@ -0,0 +1,90 @@
+"""
+Since-last mode: only the files that changed since the last prompt
+(prompt --since_last), with headers saying how they changed.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry
+from gpt_automation.infrastructure.cache.content_cache import FileContent
+from gpt_automation.infrastructure.cache.prompt_snapshot import PromptSnapshot, SnapshotEntry
+
+
+def file_header(path: Path, changes: Optional['ChangesSince'] = None) -> str:
+    """The line above a file's contents; with changes, it says whether the file was added or modified."""
+    return changes.header(path) if changes is not None else f"### {path}\n"
+
+
+def deleted_header(path: Path) -> str:
+    return f"### {path} (deleted)\n"
+
+
+class ChangesSince:
+    """
+    Narrows a content walk to the files that changed since a snapshot.
+
+    changed() passes on only the entries whose size or mtime differ from
+    the snapshot, so unchanged files are never read; unchanged() then
+    drops those whose bytes still hash the same (touched, not edited).
+    Snapshot paths the walk did not see are deleted(). Headers say whether
+    a file was added or modified, except on the first run (no snapshot
+    yet), which shows every file as usual.
+
+    save() records the files shown, and keeps the old entries of files
+    that were seen but not shown, e.g. dropped by a token budget.
+    """
+
+    def __init__(self, snapshot: PromptSnapshot):
+        self._snapshot = snapshot
+        self._seen: set[str] = set()
+        self._files: dict[str, SnapshotEntry] = {}
+        self.counts: Counter = Counter()
+
+    def changed(self, entries: Iterable[DirectoryEntry]) -> Iterator[DirectoryEntry]:
+        for entry in entries:
+            key = str(entry.path)
+            self._seen.add(key)
+            previous = self._snapshot.files.get(key)
+            if previous is not None:
+                self._files[key] = previous
+                if entry.stat is not None and previous.matches(entry.stat):
+                    self.counts['unchanged'] += 1
+                    continue
+            yield entry
+
+    def unchanged(self, entry: DirectoryEntry, content: FileContent) -> bool:
+        """True when a file whose stat changed still has the bytes that were shown."""
+        previous = self._snapshot.get(entry.path)
+        if previous is None or not content.content_hash or content.content_hash != previous.content_hash:
+            return False
+        self._record(entry, content)  # Its new stat matches next time
+        return True
+
+    def header(self, path: Path) -> str:
+        if not self._snapshot.exists:
+            return f"### {path}\n"
+        state = 'modified' if self._snapshot.get(path) is not None else 'added'
+        return f"### {path} ({state})\n"
+
+    def shown(self, entry: DirectoryEntry, content: FileContent) -> None:
+        self.counts['modified' if self._snapshot.get(entry.path) is not None else 'added'] += 1
+        self._record(entry, content)
+
+    def deleted(self) -> list[Path]:
+        """Snapshot paths the walk did not see, sorted; valid once the walk is done."""
+        deleted = [path for path in self._snapshot.paths() if str(path) not in self._seen]
+        self.counts['deleted'] = len(deleted)
+        return deleted
+
+    def save(self) -> None:
+        self._snapshot.save(self._files)
+
+    @property
+    def first_run(self) -> bool:
+        return not self._snapshot.exists
+
+    def _record(self, entry: DirectoryEntry, content: FileContent) -> None:
+        if entry.stat is not None:  # Walks for contents stat every file
+            self._files[str(entry.path)] = SnapshotEntry.of(entry.stat, content.content_hash)
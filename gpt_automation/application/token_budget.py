@@ -0,0 +1,142 @@
+"""
+Token budgets: which file blocks of a prompt fit within max_tokens
+(prompt --max_tokens).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.application.deduplication import Deduplicator
+from gpt_automation.application.since_last import ChangesSince, deleted_header, file_header
+from gpt_automation.domain.tokens import estimate_tokens
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry
+from gpt_automation.infrastructure.cache.content_cache import FileContent
+from gpt_automation.infrastructure.config.settings_model import ContentPolicy
+from gpt_automation.infrastructure.output.sinks import OutputSink
+
+ReadAll = Callable[[Iterable[DirectoryEntry]], Iterator[tuple[DirectoryEntry, FileContent]]]
+
+
+@dataclass
+class BudgetReport:
+    """What a token-budgeted run wrote, and which files it left out."""
+    budget: int
+    used: int                           # Estimated tokens written
+    selected: int                       # Files whose contents were written
+    dropped: list[tuple[Path, int]]     # (file, estimated tokens), in walk order
+
+
+class BudgetedContents:
+    """
+    Writes only as many file blocks as fit a token budget.
+
+    Files are considered by priority: shallow before deep, recently
+    modified before old, small before large. A file whose estimate (the
+    cached token count, else a guess from its size) no longer fits is
+    dropped without being read; one that turns out larger than estimated
+    is dropped after reading. Selected blocks are written in walk order.
+    With changes, only changed files are candidates, and the deleted
+    files' blocks count first.
+
+    After write(), candidates and dedup say what was considered and
+    which duplicates became references, for the caller's log.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        reader: FileContentReader,
+        policy: ContentPolicy,
+        changes: Optional[ChangesSince] = None,
+    ):
+        self._max_tokens = max_tokens
+        self._reader = reader
+        self._policy = policy
+        self._changes = changes
+        self.candidates = 0
+        self.dedup = Deduplicator(policy.deduplicate)
+
+    def write(
+        self,
+        sink: OutputSink,
+        files: Iterable[DirectoryEntry],
+        read_all: ReadAll,
+        used: int = 0,
+        separator: str = '',
+    ) -> BudgetReport:
+        """
+        Write the blocks of files that fit, then the deleted files' blocks.
+
+        read_all reads entries in order (GeneratePrompts._read_all); used is
+        what the blocks before these (the tree) already took.
+        """
+        changes = self._changes
+        if changes is not None:
+            files = changes.changed(files)
+
+        # (depth, -mtime, size, walk position, entry, estimate)
+        candidates = []
+        for position, entry in enumerate(files):
+            header = estimate_tokens('\n\n' + file_header(entry.path, changes))
+            st = entry.stat
+            if st is None:
+                candidates.append((len(entry.path.parts), 0, 0, position, entry, header))
+                continue
+            estimate = header + self._reader.estimated_tokens(entry.path, st, self._policy.large_file_bytes)
+            candidates.append((len(entry.path.parts), -st.st_mtime_ns, st.st_size, position, entry, estimate))
+        candidates.sort(key=lambda candidate: candidate[:4])
+        estimates = {entry.path: (position, estimate) for *_, position, entry, estimate in candidates}
+        self.candidates = len(candidates)
+
+        deleted = changes.deleted() if changes is not None else []
+        used += sum(estimate_tokens('\n\n' + deleted_header(path)) for path in deleted)
+        left = self._max_tokens - used
+        dropped: dict[int, tuple[Path, int]] = {}
+
+        def fitting() -> Iterator[DirectoryEntry]:
+            # Runs as read_in_order asks for more work: left already
+            # reflects every file read so far
+            nonlocal left
+            for *_, position, entry, estimate in candidates:
+                if estimate <= left:
+                    left -= estimate
+                    yield entry
+                else:
+                    dropped[position] = (entry.path, estimate)
+
+        selected: dict[int, tuple[DirectoryEntry, FileContent]] = {}
+        seen = Deduplicator(self._policy.deduplicate)  # Duplicates of selected files cost a reference
+        for entry, content in read_all(fitting()):
+            position, estimate = estimates[entry.path]
+            if changes is not None and changes.unchanged(entry, content):
+                left += estimate
+                continue
+            reference = seen.reference(entry.path, content)
+            body = content.tokens if reference is None else estimate_tokens(reference)
+            actual = estimate_tokens('\n\n' + file_header(entry.path, changes)) + body
+            left += estimate - actual
+            if left < 0:
+                left += actual
+                dropped[position] = (entry.path, actual)
+            else:
+                selected[position] = (entry, content)
+                seen.remember(entry.path, content)
+
+        for position in sorted(selected):
+            entry, content = selected[position]
+            sink.write_block(file_header(entry.path, changes), self.dedup.text(entry.path, content), separator)
+            separator = '\n\n'
+            if changes is not None:
+                changes.shown(entry, content)
+        for path in deleted:
+            sink.write_block(deleted_header(path), '', separator)
+            separator = '\n\n'
+
+        return BudgetReport(
+            budget=self._max_tokens,
+            used=self._max_tokens - left,
+            selected=len(selected),
+            dropped=[dropped[position] for position in sorted(dropped)],
+        )
@@ -0,0 +1,46 @@
+"""
+Sizes of the directories a collapsed tree summarises (prompt --tree_depth).
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional
+
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry
+from gpt_automation.infrastructure.cache.file_index import FileIndex, fingerprint
+
+
+class DirectorySizes:
+    """
+    directory_bytes for collapsed_tree(): total size of some files of a directory.
+
+    Sizes come from the walk's own stat data: a walk for a collapsed tree
+    stats every file it yields, so nothing is stat'ed again here. Totals
+    are stored in the FileIndex under the (name, mtime_ns, size) of the
+    summed files, so a total is only reused while none of them changed,
+    including files rewritten in place.
+    """
+
+    def __init__(self, root: Path, files: Iterable[DirectoryEntry], index: Optional[FileIndex]):
+        self._root = root
+        self._index = index
+        self._known = {entry.path: entry.stat for entry in files if entry.stat is not None}
+        self.stats: Counter = Counter()
+
+    def __call__(self, directory: tuple[str, ...], names: list[str]) -> int:
+        dir_path = self._root.joinpath(*directory)
+        # A file without stat data could not be stat'ed by the walk (gone
+        # since its listing): it adds nothing
+        summed = [(name, st) for name, st in ((name, self._known.get(dir_path / name)) for name in names)
+                  if st is not None]
+        key = fingerprint(b'', *((name, st.st_mtime_ns, st.st_size) for name, st in summed))
+        if self._index is not None:
+            cached = self._index.rollup(str(dir_path), key)
+            if cached is not None:
+                self.stats['cached_directories'] += 1
+                return cached
+        total = sum(st.st_size for _, st in summed)
+        self.stats['summed_directories'] += 1
+        if self._index is not None:
+            self._index.put_rollup(str(dir_path), key, total)
+        return total
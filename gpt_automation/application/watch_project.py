@@ -0,0 +1,262 @@
+"""
+Use case: Keep prompts for a project hot while its files change.
+
+Story: "Run once in the background; every `autogpt prompt` afterwards is
+answered from memory, and each change on disk costs work proportional to
+what it touched."
+"""
+
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Optional
+
+from gpt_automation.application.generate_prompts import GeneratePrompts, PromptResult
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryWalker, FilesystemQuery
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.filesystem.project_paths import ProjectPaths
+from gpt_automation.infrastructure.logging.logger import Logger
+from gpt_automation.infrastructure.plugins.filter_builder import FilterBuilder
+from gpt_automation.infrastructure.watch.change_source import ChangeSource
+
+
+class CachingContentReader:
+    """
+    Keep decoded file contents in memory until the watcher reports a change.
+
+    Wraps FileContentReader; forget() is called for every changed path.
+    """
+
+    def __init__(self, inner):
+        self._inner = inner
+        self._contents: dict[Path, dict[int, FileContent]] = {}   # path -> {large_file_bytes: content}
+        self._lock = threading.Lock()
+
+    def read(self, file_path: Path) -> str:
+        return self.read_content(file_path).text
+
+    def read_content(self, file_path: Path, st=None, large_file_bytes: int = 0) -> FileContent:
+        with self._lock:
+            content = self._contents.get(file_path, {}).get(large_file_bytes)
+        if content is None:
+            content = self._inner.read_content(file_path, st, large_file_bytes)
+            with self._lock:
+                self._contents.setdefault(file_path, {})[large_file_bytes] = content
+        return content
+
+    def estimated_tokens(self, file_path: Path, st, large_file_bytes: int = 0) -> int:
+        return self._inner.estimated_tokens(file_path, st, large_file_bytes)
+
+    @property
+    def stats(self):
+        """The inner reader's counters (binary files skipped, ...)."""
+        return getattr(self._inner, 'stats', None)
+
+    def forget(self, path: Path) -> None:
+        """Drop path, and everything below it when it is (or was) a directory."""
+        with self._lock:
+            if self._contents.pop(path, None) is None:
+                for cached in [p for p in self._contents if path in p.parents]:
+                    del self._contents[cached]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contents.clear()
+
+
+class WatchProject:
+    """
+    Maintain the matching files of every requested (work_dir, profiles) pair.
+
+    A context is walked in full the first time it is requested. After that,
+    each batch of changed paths is applied in place:
+
+    - a changed rule file (.gitignore, .gptignore, .gptincludeonly) re-walks
+      only the directory that holds it (a full rebuild when it sits at or
+      above work_dir)
+    - any other changed path is re-decided on its own: a file is re-checked,
+      a directory subtree re-walked, a deleted path dropped
+
+    The filter for a re-check is built by replaying the walker's descent
+    from work_dir, so it holds exactly the state the full walk had there.
+    Results are kept in walk order (sorted), and the entries under one path
+    are contiguous, so each update is a slice replacement.
+
+    Changes to the settings or blocklist files make run() return True: the
+    caller rebuilds the container, since every filter depends on them.
+    """
+
+    def __init__(
+        self,
+        walker: DirectoryWalker,
+        filesystem: FilesystemQuery,
+        filter_builder: FilterBuilder,
+        prompts: GeneratePrompts,
+        content_reader: CachingContentReader,
+        paths: ProjectPaths,
+        logger: Logger,
+        file_index: Optional[FileIndex] = None,
+        content_cache: Optional[ContentCache] = None,
+    ):
+        self._walker = walker
+        self._filesystem = filesystem
+        self._filter_builder = filter_builder
+        self._prompts = prompts
+        self._content_reader = content_reader
+        self._paths = paths
+        self._logger = logger
+        self._file_index = file_index
+        self._content_cache = content_cache
+        self._rule_filenames = frozenset(filter_builder.rule_filenames())
+        self._contexts: dict[tuple[Path, tuple[str, ...]], list[Path]] = {}
+        self._lock = threading.Lock()
+
+    # ── requests ──
+
+    def prompt(
+        self,
+        work_dir: Path,
+        tree_profiles: Optional[list[str]],
+        content_profiles: Optional[list[str]],
+    ) -> PromptResult:
+        """Render from the in-memory file lists; None profiles skips that block."""
+        work_dir = Path(work_dir).resolve()  # Change events carry resolved paths
+        with self._lock:
+            tree_files = self._files(work_dir, tree_profiles) if tree_profiles is not None else None
+            content_files = self._files(work_dir, content_profiles) if content_profiles is not None else None
+            return self._prompts.render(tree_files=tree_files, content_files=content_files,
+                                        content_profiles=content_profiles)
+
+    def handle_request(self, message: dict) -> dict:
+        """PromptServer handler: a JSON request in, the rendered blocks out."""
+        result = self.prompt(
+            Path(message['work_dir']),
+            message.get('tree_profiles'),
+            message.get('content_profiles'),
+        )
+        return {'directory_tree': result.directory_tree, 'file_contents': result.file_contents}
+
+    # ── change handling ──
+
+    def run(self, source: ChangeSource, stop: threading.Event, poll_timeout: float = 0.5) -> bool:
+        """
+        Apply change batches until stop is set.
+
+        Returns True when the configuration changed and the caller must
+        rebuild everything, False when stopped.
+        """
+        try:
+            while not stop.is_set():
+                changed = source.poll(poll_timeout)
+                if changed and self.apply_changes(changed):
+                    return True
+            return False
+        finally:
+            self._save_caches()
+
+    def apply_changes(self, changed: Iterable[Path]) -> bool:
+        """Bring every context up to date; True if the configuration changed."""
+        changed = sorted(Path(p) for p in changed)
+        if any(self._is_configuration(path) for path in changed):
+            self._logger.info("Configuration changed; rebuilding")
+            return True
+
+        with self._lock:
+            for path in changed:
+                self._content_reader.forget(path)
+            for key, files in list(self._contexts.items()):
+                if not self._update_context(key, files, changed):
+                    del self._contexts[key]  # Rebuilt on the next request
+        self._logger.debug(f"Applied {len(changed)} changed paths")
+        return False
+
+    # ── internals ──
+
+    def _files(self, work_dir: Path, profiles: list[str]) -> list[Path]:
+        key = (work_dir, tuple(sorted(set(profiles))))
+        files = self._contexts.get(key)
+        if files is None:
+            file_filter = self._filter_builder.build_for_traversal(self._paths.root, work_dir, profiles)
+            files = list(self._walker.iter_matching_files(work_dir, file_filter))
+            self._contexts[key] = files
+            self._logger.info(f"Watching {len(files)} files under {work_dir} (profiles={list(key[1])})")
+        return files
+
+    def _update_context(self, key, files: list[Path], changed: list[Path]) -> bool:
+        """Patch files in place; False when only a full rebuild will do."""
+        work_dir, profiles = key
+        affected: set[Path] = set()
+        for path in changed:
+            if path.name in self._rule_filenames:
+                path = path.parent  # Its rules apply to the whole directory
+            if path == work_dir or path in work_dir.parents:
+                return False
+            if work_dir in path.parents:
+                affected.add(path)
+
+        targets: list[Path] = []
+        for path in sorted(affected):
+            # Sorted: an ancestor comes first and already covers this path
+            if not targets or targets[-1] not in path.parents:
+                targets.append(path)
+
+        filters: dict[Path, Optional[FileFilter]] = {}
+        for target in targets:
+            parent = target.parent
+            if parent not in filters:
+                filters[parent] = self._filter_at(work_dir, list(profiles), parent)
+            self._refresh(files, target, filters[parent])
+        return True
+
+    def _filter_at(self, work_dir: Path, profiles: list[str], directory: Path) -> Optional[FileFilter]:
+        """
+        A filter entered down to directory, as the walker would have left it.
+
+        None when the walk never reaches directory (it or an ancestor is
+        excluded, or it no longer exists).
+        """
+        file_filter = self._filter_builder.build_for_traversal(self._paths.root, work_dir, profiles)
+        current = work_dir
+        if not file_filter.should_include_directory(current):
+            return None
+        file_filter.enter_directory(current)
+        for part in directory.relative_to(work_dir).parts:
+            current = current / part
+            if not self._filesystem.is_directory(current) or not file_filter.should_include_directory(current):
+                return None
+            file_filter.enter_directory(current)
+        return file_filter
+
+    def _refresh(self, files: list[Path], target: Path, file_filter: Optional[FileFilter]) -> None:
+        """Replace everything at or below target with what the filter yields now."""
+        start = bisect_left(files, target)
+        end = start
+        while end < len(files) and (files[end] == target or target in files[end].parents):
+            end += 1
+
+        replacement: list[Path] = []
+        if file_filter is not None:
+            if self._filesystem.is_file(target):
+                if file_filter.should_include_file(target):
+                    replacement = [target]
+            elif self._filesystem.is_directory(target):
+                replacement = list(self._walker.iter_matching_files(target, file_filter))
+        files[start:end] = replacement
+
+    def _is_configuration(self, path: Path) -> bool:
+        config_dirs = (self._paths.settings_dir, self._paths.plugins_dir)
+        return any(path == d or d in path.parents for d in config_dirs)
+
+    def _save_caches(self) -> None:
+        if self._file_index is not None:
+            try:
+                self._file_index.save()
+            except OSError as e:
+                self._logger.warning(f"Could not save file index: {e}")
+        if self._content_cache is not None:
+            try:
+                self._content_cache.save()
+            except OSError as e:
+                self._logger.warning(f"Could not save content cache: {e}")
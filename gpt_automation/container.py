@@ -13,6 +13,8 @@ The dependency graph (simplified):
 
     OsFilesystemQuery (real I/O)
          ↓
+    IndexedFilesystemQuery (listings from FileIndex, .gpt/cache/)
+         ↓
     DirectoryWalker (domain logic)
 
     SettingsReader (read JSON)
@@ -34,9 +36,16 @@ The dependency graph (simplified):
 
 from pathlib import Path
 from functools import cached_property
+from typing import Optional
 
 from gpt_automation.infrastructure.filesystem.project_paths import ProjectPaths
 from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+from gpt_automation.infrastructure.filesystem.indexed_filesystem_query import IndexedFilesystemQuery
+from gpt_automation.infrastructure.filesystem.git_file_lister import GitFileLister
+from gpt_automation.infrastructure.filesystem.git_diff_lister import GitDiffLister
+from gpt_automation.infrastructure.cache.content_cache import ContentCache
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.cache.prompt_snapshot import PromptSnapshots
 from gpt_automation.infrastructure.config.settings_loader import SettingsReader, SettingsWriter
 from gpt_automation.infrastructure.config.settings_model import ProjectSettings
 from gpt_automation.infrastructure.plugins.filter_builder import FilterBuilder
@@ -46,9 +55,16 @@ from gpt_automation.infrastructure.logging.logger import (
     ConsoleLogger,
     CompositeLogger,
 )
-from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+from gpt_automation.domain.traversal.directory_reader import DirectoryWalker, FilesystemQuery
+from gpt_automation.domain.traversal.parallel_walker import ParallelDirectoryWalker
+from gpt_automation.domain.traversal.listed_files_walker import ListedFilesWalker
 from gpt_automation.application.initialize_project import InitializeProject
-from gpt_automation.application.generate_prompts import GeneratePrompts, FileContentReader
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.application.generate_prompts import GeneratePrompts
+from gpt_automation.application.minifier import ContentMinifier
+from gpt_automation.application.outlines import PythonOutliner
+from gpt_automation.application.watch_project import WatchProject, CachingContentReader
+from gpt_automation.infrastructure.watch.change_source import ChangeSource, create_change_source
 
 
 class AppContainer:
@@ -62,9 +78,31 @@ class AppContainer:
     Each @cached_property builds its object once, then returns the same instance.
     """
 
-    def __init__(self, project_root: Path):
-        """Initialize with the project root directory."""
+    def __init__(self, project_root: Path, walk_threads: int = 1, use_cache: bool = True,
+                 use_git: bool = False, stdout_is_output: bool = False,
+                 changed_vs: Optional[str] = None, neighbours: bool = False):
+        """
+        Initialize with the project root directory.
+
+        walk_threads – directory listings kept in flight while walking;
+                       1 selects the serial walker
+        use_cache    – reuse listings, filter decisions and file contents
+                       from .gpt/cache/
+        use_git      – take files from the git index when the project is in
+                       a checkout (falls back to walking outside git)
+        stdout_is_output – the prompt is streamed to stdout; console logs
+                       go to stderr
+        changed_vs   – only take the files changed against this git ref
+        neighbours   – with changed_vs, add the tests of changed files (and
+                       the files changed tests test)
+        """
         self._root = Path(project_root).resolve()
+        self._walk_threads = walk_threads
+        self._use_cache = use_cache
+        self._use_git = use_git
+        self._stdout_is_output = stdout_is_output
+        self._changed_vs = changed_vs
+        self._neighbours = neighbours
 
     # ─────────────────────────── INFRASTRUCTURE ──────────────────────────────
 
@@ -88,18 +126,75 @@ class AppContainer:
         self.paths.logs_dir.mkdir(parents=True, exist_ok=True)
         return CompositeLogger([
             FileLogger(self.paths.logs_dir / 'app.log'),
-            ConsoleLogger(),
+            ConsoleLogger(info_to_stderr=self._stdout_is_output),
         ])
 
     @cached_property
-    def filesystem(self) -> OsFilesystemQuery:
+    def file_index(self) -> Optional[FileIndex]:
+        """
+        Walk results persisted between runs, or None with caching disabled.
+
+        Loaded once; GeneratePrompts saves it after each run.
+        """
+        if not self._use_cache:
+            return None
+        return FileIndex.load(self.paths.file_index_file)
+
+    @cached_property
+    def content_cache(self) -> Optional[ContentCache]:
+        """
+        Decoded file contents persisted between runs, or None with caching disabled.
+
+        Bounded by content_reading.cache_mb in the settings; saved after each run.
+        """
+        if not self._use_cache:
+            return None
+        return ContentCache(self.paths.content_cache_file, self.settings.content_reading.cache_budget_bytes)
+
+    @cached_property
+    def prompt_snapshots(self) -> Optional[PromptSnapshots]:
+        """
+        What earlier `prompt --since_last` runs showed, or None with caching disabled.
+        """
+        if not self._use_cache:
+            return None
+        return PromptSnapshots(self.paths.snapshots_dir)
+
+    @cached_property
+    def filesystem(self) -> FilesystemQuery:
         """
         Ask the OS about files.
 
         This is what DirectoryWalker uses to ask: "is this a directory?"
+        Listings come from the file index while directories are unchanged.
         Tests replace this with a fake.
         """
-        return OsFilesystemQuery()
+        if self.file_index is None:
+            return OsFilesystemQuery()
+        return IndexedFilesystemQuery(OsFilesystemQuery(), self.file_index)
+
+    @cached_property
+    def git_file_lister(self) -> Optional[GitFileLister]:
+        """
+        Files of the enclosing git checkout, or None (disabled / not in git).
+
+        When present, git has already applied .gitignore to every file it
+        reports, so the ignore filter skips .gitignore files.
+        """
+        if not self._use_git:
+            return None
+        return GitFileLister.for_directory(self._root)
+
+    @cached_property
+    def git_diff_lister(self) -> Optional[GitDiffLister]:
+        """
+        Files changed against the changed_vs ref, or None when not asked for.
+
+        Raises ValueError outside git or for a ref git cannot diff against.
+        """
+        if self._changed_vs is None:
+            return None
+        return GitDiffLister.for_ref(self._root, self._changed_vs, neighbours=self._neighbours)
 
     @cached_property
     def settings_reader(self) -> SettingsReader:
@@ -127,7 +222,12 @@ class AppContainer:
 
         Knows which plugins are enabled and creates the right visitors.
         """
-        return FilterBuilder(self.settings, self.paths.plugins_dir)
+        return FilterBuilder(
+            self.settings,
+            self.paths.plugins_dir,
+            self.file_index,
+            resolved_ignore_filenames=['.gitignore'] if self.git_file_lister else [],
+        )
 
     @cached_property
     def resources_dir(self) -> Path:
@@ -146,16 +246,36 @@ class AppContainer:
         Walk directory trees applying filters.
 
         Pure domain logic — no I/O dependencies beyond the injected
-        OsFilesystemQuery.
+        OsFilesystemQuery. With walk_threads > 1 the parallel walker is
+        used; it returns the same files in the same order. Inside git with
+        use_git, files come from the git index and nothing is listed; with
+        changed_vs, only the changed files are filtered.
         """
+        if self.git_diff_lister is not None:
+            return ListedFilesWalker(self.filesystem, self.git_diff_lister)
+        if self.git_file_lister is not None:
+            return ListedFilesWalker(self.filesystem, self.git_file_lister)
+        if self._walk_threads > 1:
+            return ParallelDirectoryWalker(self.filesystem, max_workers=self._walk_threads)
         return DirectoryWalker(self.filesystem)
 
     # ─────────────────────────── APPLICATION ─────────────────────────────────
 
     @cached_property
     def content_reader(self) -> FileContentReader:
-        """Read file content with graceful encoding detection."""
-        return FileContentReader()
+        """Read file content; the decoder's encoding cache lasts as long as the container."""
+        return FileContentReader(cache=self.content_cache,
+                                 excerpt_bytes=self.settings.content_reading.excerpt_bytes)
+
+    @cached_property
+    def outliner(self) -> PythonOutliner:
+        """Python outlines for `prompt --outline`, parsed on a process pool and cached by hash."""
+        return PythonOutliner(self.content_cache, processes=self.settings.content_reading.transform_processes)
+
+    @cached_property
+    def minifier(self) -> ContentMinifier:
+        """Minified contents for `prompt --minify`, computed on a process pool and cached by hash."""
+        return ContentMinifier(self.content_cache, processes=self.settings.content_reading.transform_processes)
 
     @cached_property
     def initialize_project(self) -> InitializeProject:
@@ -189,6 +309,9 @@ class AppContainer:
         - paths: project structure
         - settings: which plugins enabled
         - filter_builder: create visitor filters
+        - file_index, content_cache: saved after each run
+        - prompt_snapshots: compared and updated by since_last runs
+        - outliner, minifier: content transforms for outline / minify runs
         """
         return GeneratePrompts(
             walker=self.directory_walker,
@@ -197,6 +320,54 @@ class AppContainer:
             paths=self.paths,
             settings=self.settings,
             filter_builder=self.filter_builder,
+            file_index=self.file_index,
+            content_cache=self.content_cache,
+            prompt_snapshots=self.prompt_snapshots,
+            outliner=self.outliner,
+            minifier=self.minifier,
+        )
+
+    @cached_property
+    def watch_project(self) -> WatchProject:
+        """
+        Use case: keep prompts up to date in memory (`autogpt watch`).
+
+        Gets its own GeneratePrompts whose content reader keeps decoded
+        contents until the file changes.
+        """
+        content_reader = CachingContentReader(self.content_reader)
+        prompts = GeneratePrompts(
+            walker=self.directory_walker,
+            logger=self.logger,
+            content_reader=content_reader,
+            paths=self.paths,
+            settings=self.settings,
+            filter_builder=self.filter_builder,
+        )
+        return WatchProject(
+            walker=self.directory_walker,
+            filesystem=self.filesystem,
+            filter_builder=self.filter_builder,
+            prompts=prompts,
+            content_reader=content_reader,
+            paths=self.paths,
+            logger=self.logger,
+            file_index=self.file_index,
+            content_cache=self.content_cache,
+        )
+
+    def create_change_source(self, force_polling: bool = False, interval: float = 1.0) -> ChangeSource:
+        """
+        Watch the project root for changes (inotify, or polling as fallback).
+
+        Our own logs and caches are not watched: writing them must not
+        trigger another round of updates.
+        """
+        return create_change_source(
+            self.paths.root,
+            ignored=[self.paths.logs_dir, self.paths.cache_dir],
+            force_polling=force_polling,
+            interval=interval,
         )
 
     # ─────────────────────────── VALIDATION ──────────────────────────────────
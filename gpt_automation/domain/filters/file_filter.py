@@ -27,6 +27,17 @@ class FileFilter(ABC):
         """Return True if directory contents should be traversed."""
         ...
 
+    # ── traversal events ──
+    # The walker reports descent and ascent so filters whose rules depend on
+    # the directory (nested ignore files) can scope them. Stateless filters
+    # ignore both events.
+
+    def enter_directory(self, dir_path: Path) -> None:
+        """Called after dir_path passed should_include_directory, before it is listed."""
+
+    def leave_directory(self, dir_path: Path) -> None:
+        """Called once every entry of dir_path has been processed."""
+
 
 class AllFilters(FileFilter):
     """
@@ -48,6 +59,14 @@ class AllFilters(FileFilter):
         """Traverse only if every filter agrees."""
         return all(f.should_include_directory(dir_path) for f in self._filters)
 
+    def enter_directory(self, dir_path: Path) -> None:
+        for f in self._filters:
+            f.enter_directory(dir_path)
+
+    def leave_directory(self, dir_path: Path) -> None:
+        for f in reversed(self._filters):
+            f.leave_directory(dir_path)
+
 
 class IncludeEverythingFilter(FileFilter):
     """
@@ -0,0 +1,79 @@
+"""
+Token-saving rewrites of source text that keep its meaning.
+
+- Python: comments are removed, found with tokenize so that a '#' inside
+  a string is left alone; lines that held only a comment go with them.
+- Every file: trailing whitespace is stripped, runs of blank lines become
+  one blank line, and blank lines at the start and end are dropped.
+
+Lines inside multi-line tokens (triple-quoted strings) are never changed:
+their whitespace is part of the value. Indentation is kept, since Python
+(and YAML, Makefiles, ...) depend on it and tokenizers mostly merge it.
+
+Pure: text in, text out. Runs in the worker processes of the minify stage.
+"""
+
+import io
+import tokenize
+from typing import Optional
+
+PYTHON_SUFFIXES = ('.py', '.pyi')
+
+
+def minify(name: str, text: str) -> str:
+    """text with comments (Python only) and redundant whitespace removed."""
+    if name.endswith(PYTHON_SUFFIXES):
+        minified = minify_python(text)
+        if minified is not None:
+            return minified
+    return _collapse(text.splitlines(), frozen=set(), keep_end=set())
+
+
+def minify_python(source: str) -> Optional[str]:
+    """source without comments and redundant whitespace; None when it does not tokenize."""
+    lines = source.split('\n')     # As tokenize counts lines (no \f or \u2028 breaks)
+    comments: dict[int, int] = {}   # line index -> column the comment starts at
+    frozen: set[int] = set()        # lines that begin inside a multi-line token
+    keep_end: set[int] = set()      # lines that end inside a multi-line token
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            (first, column), (last, _) = token.start, token.end
+            if token.type == tokenize.COMMENT:
+                comments[first - 1] = column
+            elif last > first and token.type not in (tokenize.NEWLINE, tokenize.NL):
+                keep_end.update(range(first - 1, last - 1))
+                frozen.update(range(first, last))
+    except (tokenize.TokenError, SyntaxError):
+        return None   # SyntaxError covers IndentationError
+
+    dropped: set[int] = set()
+    for index, column in comments.items():
+        code = lines[index][:column]   # Comments end their line, so nothing after them is lost
+        if code.strip():
+            lines[index] = code
+        else:
+            dropped.add(index)
+    kept = [line for index, line in enumerate(lines) if index not in dropped]
+    # Line indexes shift after dropping: map the protected sets along
+    new_index = {old: new for new, old in enumerate(i for i in range(len(lines)) if i not in dropped)}
+    return _collapse(
+        kept,
+        frozen={new_index[i] for i in frozen if i in new_index},
+        keep_end={new_index[i] for i in keep_end if i in new_index},
+    )
+
+
+def _collapse(lines: list[str], frozen: set[int], keep_end: set[int]) -> str:
+    out: list[str] = []
+    blank = False
+    for index, line in enumerate(lines):
+        if index not in keep_end:
+            line = line.rstrip()
+        if not line and index not in frozen:
+            blank = bool(out)
+            continue
+        if blank:
+            out.append('')
+            blank = False
+        out.append(line)
+    return '\n'.join(out) + '\n' if out else ''
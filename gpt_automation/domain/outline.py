@@ -0,0 +1,78 @@
+"""
+Signature outlines of Python modules.
+
+An outline keeps what a reader needs to see the shape of a module: its
+docstring, its classes and functions (methods and nested classes
+included) with decorators, bases and full signatures, and the first line
+of each docstring. Bodies, imports and assignments are left out, so an
+outline typically takes a quarter of the module's tokens or less.
+
+    class Cache(Base):
+        \"\"\"Bounded store of decoded contents.\"\"\"
+        def get(self, key: str) -> Optional[str]: ...
+
+Pure: text in, text out. Runs in the worker processes of
+GeneratePrompts' outline mode, so it must stay importable on its own.
+"""
+
+import ast
+from typing import Optional, Union
+
+_INDENT = '    '
+
+_Definition = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def python_outline(source: str) -> Optional[str]:
+    """The outline of a module's source; None when it does not parse."""
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError):
+        return None   # ValueError: NUL bytes; RecursionError: absurd nesting
+    lines: list[str] = []
+    docstring = _first_line(module)
+    if docstring:
+        lines.append(_quoted(docstring))
+    _outline_body(module.body, lines, indent='')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _outline_body(body: list[ast.stmt], lines: list[str], indent: str) -> None:
+    for node in body:
+        if not isinstance(node, _DEFINITIONS):
+            continue
+        if lines and not indent:
+            lines.append('')  # Blank line between top-level definitions
+        lines.extend(f'{indent}@{ast.unparse(decorator)}' for decorator in node.decorator_list)
+        header = indent + _signature(node)
+        docstring = _first_line(node)
+        members = [member for member in node.body if isinstance(member, _DEFINITIONS)] \
+            if isinstance(node, ast.ClassDef) else []
+        if not docstring and not members:
+            lines.append(header + ' ...')
+            continue
+        lines.append(header)
+        if docstring:
+            lines.append(indent + _INDENT + _quoted(docstring))
+        if members:
+            _outline_body(members, lines, indent + _INDENT)
+
+
+def _signature(node: _Definition) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases]
+        bases += [ast.unparse(keyword) for keyword in node.keywords]
+        return f"class {node.name}({', '.join(bases)}):" if bases else f"class {node.name}:"
+    prefix = 'async def' if isinstance(node, ast.AsyncFunctionDef) else 'def'
+    returns = f' -> {ast.unparse(node.returns)}' if node.returns is not None else ''
+    return f'{prefix} {node.name}({ast.unparse(node.args)}){returns}:'
+
+
+def _first_line(node: Union[ast.Module, _Definition]) -> str:
+    docstring = ast.get_docstring(node)
+    return docstring.strip().splitlines()[0].strip() if docstring and docstring.strip() else ''
+
+
+def _quoted(line: str) -> str:
+    return '"""' + line.replace('"""', r'\"\"\"') + '"""'
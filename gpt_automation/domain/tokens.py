@@ -0,0 +1,42 @@
+"""
+Token estimates for prompt budgets.
+
+Model tokenizers (BPE) are not available offline, and running one over
+every file would cost more than reading it. The estimate below counts the
+things BPE vocabularies split on, using only bytes.translate and split (C
+speed, ~60 MB/s):
+
+- every punctuation character, and every byte of a non-ASCII character
+- every run of letters, digits and underscores, plus one more per 8
+  characters of it (long identifiers span several tokens)
+- every line break (indentation after it mostly merges into one token)
+
+It is deliberately generous: overestimating is the safe side for a budget.
+"""
+
+import string
+
+# Budgets for files not read yet assume this many bytes per token (what
+# estimate_tokens gives for typical source and prose)
+BYTES_PER_TOKEN = 3
+
+_WORD = (string.ascii_letters + string.digits + '_').encode('ascii')
+_SPACE = b' \t\n\r\f\v'
+_SYMBOLS_TO_SPACE = bytes(c if c in _WORD else ord(' ') for c in range(256))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model tokens in text (slightly high rather than low)."""
+    if not text:
+        return 0
+    raw = text.encode('utf-8', errors='replace')
+    symbols = len(raw.translate(None, _WORD + _SPACE))
+    spaces = len(raw) - len(raw.translate(None, _SPACE))
+    word_chars = len(raw) - symbols - spaces
+    words = len(raw.translate(_SYMBOLS_TO_SPACE).split())
+    return symbols + words + word_chars // 8 + raw.count(b'\n')
+
+
+def estimate_tokens_from_size(size: int) -> int:
+    """Estimate for a file known only by its size in bytes."""
+    return -(-size // BYTES_PER_TOKEN)
@@ -6,10 +6,45 @@ FilesystemQuery abstraction so this code stays testable without real I/O.
 """
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
+from typing import Any, Iterator, Optional
 from gpt_automation.domain.filters.file_filter import FileFilter
 
 
+class EntryKind(Enum):
+    """What a directory entry is, as far as traversal cares."""
+
+    FILE = 'file'
+    DIRECTORY = 'directory'
+    OTHER = 'other'          # sockets, fifos, broken symlinks, unreadable entries
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """
+    One typed entry from a directory listing.
+
+    kind follows symlinks, like is_file / is_directory. stat is only filled
+    when the listing was asked for it; it is whatever the filesystem query
+    returns (os.stat_result in production), never fetched lazily here.
+    """
+
+    path: Path
+    kind: EntryKind
+    stat: Optional[Any] = None
+
+    @property
+    def is_file(self) -> bool:
+        return self.kind is EntryKind.FILE
+
+    @property
+    def is_directory(self) -> bool:
+        return self.kind is EntryKind.DIRECTORY
+
+
 class FilesystemQuery(ABC):
     """
     Abstraction for asking questions about the filesystem.
@@ -36,6 +71,31 @@ class FilesystemQuery(ABC):
         """Return all entries inside a directory (files and subdirs combined)."""
         ...
 
+    def stat(self, path: Path) -> Optional[Any]:
+        """Status of one file (os.stat_result in production); None when unknown or unreadable."""
+        return None
+
+    def scan_directory(self, dir_path: Path, with_stat: bool = False) -> list[DirectoryEntry]:
+        """
+        Return typed entries inside a directory.
+
+        The default asks list_directory / is_file / is_directory; real
+        implementations override it to classify entries without extra calls.
+        with_stat asks for the stat of file entries, where the listing can
+        provide it for free or nearly (os.scandir); the walker stats the
+        files it yields that come without. The default provides none.
+        """
+        entries = []
+        for path in self.list_directory(dir_path):
+            if self.is_file(path):
+                kind = EntryKind.FILE
+            elif self.is_directory(path):
+                kind = EntryKind.DIRECTORY
+            else:
+                kind = EntryKind.OTHER
+            entries.append(DirectoryEntry(path, kind))
+        return entries
+
 
 class DirectoryWalker:
     """
@@ -47,6 +107,41 @@ class DirectoryWalker:
 
     def __init__(self, filesystem: FilesystemQuery):
         self._filesystem = filesystem
+        # directory -> (listing, whether it carries stat)
+        self._shared_listings: Optional[dict[Path, tuple[list[DirectoryEntry], bool]]] = None
+
+    @contextmanager
+    def shared_listings(self):
+        """
+        Reuse each directory's listing across every walk made inside the block.
+
+        Lets several walks of the same tree with different filters (one per
+        profile set) pay for each scan_directory call once. Listings are
+        dropped when the outermost block exits, so later walks see fresh data.
+        """
+        outermost = self._shared_listings is None
+        if outermost:
+            self._shared_listings = {}
+        try:
+            yield
+        finally:
+            if outermost:
+                self._shared_listings = None
+
+    def _scan(self, dir_path: Path, with_stat: bool = False) -> list[DirectoryEntry]:
+        """
+        scan_directory, served from the shared listings when a block is open.
+
+        A shared listing made without stat is scanned again for a walk
+        that needs stat, and then serves both.
+        """
+        listings = self._shared_listings
+        if listings is None:
+            return self._filesystem.scan_directory(dir_path, with_stat)
+        shared = listings.get(dir_path)
+        if shared is None or (with_stat and not shared[1]):
+            shared = listings[dir_path] = (self._filesystem.scan_directory(dir_path, with_stat), with_stat)
+        return shared[0]
 
     def collect_matching_files(self, root_dir: Path, file_filter: FileFilter) -> list[Path]:
         """
@@ -54,27 +149,74 @@ class DirectoryWalker:
 
         Returns sorted list of absolute paths.
         """
-        collected: list[Path] = []
-        self._walk(root_dir, file_filter, collected)
-        return collected
+        return list(self.iter_matching_files(root_dir, file_filter))
 
-    def _walk(self, current_dir: Path, file_filter: FileFilter, collected: list[Path]) -> None:
-        """Recursively walk directory, applying filter at each step."""
-        if not self._filesystem.is_directory(current_dir):
-            return
+    def iter_matching_files(self, root_dir: Path, file_filter: FileFilter) -> Iterator[Path]:
+        """
+        Lazily yield files that pass the filter, in sorted order.
 
+        Each directory is listed only when the walk reaches it, so the first
+        match is available long before the walk finishes and the full file
+        list never has to exist at once.
+        """
+        for entry in self.iter_matching_entries(root_dir, file_filter):
+            yield entry.path
+
+    def iter_matching_entries(
+        self,
+        root_dir: Path,
+        file_filter: FileFilter,
+        with_stat: bool = False,
+    ) -> Iterator[DirectoryEntry]:
+        """
+        iter_matching_files, as the file entries of the directory listings.
+
+        with_stat asks scan_directory for stat data, and each entry carries
+        the stat its listing made; only a file whose listing had none (a
+        cached listing) is stat'ed here, once, as the walk yields it.
+        Consumers (size checks, the content cache) take the stat from the
+        entry instead of asking the filesystem again.
+        """
+        if self._filesystem.is_directory(root_dir):
+            yield from self._walk(root_dir, file_filter, with_stat)
+
+    def _with_stat(self, entry: DirectoryEntry) -> DirectoryEntry:
+        """entry, stat'ed if its listing did not provide the stat."""
+        if entry.stat is not None:
+            return entry
+        return DirectoryEntry(entry.path, entry.kind, self._filesystem.stat(entry.path))
+
+    def _walk(
+        self, current_dir: Path, file_filter: FileFilter, with_stat: bool = False,
+    ) -> Iterator[DirectoryEntry]:
+        """
+        Recursively walk a directory known to exist, applying filter at each step.
+
+        Excluded directories are pruned before they are listed. Every
+        directory that is traversed is bracketed by enter_directory /
+        leave_directory on the filter. Entry kinds come from the typed
+        listing, so classifying an entry costs no extra filesystem call.
+        """
         if not file_filter.should_include_directory(current_dir):
             return
 
+        file_filter.enter_directory(current_dir)
         try:
-            entries = self._filesystem.list_directory(current_dir)
-        except (OSError, PermissionError):
-            return  # Skip unreadable directories silently
+            try:
+                entries = self._scan(current_dir, with_stat)
+            except (OSError, PermissionError):
+                return  # Skip unreadable directories silently
+
+            for entry in sorted(entries, key=_entry_path):
+                if entry.is_file:
+                    if file_filter.should_include_file(entry.path):
+                        yield self._with_stat(entry) if with_stat else entry
+
+                elif entry.is_directory:
+                    yield from self._walk(entry.path, file_filter, with_stat)
+        finally:
+            file_filter.leave_directory(current_dir)
 
-        for entry in sorted(entries):
-            if self._filesystem.is_file(entry):
-                if file_filter.should_include_file(entry):
-                    collected.append(entry)
 
-            elif self._filesystem.is_directory(entry):
-                self._walk(entry, file_filter, collected)
+def _entry_path(entry: DirectoryEntry) -> Path:
+    return entry.path
@@ -0,0 +1,115 @@
+"""
+Traversal over a file list someone else already enumerated.
+
+Version control knows every file of a checkout without listing a single
+directory. This walker takes such a list and replays the walk the serial
+DirectoryWalker would have made over it — the same should_include_* checks
+and enter/leave events in the same order — so the usual filters apply on
+top unchanged.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.domain.traversal.directory_reader import (
+    DirectoryEntry,
+    DirectoryWalker,
+    EntryKind,
+    FilesystemQuery,
+)
+
+
+class FileLister(ABC):
+    """Enumerates candidate files under a directory without walking it."""
+
+    @abstractmethod
+    def list_files(self, root_dir: Path) -> Optional[list[Path]]:
+        """
+        Every candidate file below root_dir, in walk order (sorted by path).
+
+        None means this lister cannot answer for root_dir; the caller walks
+        the directory instead.
+        """
+        ...
+
+
+class ListedFilesWalker(DirectoryWalker):
+    """
+    DirectoryWalker that takes its files from a FileLister.
+
+    Directories only exist implicitly, as ancestors of listed files: a
+    directory is checked with should_include_directory when the first file
+    below it comes up, entered if included, and left once the list moves
+    past it. Files below an excluded directory are skipped without a check.
+    Empty directories are never seen, which no filter decision depends on.
+    """
+
+    def __init__(self, filesystem: FilesystemQuery, lister: FileLister):
+        super().__init__(filesystem)
+        self._lister = lister
+
+    def iter_matching_entries(
+        self,
+        root_dir: Path,
+        file_filter: FileFilter,
+        with_stat: bool = False,
+    ) -> Iterator[DirectoryEntry]:
+        """
+        Entries of the listed files that pass the filter; nothing was listed
+        by this process, so with_stat stats each of them once, as yielded.
+        """
+        files = self._lister.list_files(root_dir)
+        if files is None:
+            yield from super().iter_matching_entries(root_dir, file_filter, with_stat)
+            return
+        if not self._filesystem.is_directory(root_dir):
+            return
+        if not file_filter.should_include_directory(root_dir):
+            return
+        for path in filter_listed_files(root_dir, files, file_filter):
+            yield DirectoryEntry(path, EntryKind.FILE, self._filesystem.stat(path) if with_stat else None)
+
+
+def filter_listed_files(root_dir: Path, files: Iterable[Path], file_filter: FileFilter) -> Iterator[Path]:
+    """
+    Apply file_filter to sorted files below root_dir, with walker events.
+
+    root_dir must already have passed should_include_directory; files
+    outside it are ignored.
+    """
+    root_dir = Path(root_dir)
+    file_filter.enter_directory(root_dir)
+    entered = [root_dir]
+    pruned: Optional[Path] = None
+    try:
+        for file_path in files:
+            if root_dir not in file_path.parents:
+                continue
+            if pruned is not None and pruned in file_path.parents:
+                continue
+            parent = file_path.parent
+
+            # Leave directories the list has moved past
+            while entered[-1] != parent and entered[-1] not in parent.parents:
+                file_filter.leave_directory(entered.pop())
+
+            # Check and enter the directories between there and this file
+            missing = []
+            while parent != entered[-1]:
+                missing.append(parent)
+                parent = parent.parent
+            pruned = None
+            for directory in reversed(missing):
+                if not file_filter.should_include_directory(directory):
+                    pruned = directory
+                    break
+                file_filter.enter_directory(directory)
+                entered.append(directory)
+            else:
+                if file_filter.should_include_file(file_path):
+                    yield file_path
+    finally:
+        while entered:
+            file_filter.leave_directory(entered.pop())
@@ -0,0 +1,152 @@
+"""
+Directory traversal with directory listings fanned out over a thread pool.
+
+For trees where listing latency dominates (NFS, overlayfs), the serial walk
+spends most of its time waiting on one scan_directory call at a time. This
+walker keeps several listings in flight while producing exactly the same
+result as DirectoryWalker.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator
+
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, DirectoryWalker, FilesystemQuery
+
+# Listings submitted ahead of the walk per worker, as in content_transforms
+_QUEUED_PER_WORKER = 4
+
+
+class ParallelDirectoryWalker(DirectoryWalker):
+    """
+    Drop-in DirectoryWalker that prefetches directory listings in parallel.
+
+    Only scan_directory runs on the pool. Every filter call and every
+    enter/leave event still happens on the calling thread, in the same
+    depth-first order as the serial walker, so stateful filters (the
+    per-directory ignore stacks) see the same state and make the same
+    decisions.
+
+    When a directory is processed, its subdirectories are checked with
+    should_include_directory immediately — the filter state is identical to
+    the moment the serial walker would check them — and the included ones
+    are queued for prefetching (see _Prefetcher). Pruned directories are
+    never listed.
+    """
+
+    def __init__(self, filesystem: FilesystemQuery, max_workers: int = 8):
+        super().__init__(filesystem)
+        if max_workers < 1:
+            raise ValueError("ParallelDirectoryWalker requires at least one worker")
+        self._max_workers = max_workers
+
+    def iter_matching_entries(
+        self,
+        root_dir: Path,
+        file_filter: FileFilter,
+        with_stat: bool = False,
+    ) -> Iterator[DirectoryEntry]:
+        """
+        Lazily yield the entries of files that pass the filter, in sorted order.
+
+        Same sequence as DirectoryWalker.iter_matching_entries. The pool lives
+        as long as the generator; closing the generator early shuts it down.
+        """
+        if not self._filesystem.is_directory(root_dir):
+            return
+        if not file_filter.should_include_directory(root_dir):
+            return
+
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix='gpt-walk') as pool:
+            prefetcher = _Prefetcher(
+                lambda path: pool.submit(self._scan, path, with_stat),
+                limit=self._max_workers * _QUEUED_PER_WORKER,
+            )
+            prefetcher.queue([root_dir])
+            try:
+                yield from self._walk_prefetched(root_dir, file_filter, prefetcher, with_stat)
+            finally:
+                prefetcher.cancel()
+
+    def _walk_prefetched(
+        self,
+        current_dir: Path,
+        file_filter: FileFilter,
+        prefetcher: '_Prefetcher',
+        with_stat: bool,
+    ) -> Iterator[DirectoryEntry]:
+        """Walk an included directory that was queued on prefetcher."""
+        file_filter.enter_directory(current_dir)
+        try:
+            try:
+                entries = sorted(prefetcher.listing(current_dir), key=lambda entry: entry.path)
+            except (OSError, PermissionError):
+                return  # Skip unreadable directories silently
+
+            included = [
+                entry.path for entry in entries
+                if entry.is_directory and file_filter.should_include_directory(entry.path)
+            ]
+            prefetcher.queue(included)
+            included_set = set(included)
+
+            for entry in entries:
+                if entry.is_file:
+                    if file_filter.should_include_file(entry.path):
+                        yield self._with_stat(entry) if with_stat else entry
+
+                elif entry.path in included_set:
+                    yield from self._walk_prefetched(entry.path, file_filter, prefetcher, with_stat)
+        finally:
+            file_filter.leave_directory(current_dir)
+
+
+class _Prefetcher:
+    """
+    Keeps at most limit listings submitted ahead of the walk.
+
+    Directories are queued in the order the walk will need them: the
+    subdirectories of the directory being processed go before the rest,
+    as in a depth-first walk. Listings are submitted from the front of the
+    queue as earlier ones are taken, so memory follows limit (a few per
+    worker), not the width of the tree.
+    """
+
+    def __init__(self, submit: Callable[[Path], Future], limit: int):
+        self._submit = submit
+        self._limit = limit
+        self._waiting: deque[Path] = deque()
+        self._submitted: dict[Path, Future] = {}
+
+    def queue(self, directories: list[Path]) -> None:
+        """Queue directories (in walk order) ahead of the ones already waiting."""
+        self._waiting.extendleft(reversed(directories))
+        self._fill()
+
+    def listing(self, directory: Path) -> list[DirectoryEntry]:
+        """The listing of a queued directory, waiting for it if needed; raises what scanning raised."""
+        future = self._submitted.pop(directory, None)
+        if future is None:
+            # Always the next one waiting: the walk takes directories in queue order
+            if self._waiting and self._waiting[0] == directory:
+                self._waiting.popleft()
+            else:
+                self._waiting.remove(directory)
+            future = self._submit(directory)
+        self._fill()
+        return future.result()
+
+    def cancel(self) -> None:
+        """Drop what the walk no longer needs (it was closed early)."""
+        for future in self._submitted.values():
+            future.cancel()
+        self._submitted.clear()
+        self._waiting.clear()
+
+    def _fill(self) -> None:
+        while self._waiting and len(self._submitted) < self._limit:
+            directory = self._waiting.popleft()
+            self._submitted[directory] = self._submit(directory)
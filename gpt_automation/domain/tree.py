@@ -0,0 +1,174 @@
+"""
+Directory-tree rendering from a sorted stream of paths.
+
+    ├── src
+    │   ├── app.py
+    │   └── util.py
+    └── README.md
+
+Paths are tuples of components. Sorted, they list every directory's
+entries contiguously and in name order, which is exactly the order the
+tree prints them in; so lines can be produced while reading the paths,
+without building a nested structure. Only the directories that are open
+at the current path are kept, with one prefix string per level.
+
+collapsed_tree() shows big or deep directories as one summary line,
+
+    ├── node_modules/ (18204 files, 161.3 MB)
+
+so the tree of a large project stays short enough to be read.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Iterator, Mapping, Optional, Sequence
+
+_BRANCH, _LAST = '├── ', '└── '
+_PIPE, _SPACE = '│   ', '    '
+
+
+@dataclass(frozen=True)
+class Collapse:
+    """
+    Which directories collapsed_tree() summarises instead of listing.
+
+    max_depth: directories that many levels down are collapsed, so the
+    tree shows max_depth levels of entries (1: the top-level ones only).
+    max_children: directories with more entries than that are collapsed.
+    None turns a rule off. The top directory itself is never collapsed.
+    """
+
+    max_depth: Optional[int] = None
+    max_children: Optional[int] = None
+
+
+def render_tree(
+    paths: Sequence[tuple[str, ...]],
+    labels: Optional[Mapping[tuple[str, ...], str]] = None,
+) -> Iterator[str]:
+    """
+    The lines of the tree of paths, one per directory and file, in order.
+
+    paths must be sorted and free of duplicates. Whether an entry is the
+    last of its directory decides its connector and the prefix of
+    everything below it; for a file the next path tells, and for a
+    directory the first path after its subtree, found by bisection.
+    labels replaces the name shown for some of the paths.
+    """
+    count = len(paths)
+    open_dirs: list[str] = []
+    prefixes = ['']   # prefixes[d]: what precedes the connector of an entry at depth d
+
+    for index, path in enumerate(paths):
+        depth = len(path) - 1
+
+        # Close the directories this path is not in
+        common = 0
+        limit = min(len(open_dirs), depth)
+        while common < limit and open_dirs[common] == path[common]:
+            common += 1
+        del open_dirs[common:]
+        del prefixes[common + 1:]
+
+        # Open the ones it is in
+        for level in range(common, depth):
+            name = path[level]
+            # No component contains NUL, so this sorts after the whole subtree
+            end = bisect_left(paths, path[:level] + (name + '\0',), index)
+            last = end == count or paths[end][:level] != path[:level]
+            yield prefixes[level] + (_LAST if last else _BRANCH) + name
+            prefixes.append(prefixes[level] + (_SPACE if last else _PIPE))
+            open_dirs.append(name)
+
+        last = index + 1 == count or paths[index + 1][:depth] != path[:depth]
+        name = labels.get(path, path[depth]) if labels else path[depth]
+        yield prefixes[depth] + (_LAST if last else _BRANCH) + name
+
+
+def collapsed_tree(
+    paths: Sequence[tuple[str, ...]],
+    collapse: Collapse,
+    directory_bytes: Callable[[tuple[str, ...], list[str]], int],
+) -> Iterator[str]:
+    """
+    render_tree(), with the directories collapse selects shown as one line
+    each: their name, how many of the paths are below them, and their size.
+
+    directory_bytes(directory, names) is the total size of the named files,
+    which are directly in directory. It is asked once for each directory
+    holding files inside a collapsed one, and never for any other, so the
+    caller only needs sizes for what is summarised.
+    """
+    children = _child_counts(paths) if collapse.max_children is not None else {}
+    shown: list[tuple[str, ...]] = []
+    labels: dict[tuple[str, ...], str] = {}
+    current: Optional[tuple[str, ...]] = None   # The collapsed directory being summed up
+    files = 0
+    names: dict[tuple[str, ...], list[str]] = {}   # Its files, by the directory they are in
+
+    def summarise() -> None:
+        total = sum(directory_bytes(directory, listed) for directory, listed in names.items())
+        labels[current] = f"{current[-1]}/ ({files} file{'' if files == 1 else 's'}, {format_size(total)})"
+
+    for path in paths:
+        if current is not None and path[:len(current)] == current:
+            files += 1
+            names.setdefault(path[:-1], []).append(path[-1])
+            continue
+        if current is not None:
+            summarise()
+        current = _collapsed_directory(path, collapse, children)
+        if current is None:
+            shown.append(path)
+        else:
+            # Paths below one directory are contiguous, so it is shown once, in place
+            shown.append(current)
+            files = 1
+            names = {path[:-1]: [path[-1]]}
+    if current is not None:
+        summarise()
+    return render_tree(shown, labels)
+
+
+def format_size(size: int) -> str:
+    """size in bytes, as '512 B', '4.0 KB', '1.5 MB', ..."""
+    if size < 1024:
+        return f'{size} B'
+    value = float(size)
+    for unit in ('KB', 'MB', 'GB', 'TB'):
+        value /= 1024
+        if value < 1024 or unit == 'TB':
+            break
+    return f'{value:.1f} {unit}'
+
+
+def _collapsed_directory(
+    path: tuple[str, ...], collapse: Collapse, children: Mapping[tuple[str, ...], int],
+) -> Optional[tuple[str, ...]]:
+    """The outermost directory of path that collapse summarises, if any."""
+    deepest = len(path) - 1
+    if collapse.max_depth is not None:
+        deepest = min(deepest, collapse.max_depth)
+    for level in range(1, deepest + 1):
+        directory = path[:level]
+        if level == collapse.max_depth or \
+                (collapse.max_children is not None and children[directory] > collapse.max_children):
+            return directory
+    return None
+
+
+def _child_counts(paths: Sequence[tuple[str, ...]]) -> Counter:
+    """Entries (files and directories) in each directory of the sorted paths."""
+    counts: Counter = Counter()
+    previous: tuple[str, ...] = ()
+    for path in paths:
+        # Below the first component that differs, every directory gains an entry
+        common = 0
+        limit = min(len(previous), len(path))
+        while common < limit and previous[common] == path[common]:
+            common += 1
+        for level in range(common, len(path)):
+            counts[path[:level]] += 1
+        previous = path
+    return counts
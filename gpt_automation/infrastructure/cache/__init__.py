@@ -0,0 +1 @@
+"""Persistent caches kept under .gpt/cache/ (safe to delete at any time)."""
@@ -0,0 +1,248 @@
+"""
+Persistent cache of decoded file contents, kept in .gpt/cache/ between runs.
+
+Each entry holds a file's decoded text, the encoding it was decoded with,
+a hash of its raw bytes and an estimate of its tokens, stored under the
+file's path together with the (mtime_ns, size, inode) it had when it was
+read. An entry is only used
+while the file still has exactly that signature, so a hit costs one stat
+instead of a read plus encoding detection.
+
+The store is SQLite (standard library): it locks the file across
+processes, so two autogpt runs can share the cache safely. Lookups go to
+the database; everything a run adds or touches is written in one
+transaction by save(), which also evicts the least recently used entries
+once the stored text exceeds the byte budget.
+
+Transformed texts (outlines, minified copies) are stored by transform
+and content hash alone, since the same bytes always give the same
+result; one is kept while a cached file still has that hash, or while
+runs keep using it.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from gpt_automation.infrastructure.cache.file_index import exclude_from_walks
+
+_SCHEMA_VERSION = 4
+
+# Files modified this recently are not stored: another write within the
+# same timestamp tick would leave the signature unchanged
+_RACY_WINDOW_NS = 2_000_000_000
+
+# How long a process waits for another one's write transaction
+_LOCK_TIMEOUT_S = 5.0
+
+
+class FileSignature(NamedTuple):
+    """What must be unchanged for a cached entry to still describe the file."""
+    mtime_ns: int
+    size: int
+    inode: int
+
+    @classmethod
+    def of(cls, st: os.stat_result) -> 'FileSignature':
+        return cls(st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileContent(NamedTuple):
+    text: str
+    encoding: str         # 'binary' for files shown as a placeholder
+    content_hash: str     # Hex digest of the raw bytes ('' for binaries)
+    tokens: int           # estimate_tokens(text)
+
+
+class ContentCache:
+    """
+    Decoded contents keyed by path and file signature, LRU-bounded by bytes.
+
+    Safe to call from the reader's thread pool. The database is opened on
+    first use; a corrupt or incompatible database is recreated.
+    """
+
+    def __init__(self, db_file: Path, budget_bytes: int):
+        self._file = Path(db_file)
+        self._budget = budget_bytes
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._added: dict[str, tuple] = {}
+        self._used: set[str] = set()
+        self._added_transforms: dict[tuple[str, str], tuple[str, int]] = {}
+        self._used_transforms: set[tuple[str, str]] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, signature: FileSignature) -> Optional[FileContent]:
+        """The cached content of path, if it was stored with this signature."""
+        key = _key(path)
+        if key is None:
+            return None
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    'SELECT mtime_ns, size, inode, text, encoding, hash, tokens FROM contents WHERE path = ?',
+                    (key,),
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                row = None  # Locked or unwritable: read the file instead
+            if row is None or tuple(row[:3]) != signature:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used.add(key)
+        return FileContent(*row[3:])
+
+    def tokens(self, path: Path, signature: FileSignature) -> Optional[int]:
+        """The cached token count of path, without loading its text (not a hit)."""
+        key = _key(path)
+        if key is None:
+            return None
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    'SELECT mtime_ns, size, inode, tokens FROM contents WHERE path = ?', (key,)
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                return None
+        if row is None or tuple(row[:3]) != signature:
+            return None
+        return row[3]
+
+    def put(self, path: Path, signature: FileSignature, content: FileContent) -> None:
+        """Remember content for path; written by save()."""
+        key = _key(path)
+        if key is None or time.time_ns() - signature.mtime_ns < _RACY_WINDOW_NS:
+            return
+        with self._lock:
+            self._added[key] = (*signature, *content)
+
+    def transformed(self, kind: str, content_hash: str) -> Optional[tuple[str, int]]:
+        """The stored (text, tokens) that transform kind made of the bytes with content_hash."""
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    'SELECT text, tokens FROM transforms WHERE hash = ? AND kind = ?', (content_hash, kind)
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                return None
+            if row is not None:
+                self._used_transforms.add((kind, content_hash))
+        return tuple(row) if row is not None else None
+
+    def put_transformed(self, kind: str, content_hash: str, text: str, tokens: int) -> None:
+        """Remember what transform kind made of the bytes with content_hash; written by save()."""
+        with self._lock:
+            self._added_transforms[kind, content_hash] = (text, tokens)
+
+    def save(self) -> None:
+        """Write this run's additions and recency, then evict down to the budget."""
+        with self._lock:
+            if not (self._added or self._used or self._added_transforms or self._used_transforms):
+                return
+            now = time.time_ns()
+            try:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        'INSERT OR REPLACE INTO contents '
+                        '(path, mtime_ns, size, inode, text, encoding, hash, tokens, bytes, last_used) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [(key, m, s, i, text, enc, h, tokens, len(text.encode('utf-8', errors='replace')), now)
+                         for key, (m, s, i, text, enc, h, tokens) in self._added.items()],
+                    )
+                    db.executemany('UPDATE contents SET last_used = ? WHERE path = ?',
+                                   [(now, key) for key in self._used - self._added.keys()])
+                    db.executemany('INSERT OR REPLACE INTO transforms (hash, kind, text, tokens, last_used) '
+                                   'VALUES (?, ?, ?, ?, ?)',
+                                   [(h, kind, text, tokens, now)
+                                    for (kind, h), (text, tokens) in self._added_transforms.items()])
+                    db.executemany('UPDATE transforms SET last_used = ? WHERE kind = ? AND hash = ?',
+                                   [(now, kind, h) for kind, h in self._used_transforms - self._added_transforms.keys()])
+                    self._evict(db)
+                    # Transforms follow the contents: drop those of bytes no cached
+                    # file has any more, unless this run used them
+                    db.execute('DELETE FROM transforms WHERE last_used < ? '
+                               'AND hash NOT IN (SELECT hash FROM contents)', (now,))
+            except sqlite3.Error as e:
+                raise OSError(f"Could not write content cache {self._file}: {e}") from e
+            self._added.clear()
+            self._used.clear()
+            self._added_transforms.clear()
+            self._used_transforms.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # ── internals ──
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete least recently used entries until the stored text fits the budget."""
+        (total,) = db.execute('SELECT COALESCE(SUM(bytes), 0) FROM contents').fetchone()
+        if total <= self._budget:
+            return
+        stale = []
+        for key, size in db.execute('SELECT path, bytes FROM contents ORDER BY last_used, path'):
+            if total <= self._budget:
+                break
+            stale.append((key,))
+            total -= size
+        db.executemany('DELETE FROM contents WHERE path = ?', stale)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            try:
+                self._connection = self._open()
+            except sqlite3.OperationalError:
+                raise  # Locked, read-only, ...: the file itself may be fine
+            except sqlite3.DatabaseError:
+                # Not a database, or a damaged one: it is only a cache
+                self._file.unlink(missing_ok=True)
+                self._connection = self._open()
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        exclude_from_walks(self._file.parent)
+        db = sqlite3.connect(self._file, timeout=_LOCK_TIMEOUT_S, check_same_thread=False)
+        try:
+            # WAL lets one process read while another writes (not on every filesystem)
+            db.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.OperationalError:
+            pass
+        (version,) = db.execute('PRAGMA user_version').fetchone()
+        if version != _SCHEMA_VERSION:
+            # IF NOT EXISTS: another process may be creating it right now
+            with db:
+                if version != 0:
+                    db.execute('DROP TABLE IF EXISTS contents')
+                    db.execute('DROP TABLE IF EXISTS outlines')
+                    db.execute('DROP TABLE IF EXISTS transforms')
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS contents ('
+                    ' path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, inode INTEGER,'
+                    ' text TEXT, encoding TEXT, hash TEXT, tokens INTEGER, bytes INTEGER, last_used INTEGER)'
+                )
+                db.execute('CREATE INDEX IF NOT EXISTS contents_lru ON contents (last_used)')
+                db.execute('CREATE TABLE IF NOT EXISTS transforms ('
+                           ' hash TEXT, kind TEXT, text TEXT, tokens INTEGER, last_used INTEGER,'
+                           ' PRIMARY KEY (hash, kind))')
+                db.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+        return db
+
+
+def _key(path: Path) -> Optional[str]:
+    """path as SQLite text; None for names that are not valid UTF-8 (not cached)."""
+    key = str(path)
+    try:
+        key.encode('utf-8')
+    except UnicodeEncodeError:
+        return None
+    return key
@@ -0,0 +1,158 @@
+"""
+Persistent index of walk results, kept in .gpt/cache/ between runs.
+
+Three tables live in one file:
+
+- listings:  directory → (mtime_ns, last_run, names, kinds)
+             A directory's mtime changes whenever an entry is added,
+             removed or renamed, so an unchanged mtime means the cached
+             listing is still exact.
+- decisions: (work_dir, profiles) context → (config fingerprint, per-directory
+             filter decisions). Each directory's decisions carry the
+             fingerprint of every rule file from the project root down to it.
+- rollups:   directory → (last_run, files fingerprint, bytes)
+             Total size of the files of a directory that a collapsed tree
+             summarised, under the (name, mtime_ns, size) of each of them.
+
+The file is written with marshal: plain tuples, dicts and strings load in a
+few milliseconds even for 100k-entry trees. Anything unreadable — a
+truncated file, another Python's marshal format, an older layout — is
+treated as an empty index and rebuilt.
+"""
+
+import hashlib
+import marshal
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Bumped when stored data changes meaning, e.g. decisions after a filter change
+_FORMAT = 4
+
+# Entries unused for this many runs are dropped on save (deleted directories,
+# abandoned work dirs)
+_STALE_RUNS = 50
+
+# Decision contexts (work_dir + profiles combinations) kept per project
+_MAX_CONTEXTS = 16
+
+
+def stat_signature(path) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def fingerprint(parent: bytes, *parts) -> bytes:
+    """Stable short digest of parent plus parts (hash() is salted per process)."""
+    digest = hashlib.blake2b(parent, digest_size=8)
+    digest.update(repr(parts).encode('utf-8', errors='surrogateescape'))
+    return digest.digest()
+
+
+def rule_file_signatures(directory, rule_filenames: Iterable[str]) -> tuple:
+    """(name, stat_signature) for each rule file name, looked up in directory."""
+    return tuple((name, stat_signature(os.path.join(directory, name))) for name in rule_filenames)
+
+
+def exclude_from_walks(cache_dir: Path) -> None:
+    """Keep git and the prompt walker out of the cache directory."""
+    marker = cache_dir / '.gitignore'
+    if not marker.exists():
+        marker.write_text('*\n')
+
+
+class FileIndex:
+    """
+    In-memory view of the index file; mutated during a run, written by save().
+
+    Concurrent autogpt processes each write a complete file through
+    os.replace, so a reader sees either the old or the new index, never a
+    mix. The last writer wins.
+    """
+
+    def __init__(self, index_file: Path, data: Optional[dict] = None):
+        data = data or {}
+        self._file = Path(index_file)
+        self.run: int = data.get('run', 0) + 1
+        self.listings: dict = data.get('listings', {})
+        self._decisions: dict = data.get('decisions', {})
+        self._rollups: dict = data.get('rollups', {})
+
+    @classmethod
+    def load(cls, index_file: Path) -> 'FileIndex':
+        """Read the index file; a missing or unreadable file gives an empty index."""
+        try:
+            data = marshal.loads(Path(index_file).read_bytes())
+            if not isinstance(data, dict) or data.get('format') != (_FORMAT, marshal.version):
+                data = None
+        except (OSError, ValueError, EOFError, TypeError):
+            data = None
+        return cls(index_file, data)
+
+    # ── filter decisions ──
+
+    def decisions_for(self, context: str, config: bytes) -> dict:
+        """
+        The per-directory decision table for a context.
+
+        Returns an empty table when the context was last walked under a
+        different configuration; the table is registered so save() persists
+        whatever the current walk records in it.
+        """
+        stored = self._decisions.get(context)
+        table = dict(stored[2]) if stored is not None and stored[0] == config else {}
+        self._decisions[context] = (config, self.run, table)
+        return table
+
+    # ── directory rollups ──
+
+    def rollup(self, directory: str, files: bytes) -> Optional[int]:
+        """The stored total bytes of directory's files, if files (their fingerprint) is unchanged."""
+        stored = self._rollups.get(directory)
+        if stored is None or stored[1] != files:
+            return None
+        self._rollups[directory] = (self.run, files, stored[2])
+        return stored[2]
+
+    def put_rollup(self, directory: str, files: bytes, total_bytes: int) -> None:
+        """Store the total bytes of the files fingerprinted by files in directory (see rollup())."""
+        self._rollups[directory] = (self.run, files, total_bytes)
+
+    # ── persistence ──
+
+    def save(self) -> None:
+        """Prune stale entries and atomically replace the index file."""
+        oldest = self.run - _STALE_RUNS
+        listings = {key: entry for key, entry in self.listings.items() if entry[1] >= oldest}
+        rollups = {key: entry for key, entry in self._rollups.items() if entry[0] >= oldest}
+        recent = sorted(self._decisions.items(), key=lambda item: item[1][1], reverse=True)
+        decisions = {
+            context: (config, last_run, {key: entry for key, entry in table.items() if entry[1] >= oldest})
+            for context, (config, last_run, table) in recent[:_MAX_CONTEXTS]
+        }
+        payload = marshal.dumps({
+            'format': (_FORMAT, marshal.version),
+            'run': self.run,
+            'listings': listings,
+            'decisions': decisions,
+            'rollups': rollups,
+        })
+
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        exclude_from_walks(self._file.parent)
+        fd, tmp_name = tempfile.mkstemp(dir=self._file.parent, prefix=self._file.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(payload)
+            os.replace(tmp_name, self._file)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
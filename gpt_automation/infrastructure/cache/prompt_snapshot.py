@@ -0,0 +1,111 @@
+"""
+Snapshots of what earlier prompts showed, kept in .gpt/cache/snapshots/.
+
+One snapshot per (work_dir, content profiles) context maps each file to
+the (size, mtime_ns, content hash) of the version last shown in a prompt.
+`autogpt prompt --since_last` compares the walk's stat data with it: a file
+whose size and mtime are unchanged is not read at all, and one with a new
+mtime but the same hash is still unchanged. A file modified within the
+last two seconds is recorded so that its stat never matches: it is read
+(and hashed) again next time.
+
+Written with marshal, through a temporary file and os.replace, like the
+file index; an unreadable snapshot is treated as missing.
+"""
+
+import hashlib
+import marshal
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from gpt_automation.infrastructure.cache.file_index import exclude_from_walks
+
+_FORMAT = 1
+
+# Files modified this recently are recorded without their mtime: another
+# write within the same timestamp tick would leave size and mtime unchanged
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class SnapshotEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    content_hash: str     # '' when the file was not shown in full (binary, excerpt)
+
+    def matches(self, st: os.stat_result) -> bool:
+        """True when st still describes the version that was shown."""
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    @classmethod
+    def of(cls, st: os.stat_result, content_hash: str) -> 'SnapshotEntry':
+        """The entry for a file shown with stat st; racy mtimes never match again."""
+        racy = time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS
+        return cls(st.st_size, -1 if racy else st.st_mtime_ns, content_hash)
+
+
+class PromptSnapshot:
+    """
+    The files of one context as the last prompt showed them.
+
+    exists is False when no prompt for the context was recorded yet (or
+    the snapshot could not be read).
+    """
+
+    def __init__(self, snapshot_file: Path, files: Optional[dict] = None):
+        self._file = Path(snapshot_file)
+        self.exists = files is not None
+        self.files: dict[str, SnapshotEntry] = {
+            path: SnapshotEntry(*entry) for path, entry in (files or {}).items()
+        }
+
+    def get(self, path: Path) -> Optional[SnapshotEntry]:
+        return self.files.get(str(path))
+
+    def paths(self) -> Iterator[Path]:
+        """Every recorded path, in sorted order."""
+        return (Path(path) for path in sorted(self.files))
+
+    def save(self, files: dict[str, SnapshotEntry]) -> None:
+        """Atomically replace the snapshot with files."""
+        payload = marshal.dumps({
+            'format': (_FORMAT, marshal.version),
+            'files': {path: tuple(entry) for path, entry in files.items()},
+        })
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        exclude_from_walks(self._file.parent)
+        fd, tmp_name = tempfile.mkstemp(dir=self._file.parent, prefix=self._file.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(payload)
+            os.replace(tmp_name, self._file)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self.files = dict(files)
+        self.exists = True
+
+
+class PromptSnapshots:
+    """The snapshot directory; one file per (work_dir, profiles) context."""
+
+    def __init__(self, snapshots_dir: Path):
+        self._dir = Path(snapshots_dir)
+
+    def load(self, work_dir: Path, profiles: list[str]) -> PromptSnapshot:
+        """The context's snapshot; an empty one (exists False) when there is none."""
+        context = f"{work_dir}\0{','.join(sorted(set(profiles)))}"
+        name = hashlib.blake2b(context.encode('utf-8', errors='surrogateescape'), digest_size=8).hexdigest()
+        snapshot_file = self._dir / f'{name}.snapshot'
+        try:
+            data = marshal.loads(snapshot_file.read_bytes())
+            if not isinstance(data, dict) or data.get('format') != (_FORMAT, marshal.version):
+                data = None
+        except (OSError, ValueError, EOFError, TypeError):
+            data = None
+        return PromptSnapshot(snapshot_file, data['files'] if data is not None else None)
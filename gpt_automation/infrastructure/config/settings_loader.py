@@ -6,11 +6,13 @@ All I/O for settings lives here. Domain only ever sees ProjectSettings objects.
 
 import json
 from pathlib import Path
+from typing import Any
 
 from gpt_automation.infrastructure.config.settings_model import (
     ProjectSettings,
     PluginSettings,
     BuiltinPlugin,
+    ContentReadingSettings,
 )
 
 # Maps the JSON "plugin_name" field to our BuiltinPlugin enum.
@@ -29,6 +31,9 @@ _PLUGIN_TO_JSON_NAME: dict[BuiltinPlugin, str] = {
     BuiltinPlugin.BLOCKLIST_ALLOWLIST: 'bw_filter',
 }
 
+_KB = 1024
+_MB = 1024 * 1024
+
 
 class SettingsReader:
     """Read ProjectSettings from a JSON file."""
@@ -73,7 +78,55 @@ class SettingsReader:
                 options=args,
             ))
 
-        return ProjectSettings(plugins=plugins)
+        return ProjectSettings(
+            plugins=plugins,
+            content_reading=self._parse_content_reading(data.get('content_reading', {})),
+        )
+
+    @staticmethod
+    def _parse_content_reading(raw: dict) -> ContentReadingSettings:
+        """The optional "content_reading" section; missing keys keep their defaults."""
+        defaults = ContentReadingSettings()
+        threads = raw.get('threads', defaults.threads)
+        transform_processes = raw.get('transform_processes', defaults.transform_processes)
+        buffered_mb = raw.get('max_buffered_mb', defaults.max_buffered_bytes // _MB)
+        cache_mb = raw.get('cache_mb', defaults.cache_budget_bytes // _MB)
+        large_kb = raw.get('large_file_kb', defaults.large_file_bytes // _KB)
+        excerpt_kb = raw.get('excerpt_kb', defaults.excerpt_bytes // _KB)
+        by_profile = raw.get('large_file_kb_by_profile', {})
+        if not isinstance(by_profile, dict):
+            raise ValueError(f"content_reading.large_file_kb_by_profile must be an object, got {by_profile!r}")
+        for key, value in (('threads', threads), ('max_buffered_mb', buffered_mb), ('cache_mb', cache_mb),
+                           ('excerpt_kb', excerpt_kb), ('transform_processes', transform_processes)):
+            if not _is_int(value) or value < 1:
+                raise ValueError(f"content_reading.{key} must be a positive integer, got {value!r}")
+        for key, value in (('large_file_kb', large_kb), *(
+                (f'large_file_kb_by_profile.{name}', kb) for name, kb in by_profile.items())):
+            if not _is_int(value) or value < 0:
+                raise ValueError(f"content_reading.{key} must be an integer >= 0, got {value!r}")
+        deduplicate = raw.get('deduplicate', defaults.deduplicate)
+        dedup_by_profile = raw.get('deduplicate_by_profile', {})
+        if not isinstance(dedup_by_profile, dict):
+            raise ValueError(f"content_reading.deduplicate_by_profile must be an object, got {dedup_by_profile!r}")
+        for key, value in (('deduplicate', deduplicate), *(
+                (f'deduplicate_by_profile.{name}', flag) for name, flag in dedup_by_profile.items())):
+            if not isinstance(value, bool):
+                raise ValueError(f"content_reading.{key} must be true or false, got {value!r}")
+        return ContentReadingSettings(
+            threads=threads,
+            max_buffered_bytes=buffered_mb * _MB,
+            cache_budget_bytes=cache_mb * _MB,
+            large_file_bytes=large_kb * _KB,
+            excerpt_bytes=excerpt_kb * _KB,
+            large_file_bytes_by_profile={name: kb * _KB for name, kb in by_profile.items()},
+            deduplicate=deduplicate,
+            deduplicate_by_profile=dict(dedup_by_profile),
+            transform_processes=transform_processes,
+        )
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
 
 
 class SettingsWriter:
@@ -94,7 +147,21 @@ class SettingsWriter:
                     'args': {'enable': p.enabled, **p.options},
                 }
                 for p in settings.plugins
-            ]
+            ],
+            'content_reading': {
+                'threads': settings.content_reading.threads,
+                'max_buffered_mb': settings.content_reading.max_buffered_bytes // _MB,
+                'cache_mb': settings.content_reading.cache_budget_bytes // _MB,
+                'large_file_kb': settings.content_reading.large_file_bytes // _KB,
+                'excerpt_kb': settings.content_reading.excerpt_bytes // _KB,
+                'large_file_kb_by_profile': {
+                    name: size // _KB
+                    for name, size in settings.content_reading.large_file_bytes_by_profile.items()
+                },
+                'deduplicate': settings.content_reading.deduplicate,
+                'deduplicate_by_profile': dict(settings.content_reading.deduplicate_by_profile),
+                'transform_processes': settings.content_reading.transform_processes,
+            },
         }
 
         self._file.write_text(json.dumps(data, indent=2), encoding='utf-8')
@@ -37,17 +37,79 @@ class PluginSettings:
         return self.options.get(key, default)
 
 
+@dataclass
+class ContentReadingSettings:
+    """
+    How file contents are read for the content prompt.
+
+    threads            – files read and decoded concurrently (1 = serially)
+    max_buffered_bytes – cap on the size of files read ahead of the output
+    cache_budget_bytes – decoded text kept in .gpt/cache/ between runs
+    large_file_bytes   – files above this size are shown as a head and a
+                         tail excerpt (0 = always read in full)
+    excerpt_bytes      – size of the head, and of the tail, of an excerpt
+    large_file_bytes_by_profile – large_file_bytes for runs with a profile
+    deduplicate        – show files with the same bytes as an earlier one
+                         as a reference to it
+    deduplicate_by_profile – deduplicate for runs with a profile
+    transform_processes – processes outlining or minifying files
+                         (prompt --outline, --minify; 1 = in this process)
+    """
+
+    threads: int = 8
+    max_buffered_bytes: int = 64 * 1024 * 1024
+    cache_budget_bytes: int = 256 * 1024 * 1024
+    large_file_bytes: int = 1024 * 1024
+    excerpt_bytes: int = 16 * 1024
+    large_file_bytes_by_profile: dict[str, int] = field(default_factory=dict)
+    deduplicate: bool = True
+    deduplicate_by_profile: dict[str, bool] = field(default_factory=dict)
+    transform_processes: int = 4
+
+    def policy(self, profiles: list[str]) -> 'ContentPolicy':
+        """How contents are shown in a run with profiles."""
+        return ContentPolicy(self.large_file_threshold(profiles), self.deduplicate_for(profiles))
+
+    def large_file_threshold(self, profiles: list[str]) -> int:
+        """
+        large_file_bytes for a run with profiles: the most generous value
+        any of them sets, else the default. 0 means no limit.
+        """
+        values = [self.large_file_bytes_by_profile[p] for p in profiles if p in self.large_file_bytes_by_profile]
+        if not values:
+            return self.large_file_bytes
+        return 0 if 0 in values else max(values)
+
+    def deduplicate_for(self, profiles: list[str]) -> bool:
+        """deduplicate for a run with profiles; any of them turning it off wins."""
+        values = [self.deduplicate_by_profile[p] for p in profiles if p in self.deduplicate_by_profile]
+        if not values:
+            return self.deduplicate
+        return all(values)
+
+
+@dataclass(frozen=True)
+class ContentPolicy:
+    """Content settings resolved for one run's profiles."""
+
+    large_file_bytes: int = 0     # 0 = no excerpts
+    deduplicate: bool = False
+    outline: bool = False         # Python files as outlines (asked for per run)
+    minify: bool = False          # Comments and redundant whitespace removed (per run)
+
+
 @dataclass
 class ProjectSettings:
     """
     Full project settings.
 
-    Holds the configuration for all plugins.
+    Holds the configuration for all plugins and for content reading.
     Loaded from base_settings.json; use ProjectSettings.defaults() for a
     fresh project that hasn't been configured yet.
     """
 
     plugins: list[PluginSettings] = field(default_factory=list)
+    content_reading: ContentReadingSettings = field(default_factory=ContentReadingSettings)
 
     @classmethod
     def defaults(cls) -> 'ProjectSettings':
@@ -0,0 +1,125 @@
+"""
+FileLister of the files changed against a git ref (`prompt --changed_vs`).
+
+The changed set comes from `git diff --name-only REF` (tracked files
+modified, staged or added since REF) plus the untracked files that are not
+ignored; files deleted since REF are not on disk and are left out. Only
+those paths go through the filter chain, so a review prompt costs in
+proportion to the diff, not to the repository.
+
+With neighbours, the tests of changed files and the files changed tests
+exercise are added as well (see find_neighbours).
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterable, Optional
+
+from gpt_automation.domain.traversal.listed_files_walker import FileLister
+from gpt_automation.infrastructure.filesystem.git_file_lister import rebased
+from gpt_automation.plugins.ignore_plugin.utils.git_tools import diff_names, find_git_root, ls_files
+
+# Directories next to (or above) a source file that hold its tests
+_TEST_DIRS = ('tests', 'test')
+
+
+class GitDiffLister(FileLister):
+    """The changed files of one git work tree, computed once."""
+
+    def __init__(self, git_root: Path, files: Iterable[Path]):
+        self._git_root = Path(git_root).resolve()
+        self._files = sorted(files)
+
+    @classmethod
+    def for_ref(cls, directory: Path, ref: str, neighbours: bool = False) -> 'GitDiffLister':
+        """
+        The files of directory's checkout that changed against ref.
+
+        Raises ValueError outside a checkout or when git cannot diff
+        against ref (e.g. an unknown ref), with git's message.
+        """
+        git_root = find_git_root(str(directory))
+        if not git_root:
+            raise ValueError(f"{directory} is not inside a git checkout")
+        root = Path(git_root).resolve()
+        try:
+            names = diff_names(root, ref) + ls_files(root, '--others', '--exclude-standard')
+        except subprocess.CalledProcessError as e:
+            detail = (e.stderr or b'').decode('utf-8', errors='replace').strip()
+            raise ValueError(f"git diff against {ref!r} failed" + (f": {detail}" if detail else '')) from e
+        except OSError as e:
+            raise ValueError(f"Could not run git: {e}") from e
+
+        files = {root / name for name in names}
+        files = {path for path in files if os.path.isfile(path)}
+        if neighbours:
+            files |= find_neighbours(files, root)
+        return cls(root, files)
+
+    def list_files(self, root_dir: Path) -> Optional[list[Path]]:
+        given = Path(root_dir)
+        root_dir = given.resolve()
+        if root_dir != self._git_root and self._git_root not in root_dir.parents:
+            return None
+        return rebased([path for path in self._files if root_dir in path.parents], root_dir, given)
+
+
+def find_neighbours(files: Iterable[Path], git_root: Path) -> set[Path]:
+    """
+    Direct neighbours of files that are not in files themselves.
+
+    For a source file foo.py: test_foo.py, foo_test.py, foo_tests.py,
+    foo.test.py and foo.spec.py in its own directory, and in the tests/
+    and test/ directories of its directory and each parent up to git_root.
+    For a test file test_foo.py (or foo_test.py, ...): foo.py in its own
+    directory and in the parent directory. Only the directories looked at
+    are listed, each once.
+    """
+    git_root = Path(git_root)
+    files = set(files)
+    listings: dict[Path, set[str]] = {}
+
+    def names_in(directory: Path) -> set[str]:
+        if directory not in listings:
+            try:
+                with os.scandir(directory) as entries:
+                    listings[directory] = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                listings[directory] = set()
+        return listings[directory]
+
+    found = set()
+    for path in files:
+        stem, suffix = _split_name(path.name)
+        subject = _tested_stem(stem)
+        if subject is not None:
+            wanted = {subject + suffix}
+            directories = [path.parent, path.parent.parent]
+        else:
+            wanted = {f'test_{stem}{suffix}', f'{stem}_test{suffix}', f'{stem}_tests{suffix}',
+                      f'{stem}.test{suffix}', f'{stem}.spec{suffix}'}
+            directories = [path.parent]
+            for directory in (path.parent, *path.parent.parents):
+                directories.extend(directory / name for name in _TEST_DIRS)
+                if directory == git_root or git_root not in directory.parents:
+                    break
+        for directory in directories:
+            found.update(directory / name for name in wanted & names_in(directory))
+    return found - files
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """'foo.py' -> ('foo', '.py'); 'foo.test.ts' -> ('foo.test', '.ts')."""
+    stem, dot, suffix = name.rpartition('.')
+    return (stem, dot + suffix) if stem else (name, '')
+
+
+def _tested_stem(stem: str) -> Optional[str]:
+    """The stem of the file a test file tests, or None for a non-test file."""
+    if stem.startswith('test_') and len(stem) > 5:
+        return stem[5:]
+    for marker in ('_tests', '_test', '.test', '.spec'):
+        if stem.endswith(marker) and len(stem) > len(marker):
+            return stem[:-len(marker)]
+    return None
@@ -0,0 +1,90 @@
+"""
+FileLister backed by the local git repository.
+
+Inside a checkout git has already resolved .gitignore (plus
+.git/info/exclude and the global excludes file) for every file it knows:
+
+- tracked files come straight from .git/index, parsed here
+  (`git ls-files --cached` when the index layout is not supported)
+- untracked files that are not ignored come from
+  `git ls-files --others --exclude-standard`
+
+so no directory is listed and no .gitignore is evaluated in Python.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from gpt_automation.domain.traversal.listed_files_walker import FileLister
+from gpt_automation.plugins.ignore_plugin.utils.git_tools import (
+    find_git_root,
+    git_dir_of,
+    ls_files,
+    read_index_paths,
+)
+
+
+class GitFileLister(FileLister):
+    """
+    Enumerate the files of one git work tree.
+
+    Submodules are not descended into, and tracked files deleted from the
+    work tree are dropped, so the list matches what is on disk.
+    """
+
+    def __init__(self, git_root: Path):
+        self._git_root = Path(git_root).resolve()
+        self._index_file = Path(git_dir_of(str(self._git_root))) / 'index'
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> Optional['GitFileLister']:
+        """A lister for the checkout containing directory, or None outside git."""
+        git_root = find_git_root(str(directory))
+        return cls(Path(git_root)) if git_root else None
+
+    @property
+    def git_root(self) -> Path:
+        return self._git_root
+
+    def list_files(self, root_dir: Path) -> Optional[list[Path]]:
+        given = Path(root_dir)
+        root_dir = given.resolve()
+        if root_dir != self._git_root and self._git_root not in root_dir.parents:
+            return None
+        try:
+            tracked = self._tracked_below(root_dir)
+            untracked = ls_files(root_dir, '--others', '--exclude-standard')
+        except (subprocess.CalledProcessError, OSError):
+            return None
+
+        files = [root_dir / rel for rel in untracked]
+        files.extend(path for path in tracked if os.path.isfile(path))
+        files.sort()
+        return rebased(files, root_dir, given)
+
+    def _tracked_below(self, root_dir: Path) -> list[Path]:
+        try:
+            names = [os.fsdecode(name) for name in read_index_paths(self._index_file)]
+        except (OSError, ValueError):
+            return [root_dir / rel for rel in ls_files(root_dir, '--cached')]
+
+        prefix = root_dir.relative_to(self._git_root).as_posix()
+        if prefix == '.':
+            return [self._git_root / name for name in names]
+        prefix += '/'
+        return [self._git_root / name for name in names if name.startswith(prefix)]
+
+
+def rebased(files: list[Path], resolved: Path, given: Path) -> list[Path]:
+    """
+    files below resolved (the real path of a directory), as paths below
+    given (the directory as the caller named it, e.g. through a symlink).
+
+    Filters compare paths with the ones they were built for, so listed
+    files have to come back under the caller's spelling. Order is kept.
+    """
+    if resolved == given:
+        return files
+    return [given / path.relative_to(resolved) for path in files]
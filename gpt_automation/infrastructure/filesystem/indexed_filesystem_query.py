@@ -0,0 +1,83 @@
+"""
+FilesystemQuery that answers directory listings from the persistent FileIndex.
+
+A cached listing is reused while the directory's mtime is unchanged; only
+directories that gained, lost or renamed entries since the last run are
+listed again.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from gpt_automation.domain.traversal.directory_reader import (
+    FilesystemQuery,
+    DirectoryEntry,
+    EntryKind,
+)
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.filesystem.os_filesystem_query import FilesystemAccessError
+
+_KIND_CODES = {EntryKind.FILE: 'f', EntryKind.DIRECTORY: 'd', EntryKind.OTHER: 'o'}
+_CODE_KINDS = {code: kind for kind, code in _KIND_CODES.items()}
+
+# Directories modified this recently are listed but not cached: on
+# filesystems with coarse timestamps a later change in the same tick would
+# leave the mtime unchanged (git's "racy clean" problem)
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class IndexedFilesystemQuery(FilesystemQuery):
+    """
+    Wraps another FilesystemQuery, caching scan_directory results in a FileIndex.
+
+    A hit costs one stat of the directory instead of a full listing. Stat
+    data is never cached (it would be stale for files modified in place):
+    a miss requested with_stat passes on the stat the inner listing made,
+    a hit has none, and the walker stats the files it yields.
+    """
+
+    def __init__(self, inner: FilesystemQuery, index: FileIndex):
+        self._inner = inner
+        self._index = index
+
+    def is_file(self, path: Path) -> bool:
+        return self._inner.is_file(path)
+
+    def is_directory(self, path: Path) -> bool:
+        return self._inner.is_directory(path)
+
+    def stat(self, path: Path):
+        return self._inner.stat(path)
+
+    def list_directory(self, dir_path: Path) -> list[Path]:
+        return self._inner.list_directory(dir_path)
+
+    def scan_directory(self, dir_path: Path, with_stat: bool = False) -> list[DirectoryEntry]:
+        dir_path = Path(dir_path)
+        key = str(dir_path)
+        try:
+            # Stat before listing: a change racing the listing leaves a newer
+            # mtime on disk than the one stored, forcing a re-list next run
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError as e:
+            raise FilesystemAccessError(f"Cannot read directory {dir_path}: {e}")
+
+        listings = self._index.listings
+        cached = listings.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            _, _, names, kinds = cached
+            listings[key] = (mtime_ns, self._index.run, names, kinds)
+            return [DirectoryEntry(dir_path / name, _CODE_KINDS[code]) for name, code in zip(names, kinds)]
+
+        entries = self._inner.scan_directory(dir_path, with_stat)
+        if time.time_ns() - mtime_ns > _RACY_WINDOW_NS:
+            listings[key] = (
+                mtime_ns,
+                self._index.run,
+                tuple(entry.path.name for entry in entries),
+                ''.join(_KIND_CODES[entry.kind] for entry in entries),
+            )
+        else:
+            listings.pop(key, None)
+        return entries
@@ -7,7 +7,12 @@ Domain layer never imports from here — only infrastructure does.
 
 import os
 from pathlib import Path
-from gpt_automation.domain.traversal.directory_reader import FilesystemQuery
+from typing import Optional
+from gpt_automation.domain.traversal.directory_reader import (
+    FilesystemQuery,
+    DirectoryEntry,
+    EntryKind,
+)
 
 
 class OsFilesystemQuery(FilesystemQuery):
@@ -24,6 +29,12 @@ class OsFilesystemQuery(FilesystemQuery):
     def is_directory(self, path: Path) -> bool:
         return Path(path).is_dir()
 
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
     def list_directory(self, dir_path: Path) -> list[Path]:
         """List all entries in directory, raising on failure."""
         try:
@@ -31,7 +42,40 @@ class OsFilesystemQuery(FilesystemQuery):
         except (OSError, PermissionError) as e:
             raise FilesystemAccessError(f"Cannot read directory {dir_path}: {e}")
 
+    def scan_directory(self, dir_path: Path, with_stat: bool = False) -> list[DirectoryEntry]:
+        """
+        List a directory with os.scandir, classifying entries from d_type.
+
+        On Linux is_file / is_dir need no extra syscall except for symlinks
+        (and filesystems that do not report d_type). with_stat costs one
+        stat per file entry (directories get none: nothing uses it).
+        """
+        dir_path = Path(dir_path)
+        try:
+            with os.scandir(dir_path) as it:
+                return [self._typed_entry(dir_path, entry, with_stat) for entry in it]
+        except (OSError, PermissionError) as e:
+            raise FilesystemAccessError(f"Cannot read directory {dir_path}: {e}")
+
+    @staticmethod
+    def _typed_entry(dir_path: Path, entry: os.DirEntry, with_stat: bool) -> DirectoryEntry:
+        try:
+            if entry.is_file():
+                kind = EntryKind.FILE
+            elif entry.is_dir():
+                kind = EntryKind.DIRECTORY
+            else:
+                kind = EntryKind.OTHER
+            stat = entry.stat() if with_stat and kind is EntryKind.FILE else None
+        except OSError:
+            kind, stat = EntryKind.OTHER, None
+        return DirectoryEntry(dir_path / entry.name, kind, stat)
+
 
-class FilesystemAccessError(Exception):
-    """Raised when the OS denies a filesystem operation."""
+class FilesystemAccessError(OSError):
+    """
+    Raised when the OS denies a filesystem operation.
+
+    An OSError so callers that skip unreadable directories catch it.
+    """
     pass
@@ -53,6 +53,36 @@ class ProjectPaths:
         """Directory for log files."""
         return self.gpt_dir / 'logs'
 
+    @property
+    def cache_dir(self) -> Path:
+        """Directory for caches rebuilt on demand (safe to delete)."""
+        return self.gpt_dir / 'cache'
+
+    @property
+    def file_index_file(self) -> Path:
+        """Path to the persistent walk index."""
+        return self.cache_dir / 'file_index.bin'
+
+    @property
+    def content_cache_file(self) -> Path:
+        """Path to the persistent cache of decoded file contents."""
+        return self.cache_dir / 'contents.sqlite'
+
+    @property
+    def snapshots_dir(self) -> Path:
+        """Directory of what earlier prompts showed, for `prompt --since_last`."""
+        return self.cache_dir / 'snapshots'
+
+    @property
+    def output_dir(self) -> Path:
+        """Directory split prompts are written to (part-001.txt, ...)."""
+        return self.gpt_dir / 'out'
+
+    @property
+    def watch_socket(self) -> Path:
+        """Unix socket a running `autogpt watch` serves prompts on."""
+        return self.cache_dir / 'watch.sock'
+
     def plugin_dir(self, plugin_name: str) -> Path:
         """Get directory for a specific plugin."""
         return self.plugins_dir / plugin_name
@@ -0,0 +1,175 @@
+"""
+Decode file bytes to text, cheapest test first.
+
+Almost every file in a source tree is ASCII or UTF-8, which the codecs
+check at C speed. chardet is pure Python and costs tens of milliseconds per
+100 KB, so it only runs when strict UTF-8 fails, and then only on a bounded
+window around the first byte UTF-8 rejected. Encodings that detection finds
+are remembered for the rest of the run per directory and per extension, so
+a folder of legacy Latin-1 files is detected once, not once per file.
+
+looks_binary() tells images, archives and bytecode apart from text using
+only a file's leading block, so they need never be read in full.
+"""
+
+import codecs
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+# Bytes handed to chardet, centred on the first byte UTF-8 rejected
+DEFAULT_SAMPLE_SIZE = 4 * 1024
+
+# Detections below this confidence are used but not remembered. chardet
+# never rates ISO-8859-1 above 0.73, the most common legacy encoding
+_REMEMBER_CONFIDENCE = 0.7
+
+# Leading bytes inspected by looks_binary (git sniffs the first 8000)
+SNIFF_SIZE = 8 * 1024
+
+# Text allows whitespace controls (\b \t \n \f \r, ESC for ANSI colour)
+# and every byte >= 0x80, which legacy encodings use for letters
+_TEXT_BYTES = bytes({8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7F)) | set(range(0x80, 0x100)))
+
+# Perl's -B heuristic: binary when over 30% of the bytes are odd controls
+_MAX_CONTROL_RATIO = 0.3
+
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+class TextDecoder:
+    """
+    Tiered decoding with a per-run encoding cache.
+
+    1. a byte-order mark decides the encoding outright
+    2. ASCII, then strict UTF-8
+    3. an encoding already detected for the same directory, or a multi-byte
+       one for the same extension, if it decodes the bytes strictly
+    4. chardet on a sample; the result decodes the whole file, with
+       replacement characters for anything it cannot map
+
+    One instance lives for one run (it is not persisted) and may be shared
+    by reader threads. stats counts how many files each tier settled.
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self._sample_size = sample_size
+        self._by_directory: dict[Path, str] = {}
+        self._by_extension: dict[str, str] = {}
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+    def decode(self, raw: bytes, file_path: Path) -> str:
+        return self.decode_with_encoding(raw, file_path)[0]
+
+    def decode_with_encoding(self, raw: bytes, file_path: Path) -> tuple[str, str]:
+        """(text, name of the encoding that produced it)."""
+        for bom, encoding in _BOMS:
+            if raw.startswith(bom):
+                self._count('bom')
+                return raw.decode(encoding, errors='replace'), encoding
+
+        if raw.isascii():
+            self._count('ascii')
+            return raw.decode('ascii'), 'ascii'
+        try:
+            text = raw.decode('utf-8')
+        except UnicodeDecodeError as e:
+            first_bad = e.start
+        else:
+            self._count('utf-8')
+            return text, 'utf-8'
+
+        for encoding in self._remembered(file_path):
+            try:
+                text = raw.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            self._count('cached')
+            return text, encoding
+
+        self._count('detected')
+        return self._detect_and_decode(raw, first_bad, file_path)
+
+    def _count(self, tier: str) -> None:
+        with self._stats_lock:
+            self.stats[tier] += 1
+
+    def _remembered(self, file_path: Path) -> list[str]:
+        candidates = []
+        for encoding in (self._by_directory.get(file_path.parent), self._by_extension.get(file_path.suffix)):
+            if encoding and encoding not in candidates:
+                candidates.append(encoding)
+        return candidates
+
+    def _detect_and_decode(self, raw: bytes, first_bad: int, file_path: Path) -> tuple[str, str]:
+        encoding, confidence = self._detect(self._sample(raw, first_bad))
+        if encoding is None:
+            return raw.decode('utf-8', errors='replace'), 'utf-8'
+        try:
+            text = raw.decode(encoding)
+        except LookupError:
+            return raw.decode('utf-8', errors='replace'), 'utf-8'
+        except UnicodeDecodeError:
+            # The sample was not representative; keep what decodes
+            return raw.decode(encoding, errors='replace'), encoding
+
+        if confidence >= _REMEMBER_CONFIDENCE:
+            self._by_directory[file_path.parent] = encoding
+            # A single-byte charset decodes anything, so strict decoding
+            # cannot reject a wrong guess; only a shared folder vouches for it
+            if file_path.suffix and not _is_single_byte(encoding):
+                self._by_extension[file_path.suffix] = encoding
+        return text, encoding
+
+    def _sample(self, raw: bytes, first_bad: int) -> bytes:
+        """A window of sample_size bytes around first_bad (the ASCII prefix tells chardet nothing)."""
+        if len(raw) <= self._sample_size:
+            return raw
+        start = max(0, min(first_bad - self._sample_size // 4, len(raw) - self._sample_size))
+        return raw[start:start + self._sample_size]
+
+    @staticmethod
+    def _detect(sample: bytes) -> tuple[Optional[str], float]:
+        try:
+            import chardet
+        except ImportError:
+            return None, 0.0
+        detected = chardet.detect(sample)
+        encoding = detected.get('encoding')
+        if encoding and encoding.lower() in ('ascii', 'utf-8'):
+            # Strict UTF-8 already failed on the whole file
+            return None, 0.0
+        return encoding, detected.get('confidence') or 0.0
+
+
+def looks_binary(block: bytes) -> bool:
+    """
+    Whether a file starting with block is binary rather than text.
+
+    A NUL byte or a high share of control characters means binary, unless
+    a UTF-16/32 byte-order mark explains the NULs. BOM-less UTF-16 is
+    therefore classed as binary, as git does.
+    """
+    if not block or any(block.startswith(bom) for bom, _ in _BOMS):
+        return False
+    if b'\0' in block:
+        return True
+    controls = len(block.translate(None, _TEXT_BYTES))
+    return controls > len(block) * _MAX_CONTROL_RATIO
+
+
+@lru_cache(maxsize=None)
+def _is_single_byte(encoding: str) -> bool:
+    """True when every byte decodes to one character on its own (Latin-1, cp1252, ...)."""
+    high = bytes(range(0x80, 0x100))
+    return len(high.decode(encoding, errors='replace')) == len(high)
@@ -77,13 +77,20 @@ class FileLogger(Logger):
 
 
 class ConsoleLogger(Logger):
-    """Write logs to console (stdout/stderr)."""
+    """
+    Write logs to console (stdout/stderr).
+
+    info_to_stderr keeps stdout clean when the prompt itself goes there.
+    """
+
+    def __init__(self, info_to_stderr: bool = False):
+        self._info_to_stderr = info_to_stderr
 
     def debug(self, message: str) -> None:
         pass  # Don't spam console with debug
 
     def info(self, message: str) -> None:
-        print(f"INFO: {message}")
+        print(f"INFO: {message}", file=sys.stderr if self._info_to_stderr else sys.stdout)
 
     def warning(self, message: str) -> None:
         print(f"WARNING: {message}", file=sys.stderr)
@@ -0,0 +1 @@
+"""Destinations a prompt is written to: clipboard, stdout, a file or a pipe."""
@@ -0,0 +1,292 @@
+"""
+Output sinks: where GeneratePrompts writes a prompt, block by block.
+
+A prompt can be hundreds of megabytes. Sinks backed by a stream (a file,
+stdout, a pipe) pass each block straight through, so memory stays flat
+however large the output grows. The clipboard takes one string, so
+ClipboardSink has to collect the text first; it is only as cheap as the
+old behaviour, not cheaper.
+
+SplitSink cuts a prompt into numbered parts of bounded size, opening each
+part only when the previous one is full, so the first part is complete
+(and renamed into place) while later files are still being read.
+"""
+
+import io
+import os
+import subprocess
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+from gpt_automation.domain.tokens import estimate_tokens
+from gpt_automation.infrastructure.cache.file_index import exclude_from_walks
+
+
+class OutputSink(ABC):
+    """
+    Receives a prompt as a sequence of text chunks.
+
+    Use as a context manager: close() runs on exit, also after an error.
+    written counts the characters accepted so far.
+    """
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, text: str) -> None:
+        if text:
+            self._write(text)
+            self.written += len(text)
+
+    def write_block(self, header: str, body: str = '', separator: str = '') -> None:
+        """
+        Write one block of the prompt (the tree, or a file's header and
+        contents), preceded by separator. Sinks that split their output
+        keep a block in one piece where they can.
+        """
+        self.write(separator + header)
+        self.write(body)
+
+    @abstractmethod
+    def _write(self, text: str) -> None:
+        ...
+
+    def close(self) -> None:
+        """Flush and release the destination."""
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class StreamSink(OutputSink):
+    """Write to an open text stream (stdout, a pipe); the stream stays open."""
+
+    def __init__(self, stream: TextIO):
+        super().__init__()
+        self._stream = stream
+
+    def _write(self, text: str) -> None:
+        self._stream.write(text)
+
+    def close(self) -> None:
+        self._stream.flush()
+
+
+class FileSink(OutputSink):
+    """
+    Write to a file through a temporary sibling, renamed into place on close.
+
+    Readers never see a half-written prompt, and a failed run leaves any
+    previous file untouched. A path that exists but is not a regular file
+    (a named pipe, /dev/stdout) is written directly.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self._path = Path(path)
+        self._tmp_name = None
+        if self._path.exists() and not self._path.is_file():
+            self._file = open(self._path, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+        else:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp_name = tempfile.mkstemp(dir=self._path.parent, prefix=self._path.name, suffix='.tmp')
+            self._file = os.fdopen(fd, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+        self._failed = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _write(self, text: str) -> None:
+        self._file.write(text)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.close()
+        if self._tmp_name is None:
+            return
+        if self._failed:
+            os.unlink(self._tmp_name)
+        else:
+            os.replace(self._tmp_name, self._path)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._failed = exc_type is not None
+        self.close()
+
+
+class BufferSink(OutputSink):
+    """Collect everything in memory; getvalue() returns it."""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = io.StringIO()
+
+    def _write(self, text: str) -> None:
+        self._buffer.write(text)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+class ClipboardSink(OutputSink):
+    """Copy the collected text to the system clipboard on close (stdout if unavailable)."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[str] = []
+
+    def _write(self, text: str) -> None:
+        self._chunks.append(text)
+
+    def close(self) -> None:
+        chunks, self._chunks = self._chunks, []
+        if not chunks:
+            return
+        try:
+            import pyperclip
+            pyperclip.copy(''.join(chunks))
+        except Exception:
+            print(*chunks, sep='')  # Fall back to stdout
+
+
+class CommandSink(OutputSink):
+    """Pipe the text into a shell command's stdin; close() waits for it to finish."""
+
+    def __init__(self, command: str, env: Optional[dict] = None):
+        super().__init__()
+        self._command = command
+        self._process = subprocess.Popen(
+            command, shell=True, stdin=subprocess.PIPE, text=True, encoding='utf-8',
+            env={**os.environ, **(env or {})},
+        )
+
+    def _write(self, text: str) -> None:
+        self._process.stdin.write(text)
+
+    def close(self) -> None:
+        if self._process.stdin.closed:
+            return
+        self._process.stdin.close()
+        status = self._process.wait()
+        if status != 0:
+            raise OSError(f"{self._command!r} exited with status {status}")
+
+
+class PartFiles:
+    """
+    Opens part-001.txt, part-002.txt, ... in a directory, as FileSinks.
+
+    Parts left from an earlier run are removed when part 1 is opened, so
+    the directory only ever holds parts of one prompt.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def __call__(self, number: int) -> OutputSink:
+        if number == 1:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            exclude_from_walks(self.directory)
+            for stale in self.directory.glob('part-[0-9][0-9][0-9]*.txt'):
+                stale.unlink(missing_ok=True)
+        return FileSink(self.directory / f'part-{number:03d}.txt')
+
+
+class SplitSink(OutputSink):
+    """
+    Split the text into numbered parts of at most max_bytes (UTF-8) and/or
+    max_tokens (estimated) each.
+
+    open_part(n) creates the sink for part n (see PartFiles); it is called
+    when the first text for that part arrives, after part n - 1 is closed.
+    A block that does not fit what is left of a part starts the next one.
+    Only a block larger than a whole part is cut, at line boundaries (a
+    single line longer than a part still goes in whole).
+    """
+
+    def __init__(
+        self,
+        open_part: Callable[[int], OutputSink],
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        if max_bytes is None and max_tokens is None:
+            raise ValueError("SplitSink needs max_bytes or max_tokens")
+        super().__init__()
+        self._open_part = open_part
+        self._max_bytes = max_bytes
+        self._max_tokens = max_tokens
+        self._part: Optional[OutputSink] = None
+        self._bytes = 0
+        self._tokens = 0
+        self.parts = 0
+
+    def write_block(self, header: str, body: str = '', separator: str = '') -> None:
+        head, rest = self._cost(separator + header), self._cost(body)
+        if self._part is not None and self._bytes and not self._fits(head[0] + rest[0], head[1] + rest[1]):
+            self._next_part()
+            separator = ''  # Parts do not start with blank lines
+            head = self._cost(header)
+        self._emit(separator + header, *head)
+        self._emit(body, *rest)
+        self.written += len(separator) + len(header) + len(body)
+
+    def _write(self, text: str) -> None:
+        self._emit(text, *self._cost(text))
+
+    def close(self) -> None:
+        if self._part is not None:
+            part, self._part = self._part, None
+            part.close()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._part is not None:
+            part, self._part = self._part, None
+            part.__exit__(exc_type, exc, tb)
+
+    # ── internals ──
+
+    def _emit(self, text: str, size: int, tokens: int) -> None:
+        if not text:
+            return
+        if self._part is None:
+            self._next_part()
+        if self._fits(size, tokens):
+            self._put(text, size, tokens)
+            return
+        for line in text.splitlines(keepends=True):
+            size, tokens = self._cost(line)
+            if self._bytes and not self._fits(size, tokens):
+                self._next_part()
+            self._put(line, size, tokens)
+
+    def _cost(self, text: str) -> tuple[int, int]:
+        """(UTF-8 bytes, estimated tokens) of text; tokens are only counted when limited."""
+        tokens = estimate_tokens(text) if self._max_tokens is not None else 0
+        return _utf8_len(text), tokens
+
+    def _fits(self, size: int, tokens: int) -> bool:
+        return ((self._max_bytes is None or self._bytes + size <= self._max_bytes)
+                and (self._max_tokens is None or self._tokens + tokens <= self._max_tokens))
+
+    def _put(self, text: str, size: int, tokens: int) -> None:
+        self._part.write(text)
+        self._bytes += size
+        self._tokens += tokens
+
+    def _next_part(self) -> None:
+        self.close()
+        self.parts += 1
+        self._part = self._open_part(self.parts)
+        self._bytes = self._tokens = 0
+
+
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8', errors='surrogateescape'))
@@ -0,0 +1,123 @@
+"""
+FileFilter decorator that replays filter decisions recorded by earlier runs.
+
+Whether a path passes the ignore / include-only / blocklist filters depends
+only on its name, the settings, the blocklist files and the rule files
+(.gitignore, .gptignore, .gptincludeonly) of its ancestor directories. While
+none of those changed, the decision recorded last run is still right, and
+the rule files of a fully cached subtree never need to be read or matched.
+"""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.infrastructure.cache.file_index import fingerprint, rule_file_signatures
+
+# Rule files modified this recently do not make their decisions cacheable:
+# two edits within one timestamp tick could leave the signature unchanged
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class _Frame:
+    """Decision state of one entered directory."""
+
+    __slots__ = ('path', 'fingerprint', 'trusted', 'cached', 'decisions', 'entered')
+
+    def __init__(self, path: Path, fingerprint: bytes, trusted: bool, cached: Optional[dict]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.trusted = trusted
+        self.cached = cached         # Last run's decisions, None when invalid
+        self.decisions: dict = {}    # Decisions made during this walk
+        self.entered = False         # Whether the wrapped filter was told about it
+
+
+class CachedDecisionFilter(FileFilter):
+    """
+    Answer from the decision table when a directory's rule chain is unchanged.
+
+    Each entered directory gets a fingerprint chaining its parent's with the
+    (mtime_ns, size) of its own rule files — a few stats, no reads. If the
+    table holds decisions under the same fingerprint they are replayed;
+    otherwise, or for names not seen before, the wrapped filter decides.
+
+    The wrapped filter is told about a directory only when it first has to
+    decide something inside it (ancestors first), so its pattern files are
+    never read for subtrees answered entirely from the table.
+    """
+
+    def __init__(
+        self,
+        inner: FileFilter,
+        table: dict,
+        run: int,
+        base_fingerprint: bytes,
+        rule_filenames: list[str],
+    ):
+        """
+        inner            – the filter chain built from settings
+        table            – FileIndex.decisions_for(...) result, updated in place
+        run              – FileIndex.run, stamped on every entry written
+        base_fingerprint – settings, profiles, blocklists and rule files above work_dir
+        rule_filenames   – every file name the filters read per directory
+        """
+        self._inner = inner
+        self._table = table
+        self._run = run
+        self._base = base_fingerprint
+        self._rule_filenames = rule_filenames
+        self._stack: list[_Frame] = []
+
+    def should_include_file(self, file_path: Path) -> bool:
+        return self._decide(file_path, Path(file_path).name, self._inner.should_include_file)
+
+    def should_include_directory(self, dir_path: Path) -> bool:
+        if not self._stack:
+            # The walk root is checked before it is entered; nothing to replay
+            return self._inner.should_include_directory(dir_path)
+        return self._decide(dir_path, Path(dir_path).name + '/', self._inner.should_include_directory)
+
+    def enter_directory(self, dir_path: Path) -> None:
+        parent = self._stack[-1] if self._stack else None
+        signatures = rule_file_signatures(dir_path, self._rule_filenames)
+        chained = fingerprint(parent.fingerprint if parent else self._base, *signatures)
+        racy_after = time.time_ns() - _RACY_WINDOW_NS
+        trusted = (parent is None or parent.trusted) and not any(
+            signature and signature[0] > racy_after for _, signature in signatures
+        )
+
+        stored = self._table.get(str(dir_path))
+        cached = stored[2] if stored is not None and stored[0] == chained else None
+        self._stack.append(_Frame(Path(dir_path), chained, trusted, cached))
+
+    def leave_directory(self, dir_path: Path) -> None:
+        frame = self._stack.pop()
+        key = str(dir_path)
+        if frame.trusted:
+            if frame.cached:
+                # Keep decisions for entries this walk did not ask about
+                frame.decisions = {**frame.cached, **frame.decisions}
+            self._table[key] = (frame.fingerprint, self._run, frame.decisions)
+        else:
+            self._table.pop(key, None)
+        if frame.entered:
+            self._inner.leave_directory(dir_path)
+
+    def _decide(self, path: Path, name_key: str, decide) -> bool:
+        frame = self._stack[-1]
+        if frame.cached is not None and name_key in frame.cached:
+            decision = frame.cached[name_key]
+        else:
+            self._catch_up()
+            decision = decide(path)
+        frame.decisions[name_key] = decision
+        return decision
+
+    def _catch_up(self) -> None:
+        """Replay pending enter events to the wrapped filter, outermost first."""
+        for frame in self._stack:
+            if not frame.entered:
+                self._inner.enter_directory(frame.path)
+                frame.entered = True
@@ -5,10 +5,19 @@ Orchestrates filter creation: decides which filters to create and how to combine
 Delegates actual creation to FilterFactory.
 """
 
+import os
 from pathlib import Path
+from typing import Iterable, Optional
 
 from gpt_automation.domain.filters.file_filter import FileFilter, AllFilters, IncludeEverythingFilter
+from gpt_automation.infrastructure.cache.file_index import (
+    FileIndex,
+    fingerprint,
+    rule_file_signatures,
+    stat_signature,
+)
 from gpt_automation.infrastructure.config.settings_model import ProjectSettings, BuiltinPlugin
+from gpt_automation.infrastructure.plugins.decision_cache import CachedDecisionFilter
 from gpt_automation.infrastructure.plugins.filter_factory import FilterFactory
 
 
@@ -24,12 +33,26 @@ class FilterBuilder:
         filter_ = builder.build_for_traversal(root_dir, work_dir, profiles)
     """
 
-    def __init__(self, settings: ProjectSettings, plugin_dir: Path):
+    def __init__(
+        self,
+        settings: ProjectSettings,
+        plugin_dir: Path,
+        file_index: Optional[FileIndex] = None,
+        resolved_ignore_filenames: Iterable[str] = (),
+    ):
         """
         settings   – loaded project settings (controls which plugins run)
         plugin_dir – .gpt/config/ directory where plugin data files live
+        file_index – when given, filter decisions are replayed from and
+                     recorded into it (see CachedDecisionFilter)
+        resolved_ignore_filenames – ignore files the file source already
+                     applied (.gitignore when files come from git); the
+                     ignore filter skips them
         """
         self._settings = settings
+        self._plugin_dir = Path(plugin_dir)
+        self._file_index = file_index
+        self._resolved_ignore_filenames = frozenset(resolved_ignore_filenames)
         self._factory = FilterFactory(settings, plugin_dir)
 
     def build_for_traversal(
@@ -49,10 +72,10 @@ class FilterBuilder:
         if not active_filters:
             return IncludeEverythingFilter()
 
-        if len(active_filters) == 1:
-            return active_filters[0]
-
-        return AllFilters(active_filters)
+        combined = active_filters[0] if len(active_filters) == 1 else AllFilters(active_filters)
+        if self._file_index is None:
+            return combined
+        return self._with_decision_cache(combined, Path(root_dir), Path(work_dir), profiles)
 
     def setup_plugin_files(self, root_dir: Path, profiles: list[str]) -> None:
         """
@@ -63,8 +86,72 @@ class FilterBuilder:
         if self._settings.is_plugin_active(BuiltinPlugin.BLOCKLIST_ALLOWLIST):
             self._factory.setup_blocklist_allowlist_files(root_dir, profiles)
 
+    def rule_filenames(self) -> list[str]:
+        """Every per-directory file an active plugin reads."""
+        names: list[str] = []
+        if self._settings.is_plugin_active(BuiltinPlugin.IGNORE_PATTERNS):
+            names += self._ignore_filenames()
+        if self._settings.is_plugin_active(BuiltinPlugin.INCLUDE_PATTERNS):
+            cfg = self._settings.plugin_settings(BuiltinPlugin.INCLUDE_PATTERNS)
+            names += cfg.option('include_only_filenames') or ['.gptincludeonly']
+        return names
+
     # ──────────────────────────── private helpers ────────────────────────────
 
+    def _ignore_filenames(self) -> list[str]:
+        """Configured ignore file names, minus those the file source resolved."""
+        cfg = self._settings.plugin_settings(BuiltinPlugin.IGNORE_PATTERNS)
+        filenames = cfg.option('ignore_filenames') or ['.gitignore', '.gptignore']
+        return [name for name in filenames if name not in self._resolved_ignore_filenames]
+
+    def _with_decision_cache(
+        self,
+        file_filter: FileFilter,
+        root_dir: Path,
+        work_dir: Path,
+        profiles: list[str],
+    ) -> FileFilter:
+        """Wrap file_filter so decisions still valid from the last run are replayed."""
+        rule_filenames = self.rule_filenames()
+        config = fingerprint(
+            b'',
+            repr(self._settings.plugins),  # Only the plugins affect decisions
+            sorted(profiles),
+            str(root_dir),
+            rule_filenames,
+            self._blocklist_signatures(),
+        )
+        # The visitors load every level from root_dir down to work_dir up front
+        base = config
+        for directory in self._levels_above(root_dir, work_dir):
+            base = fingerprint(base, *rule_file_signatures(directory, rule_filenames))
+
+        context = f"{work_dir}\0{','.join(sorted(profiles))}"
+        table = self._file_index.decisions_for(context, config)
+        return CachedDecisionFilter(file_filter, table, self._file_index.run, base, rule_filenames)
+
+    def _blocklist_signatures(self) -> list:
+        """(path, stat_signature) of every black_list.txt / white_list.txt."""
+        if not self._settings.is_plugin_active(BuiltinPlugin.BLOCKLIST_ALLOWLIST):
+            return []
+        data_dir = self._plugin_dir / 'gpt_automation' / 'bw_filter'
+        signatures = []
+        for dirpath, dirnames, filenames in os.walk(data_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                signatures.append((path, stat_signature(path)))
+        return signatures
+
+    @staticmethod
+    def _levels_above(root_dir: Path, work_dir: Path) -> list[Path]:
+        """root_dir and each directory below it down to, not including, work_dir."""
+        try:
+            parts = work_dir.relative_to(root_dir).parts
+        except ValueError:
+            return [root_dir]
+        return [root_dir.joinpath(*parts[:depth]) for depth in range(len(parts))]
+
     def _create_filters(
         self,
         root_dir: Path,
@@ -75,7 +162,8 @@ class FilterBuilder:
         filters: list[FileFilter] = []
 
         if self._settings.is_plugin_active(BuiltinPlugin.IGNORE_PATTERNS):
-            f = self._factory.create_ignore_filter(root_dir, work_dir, profiles)
+            filenames = self._ignore_filenames()
+            f = self._factory.create_ignore_filter(root_dir, work_dir, profiles, filenames) if filenames else None
             if f:
                 filters.append(f)
 
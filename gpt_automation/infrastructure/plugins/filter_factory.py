@@ -6,6 +6,7 @@ Keeps FilterBuilder focused on orchestration.
 """
 
 from pathlib import Path
+from typing import Optional
 
 from gpt_automation.infrastructure.config.settings_model import ProjectSettings, BuiltinPlugin
 
@@ -32,12 +33,18 @@ class FilterFactory:
         root_dir: Path,
         work_dir: Path,
         profiles: list[str],
+        filenames: Optional[list[str]] = None,
     ):
-        """Create a filter for .gitignore-style ignore patterns."""
+        """
+        Create a filter for .gitignore-style ignore patterns.
+
+        filenames overrides the configured ignore file names.
+        """
         from gpt_automation.infrastructure.plugins.visitor_adapter import IgnoreVisitorFilter
 
-        cfg = self._settings.plugin_settings(BuiltinPlugin.IGNORE_PATTERNS)
-        filenames = cfg.option('ignore_filenames') or ['.gitignore', '.gptignore']
+        if filenames is None:
+            cfg = self._settings.plugin_settings(BuiltinPlugin.IGNORE_PATTERNS)
+            filenames = cfg.option('ignore_filenames') or ['.gitignore', '.gptignore']
 
         return IgnoreVisitorFilter(
             root_dir=root_dir,
@@ -11,7 +11,40 @@ from pathlib import Path
 from gpt_automation.domain.filters.file_filter import FileFilter
 
 
-class IgnoreVisitorFilter(FileFilter):
+class _DirectoryScopedVisitorFilter(FileFilter):
+    """
+    Shared plumbing for visitors that keep a per-directory pattern stack.
+
+    The visitor already holds the levels from root_dir down to work_dir when
+    it is built. Walker events for directories below work_dir push and pop
+    one level each, so every directory's pattern files are read exactly once,
+    on entry. The walker's own enter/leave of work_dir is absorbed here so
+    that level is not pushed twice.
+    """
+
+    def __init__(self, visitor, work_dir: Path):
+        self._visitor = visitor
+        self._work_dir = Path(work_dir)
+        self._pushed: list[bool] = []
+
+    def should_include_file(self, file_path: Path) -> bool:
+        return self._visitor.should_visit_file(str(file_path))
+
+    def should_include_directory(self, dir_path: Path) -> bool:
+        return self._visitor.should_visit_subdirectory(str(dir_path))
+
+    def enter_directory(self, dir_path: Path) -> None:
+        push = Path(dir_path) != self._work_dir
+        if push:
+            self._visitor.enter_directory(str(dir_path))
+        self._pushed.append(push)
+
+    def leave_directory(self, dir_path: Path) -> None:
+        if self._pushed.pop():
+            self._visitor.leave_directory(str(dir_path))
+
+
+class IgnoreVisitorFilter(_DirectoryScopedVisitorFilter):
     """
     Wraps IgnoreVisitor as a FileFilter.
 
@@ -27,23 +60,20 @@ class IgnoreVisitorFilter(FileFilter):
     ):
         from gpt_automation.plugins.ignore_plugin.ignore_visitor import IgnoreVisitor
 
-        self._visitor = IgnoreVisitor(
+        super().__init__(IgnoreVisitor(
             root_dir=str(root_dir),
             prompt_dir=str(work_dir),
             ignore_filenames=ignore_filenames,
             profile_names=profiles or None,
-        )
-
-    def should_include_file(self, file_path: Path) -> bool:
-        return self._visitor.should_visit_file(str(file_path))
-
-    def should_include_directory(self, dir_path: Path) -> bool:
-        return self._visitor.should_visit_subdirectory(str(dir_path))
+        ), work_dir)
 
 
-class IncludeOnlyVisitorFilter(FileFilter):
+class IncludeOnlyVisitorFilter(_DirectoryScopedVisitorFilter):
     """
     Wraps IncludeOnlyVisitor as a FileFilter.
+
+    work_dir itself is always walked: include-only patterns select what is
+    below the directory the prompt is for, not the directory.
     """
 
     def __init__(
@@ -55,18 +85,15 @@ class IncludeOnlyVisitorFilter(FileFilter):
     ):
         from gpt_automation.plugins.include_only_plugin.includeonly_visitor import IncludeOnlyVisitor
 
-        self._visitor = IncludeOnlyVisitor(
+        super().__init__(IncludeOnlyVisitor(
             root_dir=str(root_dir),
             prompt_dir=str(work_dir),
             include_only_filenames=include_filenames,
             profile_names=profiles or None,
-        )
-
-    def should_include_file(self, file_path: Path) -> bool:
-        return self._visitor.should_visit_file(str(file_path))
+        ), work_dir)
 
     def should_include_directory(self, dir_path: Path) -> bool:
-        return self._visitor.should_visit_subdirectory(str(dir_path))
+        return Path(dir_path) == self._work_dir or super().should_include_directory(dir_path)
 
 
 class BlocklistAllowlistFilter(FileFilter):
@@ -0,0 +1 @@
+"""Filesystem change notification and the local prompt server used by `autogpt watch`."""
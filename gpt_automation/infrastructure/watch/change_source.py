@@ -0,0 +1,234 @@
+"""
+Sources of filesystem change notifications for a project tree.
+
+Both sources report the same thing: the set of paths that were created,
+deleted, renamed or written since the last call. The project root itself in
+the set means "anything may have changed" (the kernel queue overflowed).
+
+- InotifyChangeSource: Linux inotify through libc, one watch per directory
+- PollingChangeSource: periodic stat snapshot, works everywhere
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable
+
+
+class ChangeSource(ABC):
+    """Blocking iterator over batches of changed paths."""
+
+    @abstractmethod
+    def poll(self, timeout: float) -> set[Path]:
+        """Wait up to timeout seconds; return the changed paths (empty on timeout)."""
+        ...
+
+    def close(self) -> None:
+        """Release OS resources."""
+
+
+# ── inotify ──
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+               | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _load_libc():
+    """libc with inotify symbols, or None off Linux."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, 'inotify_init1') and hasattr(libc, 'inotify_add_watch') else None
+
+
+class InotifyChangeSource(ChangeSource):
+    """
+    inotify watches on every directory under root.
+
+    Watches are added for directories created or moved in while running,
+    and the kernel drops the watch of a deleted directory by itself.
+    """
+
+    def __init__(self, root: Path, ignored: Iterable[Path] = ()):
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._root = Path(root)
+        self._ignored = frozenset(Path(p) for p in ignored)  # Never descended into
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        try:
+            self._watch_tree(self._root, strict=True)
+        except OSError:
+            self.close()
+            raise
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return _load_libc() is not None
+
+    def poll(self, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: set[Path] = set()
+        # Drain everything queued so one burst (a checkout, a build) is one batch
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            self._parse(data, changed)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _parse(self, data: bytes, changed: set[Path]) -> None:
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                changed.add(self._root)
+                continue
+            directory = self._dirs.get(wd)
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                changed.add(directory)
+                continue
+
+            path = directory / os.fsdecode(name)
+            if path in self._ignored:
+                continue
+            changed.add(path)
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._watch_tree(path)
+
+    def _watch_tree(self, top: Path, strict: bool = False) -> None:
+        """
+        Watch top and every directory below it.
+
+        strict raises when the kernel refuses a watch (watch limit reached),
+        so the caller can fall back to polling instead of silently missing
+        changes. Directories that vanish mid-walk are skipped either way.
+        """
+        for dirpath, dirnames, _ in os.walk(top):
+            current = Path(dirpath)
+            dirnames[:] = [d for d in dirnames if current / d not in self._ignored]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = current
+                continue
+            error = ctypes.get_errno()
+            if strict and error not in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                raise OSError(error, f"inotify_add_watch failed for {dirpath}: {os.strerror(error)}")
+
+
+# ── polling ──
+
+class PollingChangeSource(ChangeSource):
+    """
+    Compare a (kind, mtime_ns, size) snapshot of the whole tree every interval.
+
+    Costs one stat per entry per interval; use where inotify is missing.
+    Directories are reported when they appear or disappear, files also when
+    written.
+    """
+
+    def __init__(self, root: Path, ignored: Iterable[Path] = (), interval: float = 1.0):
+        self._root = Path(root)
+        self._ignored = frozenset(Path(p) for p in ignored)  # Never descended into
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def poll(self, timeout: float) -> set[Path]:
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self._interval
+
+        current = self._take_snapshot()
+        previous, self._snapshot = self._snapshot, current
+        changed = {path for path in current.keys() ^ previous.keys()}
+        changed.update(
+            path for path, signature in current.items()
+            if signature[0] == 'f' and previous.get(path, signature) != signature
+        )
+        return changed
+
+    def _take_snapshot(self) -> dict[Path, tuple]:
+        snapshot: dict[Path, tuple] = {}
+        pending = [self._root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                path = directory / entry.name
+                if path in self._ignored:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        snapshot[path] = ('d', 0, 0)
+                        pending.append(path)
+                    else:
+                        st = entry.stat()
+                        snapshot[path] = ('f', st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return snapshot
+
+
+def create_change_source(root: Path, ignored: Iterable[Path] = (), force_polling: bool = False,
+                         interval: float = 1.0) -> ChangeSource:
+    """inotify when the platform has it, polling otherwise (or when forced)."""
+    if not force_polling and InotifyChangeSource.is_available():
+        try:
+            return InotifyChangeSource(root, ignored)
+        except OSError:
+            pass  # Out of watches / instances: fall back rather than fail
+    return PollingChangeSource(root, ignored, interval)
@@ -0,0 +1,105 @@
+"""
+Local prompt server: `autogpt watch` answers `autogpt prompt` over a Unix socket.
+
+The protocol is one JSON object per connection in each direction, the
+request terminated by a newline and the response by closing the socket.
+The socket lives in .gpt/cache/, so only users who can write the project
+can talk to it.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+Handler = Callable[[dict], dict]
+
+
+def is_supported() -> bool:
+    """Unix domain sockets are needed on both ends."""
+    return hasattr(socket, 'AF_UNIX')
+
+
+class PromptServer:
+    """Serve requests on a Unix socket from a background thread."""
+
+    def __init__(self, socket_path: Path, handler: Handler):
+        self._socket_path = Path(socket_path)
+        self.handler = handler  # Replaceable while serving (settings reload)
+        self._server: Optional[socketserver.BaseServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Bind the socket and start serving.
+
+        Raises RuntimeError when another watcher already serves this project.
+        A socket file left behind by a watcher that died is replaced.
+        """
+        if request(self._socket_path, {'ping': True}) is not None:
+            raise RuntimeError(f"A watcher is already serving {self._socket_path}")
+        self._socket_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        owner = self
+
+        class _RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    message = json.loads(self.rfile.readline())
+                    reply = {'pong': True} if message.get('ping') else owner.handler(message)
+                except Exception as e:  # Reported to the client, never kills the server
+                    reply = {'error': f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(reply).encode('utf-8'))
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self._socket_path), _RequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='gpt-prompt-server',
+                                        daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            os.unlink(self._socket_path)
+        except OSError:
+            pass
+
+
+def request(socket_path: Path, message: dict, timeout: float = 30.0) -> Optional[dict]:
+    """
+    Send one request to a running watcher.
+
+    Returns None when no watcher is listening (missing or stale socket), so
+    callers fall back to doing the work themselves.
+    """
+    if not is_supported() or not Path(socket_path).exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = client.recv(1 << 20)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    try:
+        return json.loads(b''.join(chunks))
+    except ValueError:
+        return None
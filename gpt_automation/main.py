@@ -8,11 +8,23 @@ Nothing complex happens here — all logic lives in the application layer.
 """
 
 import argparse
+import os
+import signal
 import sys
+import threading
 from pathlib import Path
+from typing import Optional
 
+from gpt_automation.application.generate_prompts import PromptResult
+from gpt_automation.application.token_budget import BudgetReport
 from gpt_automation.container import AppContainer
+from gpt_automation.domain.tree import Collapse
+from gpt_automation.infrastructure.filesystem.project_paths import ProjectPaths
 from gpt_automation.infrastructure.filesystem.root_discovery import RootLookup
+from gpt_automation.infrastructure.output.sinks import (
+    ClipboardSink, CommandSink, FileSink, OutputSink, PartFiles, SplitSink, StreamSink,
+)
+from gpt_automation.infrastructure.watch import prompt_server
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -42,10 +54,74 @@ def _build_parser() -> argparse.ArgumentParser:
                         help='Generate directory tree (optional profile override).')
     prompt.add_argument('--content', nargs='*', default=None, metavar='PROFILE',
                         help='Generate file content (optional profile override).')
+    prompt.add_argument('--walk_threads', type=_positive_int, default=1, metavar='N',
+                        help='List up to N directories in parallel while walking (default 1 = serial).')
+    prompt.add_argument('--no_cache', action='store_true',
+                        help='Walk from scratch, ignoring and not updating .gpt/cache/.')
+    prompt.add_argument('--git_index', action='store_true',
+                        help='Inside a git checkout, take files from git instead of walking '
+                             '(git applies .gitignore; tracked files are always included).')
+    prompt.add_argument('--changed_vs', default=None, metavar='REF',
+                        help='Only the files changed against git REF (committed, staged, unstaged '
+                             'or untracked); the rest of the tree is not walked.')
+    prompt.add_argument('--neighbours', action='store_true',
+                        help='With --changed_vs, add the tests of changed files (test_x.py, x_test.py, '
+                             'tests/ directories) and the files changed tests test.')
+    prompt.add_argument('--outline', action='store_true',
+                        help='Show Python files as outlines (classes, signatures, first docstring lines) '
+                             'instead of their full source.')
+    prompt.add_argument('--minify', action='store_true',
+                        help='Remove comments (Python), trailing whitespace and repeated blank lines '
+                             'from file contents to save tokens.')
+    prompt.add_argument('--tree_depth', type=_positive_int, default=None, metavar='N',
+                        help='Show N levels of the tree; deeper directories become one line with '
+                             'their file count and size.')
+    prompt.add_argument('--tree_max_children', type=_positive_int, default=None,
+                        metavar='N',
+                        help='Show directories with more than N entries as one line with their file '
+                             'count and size.')
+    prompt.add_argument('--max_tokens', type=_positive_int, default=None, metavar='N',
+                        help='Keep the prompt within about N tokens: the tree, then the files that fit '
+                             '(shallow, recent and small first); dropped files are listed on stderr.')
+    prompt.add_argument('--since_last', action='store_true',
+                        help='Only show files added, modified or deleted since the last --since_last '
+                             'prompt for the same directory and profiles (snapshot in .gpt/cache/).')
+    prompt.add_argument('--split_bytes', type=_positive_int, default=None, metavar='N',
+                        help='Split the prompt into parts of at most N bytes, keeping file blocks whole; '
+                             'parts go to .gpt/out/part-NNN.txt (or the --output directory).')
+    prompt.add_argument('--split_tokens', type=_positive_int, default=None, metavar='N',
+                        help='Split the prompt into parts of about N tokens at most (see --split_bytes).')
+    prompt.add_argument('--part_command', default=None, metavar='CMD',
+                        help='With --split_*, pipe each part into a run of CMD instead of a file '
+                             '($AUTOGPT_PART holds the part number).')
+    destination = prompt.add_mutually_exclusive_group()
+    destination.add_argument('--output', default=None, metavar='PATH',
+                             help='Stream the prompt into PATH (a file or named pipe) instead of the clipboard.')
+    destination.add_argument('--stdout', action='store_true',
+                             help='Stream the prompt to standard output instead of the clipboard.')
+
+    # ── watch ─────────────────────────────────────────────────────────
+    watch = subparsers.add_parser('watch', help='Keep prompts up to date in memory; `prompt` asks it first.')
+    watch.add_argument('--root_dir', default=None, metavar='DIR',
+                       help='Project root (auto-discovered if omitted).')
+    watch.add_argument('--poll', action='store_true',
+                       help='Poll for changes instead of using inotify.')
+    watch.add_argument('--poll_interval', type=float, default=1.0, metavar='SECONDS',
+                       help='Seconds between polls when polling (default 1.0).')
+    watch.add_argument('--no_cache', action='store_true',
+                       help='Do not read or update .gpt/cache/ for the initial walks.')
 
     return parser
 
 
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main() -> int:
     """Entry point. Returns exit code (0 = success)."""
     parser = _build_parser()
@@ -57,6 +133,9 @@ def main() -> int:
     if args.command == 'prompt':
         return _run_prompt(args)
 
+    if args.command == 'watch':
+        return _run_watch(args)
+
     parser.print_help()
     return 1
 
@@ -83,9 +162,9 @@ def _run_prompt(args) -> int:
         return 1
 
     root = Path(root_str)
-    work = Path(work_str)
-
-    container = AppContainer(root)
+    # The container resolves the root; filters and git listings match only
+    # paths spelled the same way, e.g. not through a symlinked checkout
+    work = Path(work_str).resolve()
 
     # Decide what to generate
     want_tree = args.dir is not None
@@ -96,40 +175,252 @@ def _run_prompt(args) -> int:
     dir_profiles = args.dir if args.dir else args.profiles
     content_profiles = args.content if args.content else args.profiles
 
-    # Generate tree
-    if want_tree:
-        result = container.generate_prompts.run(
-            work_dir=work,
-            profiles=dir_profiles,
-            include_tree=True,
-            include_contents=False,
+    splitting = args.split_bytes is not None or args.split_tokens is not None
+    if splitting and args.stdout:
+        print("Error: split prompts go to files or --part_command, not --stdout", file=sys.stderr)
+        return 1
+    if args.part_command and not splitting:
+        print("Error: --part_command needs --split_bytes or --split_tokens", file=sys.stderr)
+        return 1
+    if args.changed_vs is not None and args.git_index:
+        print("Error: --changed_vs already takes its files from git; drop --git_index", file=sys.stderr)
+        return 1
+    if args.neighbours and args.changed_vs is None:
+        print("Error: --neighbours needs --changed_vs", file=sys.stderr)
+        return 1
+    if args.since_last and args.no_cache:
+        print("Error: --since_last keeps its snapshot in .gpt/cache/; it cannot be used with --no_cache",
+              file=sys.stderr)
+        return 1
+
+    # Splitting too: the watcher's reply is one string, whose file blocks
+    # the split sink could no longer keep whole
+    if args.max_tokens is not None or args.since_last or args.changed_vs is not None \
+            or args.outline or args.minify or args.tree_depth is not None \
+            or args.tree_max_children is not None or splitting:
+        return _prompt_in_process(args, root, work,
+                                     tree_profiles=dir_profiles if want_tree else None,
+                                     content_profiles=content_profiles if want_content else None)
+
+    result = None
+    if not args.no_cache and not args.git_index:  # The watcher walks; it has no git mode
+        result = _prompt_from_watcher(
+            root, work,
+            tree_profiles=dir_profiles if want_tree else None,
+            content_profiles=content_profiles if want_content else None,
         )
-        if result.directory_tree:
-            _send_to_clipboard(result.directory_tree)
-            print("Directory tree copied to clipboard.")
+    container = None
+    if result is None:
+        container = AppContainer(root, walk_threads=args.walk_threads, use_cache=not args.no_cache,
+                                 use_git=args.git_index, stdout_is_output=args.stdout)
+
+    sink = _open_sink(args, root)
+    if sink is not None:
+        try:
+            with sink:
+                if result is not None:
+                    _write_result(sink, result)
+                else:
+                    container.generate_prompts.write(
+                        sink, work,
+                        tree_profiles=dir_profiles if want_tree else None,
+                        content_profiles=content_profiles if want_content else None,
+                    )
+        except BrokenPipeError:
+            # The reader (e.g. `| head`) went away; that is not an error
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        _print_destination(args, root, sink)
+        return 0
+
+    if result is None:
+        result = _generate(container, work, want_tree, want_content, dir_profiles, content_profiles)
+
+    if want_tree and result.directory_tree:
+        _send_to_clipboard(result.directory_tree)
+        print("Directory tree copied to clipboard.")
+
+    if want_content and result.file_contents:
+        _send_to_clipboard(result.file_contents)
+        print("File contents copied to clipboard.")
+
+    return 0
+
+
+def _prompt_in_process(args, root: Path, work: Path, tree_profiles: Optional[list[str]],
+                       content_profiles: Optional[list[str]]) -> int:
+    """
+    Generate in this process into one sink, then report drops.
+
+    For what the watcher cannot answer: budgets, snapshots, git diffs,
+    transforms, collapsed trees and split prompts.
+    """
+    container = AppContainer(root, walk_threads=args.walk_threads, use_cache=not args.no_cache,
+                             use_git=args.git_index, stdout_is_output=args.stdout,
+                             changed_vs=args.changed_vs, neighbours=args.neighbours)
+    try:
+        container.git_diff_lister  # Fail on a bad ref before the output is opened
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    sink = _open_sink(args, root) or ClipboardSink()
+    try:
+        with sink:
+            report = container.generate_prompts.write(
+                sink, work, tree_profiles, content_profiles,
+                max_tokens=args.max_tokens, since_last=args.since_last,
+                outline=args.outline, minify=args.minify, collapse=_collapse(args),
+            )
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if report is not None:
+        _print_budget_report(report)
+    _print_destination(args, root, sink)
+    return 0
 
-    # Generate content
-    if want_content:
-        result = container.generate_prompts.run(
+
+def _collapse(args) -> Optional[Collapse]:
+    if args.tree_depth is None and args.tree_max_children is None:
+        return None
+    return Collapse(max_depth=args.tree_depth, max_children=args.tree_max_children)
+
+
+def _open_sink(args, root: Path) -> Optional[OutputSink]:
+    """The sink --output / --stdout / --split_* ask for; None means the clipboard."""
+    if args.split_bytes is not None or args.split_tokens is not None:
+        if args.part_command:
+            def open_part(number: int) -> OutputSink:
+                return CommandSink(args.part_command, env={'AUTOGPT_PART': str(number)})
+        else:
+            open_part = PartFiles(Path(args.output) if args.output else ProjectPaths(root).output_dir)
+        return SplitSink(open_part, max_bytes=args.split_bytes, max_tokens=args.split_tokens)
+    if args.output:
+        return FileSink(Path(args.output))
+    if args.stdout:
+        return StreamSink(sys.stdout)
+    return None
+
+
+def _print_destination(args, root: Path, sink: OutputSink) -> None:
+    if isinstance(sink, SplitSink):
+        where = f"`{args.part_command}`" if args.part_command else \
+            (args.output or ProjectPaths(root).output_dir)
+        print(f"Prompt written in {sink.parts} parts to {where}.", file=sys.stderr)
+    elif args.output:
+        print(f"Prompt written to {args.output}.", file=sys.stderr)
+    elif isinstance(sink, ClipboardSink):
+        print("Prompt copied to clipboard.")
+
+
+def _print_budget_report(report: BudgetReport) -> None:
+    print(f"Used ~{report.used} of {report.budget} tokens for the tree and {report.selected} files.",
+          file=sys.stderr)
+    if report.dropped:
+        print(f"Dropped {len(report.dropped)} files that did not fit:", file=sys.stderr)
+        for path, tokens in report.dropped:
+            print(f"  {path} (~{tokens} tokens)", file=sys.stderr)
+
+
+def _write_result(sink: OutputSink, result: PromptResult) -> None:
+    """Write a prompt rendered elsewhere (by the watcher) to sink."""
+    if result.directory_tree:
+        sink.write_block(result.directory_tree)
+    if result.file_contents:
+        sink.write_block(result.file_contents, separator='\n\n' if result.directory_tree else '')
+
+
+def _generate(container: AppContainer, work: Path, want_tree: bool, want_content: bool,
+              dir_profiles: list[str], content_profiles: list[str]) -> PromptResult:
+    """Walk and render in this process."""
+    # Generate both from one walk (per distinct profile set) when both are wanted
+    if want_tree and want_content:
+        return container.generate_prompts.run_tree_and_contents(
             work_dir=work,
-            profiles=content_profiles,
-            include_tree=False,
-            include_contents=True,
+            tree_profiles=dir_profiles,
+            content_profiles=content_profiles,
         )
-        if result.file_contents:
-            _send_to_clipboard(result.file_contents)
-            print("File contents copied to clipboard.")
+    return container.generate_prompts.run(
+        work_dir=work,
+        profiles=dir_profiles if want_tree else content_profiles,
+        include_tree=want_tree,
+        include_contents=want_content,
+    )
+
+
+def _prompt_from_watcher(
+    root: Path,
+    work: Path,
+    tree_profiles: Optional[list[str]],
+    content_profiles: Optional[list[str]],
+) -> Optional[PromptResult]:
+    """Ask a running `autogpt watch`; None when there is none (or it failed)."""
+    reply = prompt_server.request(ProjectPaths(root).watch_socket, {
+        'work_dir': str(work),
+        'tree_profiles': tree_profiles,
+        'content_profiles': content_profiles,
+    })
+    if reply is None or 'error' in reply:
+        return None
+    return PromptResult(directory_tree=reply['directory_tree'], file_contents=reply['file_contents'])
+
+
+def _run_watch(args) -> int:
+    """Serve prompts from memory until interrupted, rebuilding on settings changes."""
+    if not prompt_server.is_supported():
+        print("Error: watch needs Unix domain sockets, which this platform lacks", file=sys.stderr)
+        return 1
+
+    lookup = RootLookup(
+        initial_dir=args.root_dir or str(Path.cwd()),
+        provided_root_dir=args.root_dir,
+    )
+    try:
+        root_str, _ = lookup.determine_directories(None)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    root = Path(root_str).resolve()
+
+    server = prompt_server.PromptServer(ProjectPaths(root).watch_socket,
+                                        handler=lambda message: {'error': 'starting'})
+    try:
+        server.start()
+    except (RuntimeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())  # Shut down cleanly, removing the socket
+    try:
+        while True:
+            container = AppContainer(root, use_cache=not args.no_cache)
+            source = container.create_change_source(force_polling=args.poll, interval=args.poll_interval)
+            server.handler = container.watch_project.handle_request
+            print(f"Watching {root} ({type(source).__name__}); Ctrl+C to stop.")
+            try:
+                if not container.watch_project.run(source, stop):
+                    break
+            finally:
+                source.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
     return 0
 
 
 def _send_to_clipboard(text: str) -> None:
-    """Copy text to system clipboard, silently ignore if unavailable."""
-    try:
-        import pyperclip
-        pyperclip.copy(text)
-    except Exception:
-        print(text)  # Fall back to stdout
+    """Copy text to system clipboard; printed to stdout if unavailable."""
+    with ClipboardSink() as sink:
+        sink.write(text)
 
 
 # Public alias kept for test compatibility
@@ -2,50 +2,58 @@ from gpt_automation.impl.logging_utils import get_logger
 logger = get_logger(__name__)
 import os
 
-from gpt_automation.plugins.ignore_plugin.third_party.gitignore_parser2.parser2 import GitIgnoreParser
+from gitignore_parser import _normalize_path
+
+from gpt_automation.plugins.ignore_plugin.third_party.gitignore_parser2.parser2 import (
+    GitIgnoreParser,
+    has_trailing_slash,
+    relative_to_base,
+)
 
 class IgnoreMatch:
+    """
+    Compiled, immutable matcher for a set of (base_path, pattern) pairs.
+
+    Build it once when a directory is entered and reuse it for every path
+    checked beneath that directory; the patterns are parsed into rules here
+    and never again.
+
+    Every pattern is evaluated on its own (a path matches if any single
+    pattern matches it), so a negated pattern never matches anything. That
+    lets all patterns sharing a base path live in one GitIgnoreParser whose
+    positive rules are merged into a single regex.
+    """
+
+    __slots__ = ('base_pattern_pairs', 'matches')
+
     def __init__(self, base_pattern_pairs):
         # Now expects an array of (base_path, pattern) tuples
-        self.base_pattern_pairs = base_pattern_pairs
-        self.matches = [
-            GitIgnoreParser(base_path, [pattern]) for base_path, pattern in base_pattern_pairs
-        ]
+        self.base_pattern_pairs = tuple(base_pattern_pairs)
+        patterns_by_base = {}
+        for base_path, pattern in self.base_pattern_pairs:
+            patterns_by_base.setdefault(base_path, []).append(pattern)
+        self.matches = tuple(
+            GitIgnoreParser(base_path, patterns) for base_path, patterns in patterns_by_base.items()
+        )
 
     def match2(self, file_path):
-        return any(match(file_path) for match in self.matches)
+        return self.match(file_path)
 
     def match(self, file_path):
-        results = []
+        return self.match_normalized(_normalize_path(file_path), has_trailing_slash(file_path))
 
+    def match_normalized(self, normalized_path, trailing_slash=False):
+        """Match a path already passed through _normalize_path (done once per check)."""
         for match in self.matches:
-            log_dict = {"input": file_path,
-                        "match": match.__str__()}
-           # logger.debug(f"matching: {log_dict}")
-            result = match.match(file_path)
-            results.append({
-                "input": file_path,
-                "match": match.__str__(),
-                "result": result,
-            })
-
-        # Optionally, you could print or log the results array to inspect it
-        #logger.debug(f"results:{ results}")
-        final_result = any(result['result'] for result in results)
-        return final_result
+            rel_path = relative_to_base(normalized_path, match.base_dir)
+            if rel_path is not None and match.match_any_relative(rel_path):
+                return True
+        return False
 
     def has_matches(self):
-        # Since each match function represents a single pattern from a specific base,
-        # we can assume there's at least one non-empty pattern if self.matches is not empty.
-        return bool(self.matches)
-
-    @staticmethod
-    def _is_file_effectively_empty(file_path):
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-            with open(file_path, 'r') as file:
-                content = file.read().strip()
-                return len(content) == 0
-        return True
+        # Any pattern at all counts, even one that compiles to no rule,
+        # since include-only treats a non-empty pattern file as "feature in use".
+        return bool(self.base_pattern_pairs)
 
     @staticmethod
     def _is_file_effectively_empty(file_path):
@@ -2,7 +2,7 @@ from gpt_automation.impl.logging_utils import get_logger
 # gpt_automation/visitor/ignore_visitor.py
 import os
 
-from gpt_automation.plugins.ignore_plugin.filters import should_ignore_by_ignore_files
+from gpt_automation.plugins.ignore_plugin.filters import should_ignore_by_ignore_files, load_ignore_matches
 from gpt_automation.impl.visitor.basevisitor import BaseVisitor
 from gpt_automation.plugins.ignore_plugin.ignore_file_parser import collect_patterns_from_ignore_files
 
@@ -38,7 +38,8 @@ class IgnoreVisitor(BaseVisitor):
     def enter_directory(self, directory_path):
         local_ignore_patterns = collect_patterns_from_ignore_files(directory_path, self.ignore_filenames,
                                                                    self.profile_names)
-        self.ignore_patterns_stack.append(local_ignore_patterns if local_ignore_patterns else [])
+        # Compile once here; should_visit_* reuse the matcher for every path below
+        self.ignore_patterns_stack.append(load_ignore_matches(local_ignore_patterns))
 
     def leave_directory(self, directory_path):
         self.ignore_patterns_stack.pop()
@@ -1,5 +1,152 @@
-from gitignore_parser import _normalize_path, rule_from_pattern, handle_negation
-from typing import List
+import os
+import re
+
+from gitignore_parser import _normalize_path, rule_from_pattern
+from typing import List, Optional
+
+
+def has_trailing_slash(file_path) -> bool:
+    """IgnoreRule.match treats a str path ending in '/' as a directory for negations."""
+    return type(file_path) == str and file_path[-1:] == '/'
+
+
+def relative_to_base(normalized_path, base_dir) -> Optional[str]:
+    """
+    Path of normalized_path relative to base_dir, as IgnoreRule.match computes it.
+
+    Returns None when the path lies outside base_dir (the rule cannot match).
+    """
+    if not str(normalized_path).startswith(str(base_dir)):
+        return None
+    try:
+        rel_path = str(normalized_path.relative_to(base_dir))
+    except ValueError:
+        return None  # Shares a string prefix but is a sibling, e.g. /a/bc vs /a/b
+    if rel_path.startswith('./'):
+        rel_path = rel_path[2:]
+    return rel_path
+
+
+# Pieces of the regexes gitignore_parser.fnmatch_pathname_to_regex emits,
+# rebuilt the same way so rules can be recognised from their regex text.
+_SEPS = [re.escape(os.sep)] + ([re.escape(os.altsep)] if os.altsep else [])
+_UNANCHORED_PREFIX = '(^|[' + '|'.join(_SEPS) + '])'
+_ANY_NAME_PREFIX = '[^' + '|'.join(_SEPS) + ']*'
+_FILE_SUFFIX = '$'
+_DIR_SUFFIX = '($|\\/)'
+_LITERAL = re.compile(r'(?:\\[^0-9A-Za-z]|[^\\\[\]().*?+^$|{}])+')
+
+
+def _literal_text(regex_body: str) -> Optional[str]:
+    """The plain text a regex fragment matches, or None if it has wildcards."""
+    if not _LITERAL.fullmatch(regex_body):
+        return None
+    text = re.sub(r'\\(.)', r'\1', regex_body)
+    return None if os.sep in text or (os.altsep and os.altsep in text) else text
+
+
+class CompiledRuleSet:
+    """
+    All non-negated rules of one base directory, compiled into one matcher.
+
+    Python's backtracking re engine gains nothing from a plain alternation
+    of many `[^/]*\\.ext$` branches, so the two shapes that dominate real
+    ignore files are peeled off first, the way git's own EXC_FLAG_ENDSWITH
+    fast path does:
+
+    - exact names (`node_modules/`, `.env`) become set lookups on path components
+    - `*<literal>` (`*.log`, `*.tar.gz`) become one str.endswith(tuple) call
+
+    Every remaining rule goes into a single alternation regex with one named
+    group per rule (r<index>), so the matching rule can still be reported.
+    Negated rules are never part of it; GitIgnoreParser evaluates them in
+    order when a rule set has any.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        file_names, dir_names, file_suffixes, dir_suffixes = {}, {}, {}, {}
+        unanchored, anchored, other = [], [], []
+        for i, rule in enumerate(rules):
+            if rule.negation:
+                continue
+            shape = self._literal_shape(rule)
+            if shape is None:
+                # Hoist the shared start-of-component / start-of-path prefix out
+                # of the branches so re only tries them at component boundaries
+                if rule.regex.startswith(_UNANCHORED_PREFIX):
+                    unanchored.append(f"(?P<r{i}>{rule.regex[len(_UNANCHORED_PREFIX):]})")
+                elif rule.regex.startswith('^'):
+                    anchored.append(f"(?P<r{i}>{rule.regex[1:]})")
+                else:
+                    other.append(f"(?P<r{i}>{rule.regex})")
+                continue
+            kind, text = shape
+            target = {
+                ('name', False): file_names, ('name', True): dir_names,
+                ('suffix', False): file_suffixes, ('suffix', True): dir_suffixes,
+            }[(kind, rule.directory_only)]
+            target.setdefault(text, i)
+
+        self._file_names = file_names
+        self._dir_names = dir_names
+        self._file_suffixes = file_suffixes
+        self._dir_suffixes = dir_suffixes
+        self._file_suffix_tuple = tuple(file_suffixes)
+        self._dir_suffix_tuple = tuple(dir_suffixes)
+        alternatives = other
+        if unanchored:
+            alternatives = [f"(?:^|[{'|'.join(_SEPS)}])(?:{'|'.join(unanchored)})"] + alternatives
+        if anchored:
+            alternatives = [f"^(?:{'|'.join(anchored)})"] + alternatives
+        self._regex = re.compile('|'.join(alternatives)) if alternatives else None
+
+    @staticmethod
+    def _literal_shape(rule):
+        """('name' | 'suffix', text) for rules the fast paths can answer, else None."""
+        regex = rule.regex
+        suffix = _DIR_SUFFIX if rule.directory_only else _FILE_SUFFIX
+        if rule.anchored or not regex.startswith(_UNANCHORED_PREFIX) or not regex.endswith(suffix):
+            return None
+        body = regex[len(_UNANCHORED_PREFIX):len(regex) - len(suffix)]
+        if body.startswith(_ANY_NAME_PREFIX):
+            text = _literal_text(body[len(_ANY_NAME_PREFIX):])
+            return ('suffix', text) if text else None
+        text = _literal_text(body)
+        return ('name', text) if text else None
+
+    def search(self, rel_path: str) -> Optional[int]:
+        """Index of a non-negated rule matching rel_path, or None."""
+        components = rel_path.split(os.sep)
+        last = components[-1]
+        # `$` also matches just before a trailing newline; mirror that exactly
+        lasts = (last, last[:-1]) if last.endswith('\n') else (last,)
+
+        for name in lasts:
+            if name in self._file_names:
+                return self._file_names[name]
+            if name in self._dir_names:
+                return self._dir_names[name]
+            if self._file_suffix_tuple and name.endswith(self._file_suffix_tuple):
+                return self._suffix_index(name, self._file_suffixes)
+            if self._dir_suffix_tuple and name.endswith(self._dir_suffix_tuple):
+                return self._suffix_index(name, self._dir_suffixes)
+
+        for name in components[:-1]:
+            if name in self._dir_names:
+                return self._dir_names[name]
+            if self._dir_suffix_tuple and name.endswith(self._dir_suffix_tuple):
+                return self._suffix_index(name, self._dir_suffixes)
+
+        if self._regex is not None:
+            found = self._regex.search(rel_path)
+            if found:
+                return int(found.lastgroup[1:])
+        return None
+
+    @staticmethod
+    def _suffix_index(name: str, suffixes: dict) -> int:
+        return next(index for suffix, index in suffixes.items() if name.endswith(suffix))
 
 
 class GitIgnoreParser:
@@ -7,6 +154,13 @@ class GitIgnoreParser:
         self.base_dir = _normalize_path(base_dir)
         self.patterns = patterns  # Save patterns as an attribute
         self.rules = self.parse_patterns(patterns)
+        self.has_negation = any(r.negation for r in self.rules)
+        # One matcher for every positive rule: a single call per path
+        self._combined = CompiledRuleSet(self.rules)
+        # Ordered per-rule regexes, only needed for last-match-wins with negations
+        self._compiled_rules = (
+            tuple((re.compile(r.regex), r.negation) for r in self.rules) if self.has_negation else ()
+        )
 
     def parse_patterns(self, patterns: List[str]) -> List:
         rules = []
@@ -19,10 +173,35 @@ class GitIgnoreParser:
 
     def match(self, file_path: str) -> bool:
         """Determine if the file path matches any of the ignore rules."""
-        if not any(r.negation for r in self.rules):
-            return any(r.match(file_path) for r in self.rules)
-        else:
-            return handle_negation(file_path, self.rules)
+        rel_path = relative_to_base(_normalize_path(file_path), self.base_dir)
+        if rel_path is None:
+            return False
+        return self.match_relative(rel_path, has_trailing_slash(file_path))
+
+    def match_relative(self, rel_path: str, trailing_slash: bool = False) -> bool:
+        """
+        Match a path already made relative to base_dir.
+
+        Same decision as handle_negation over self.rules, minus the per-rule
+        path normalization.
+        """
+        if not self.has_negation:
+            return self.match_any_relative(rel_path)
+
+        negated_rel_path = rel_path + '/' if trailing_slash else rel_path
+        for regex, negation in reversed(self._compiled_rules):
+            if regex.search(negated_rel_path if negation else rel_path):
+                return not negation
+        return False
+
+    def match_any_relative(self, rel_path: str) -> bool:
+        """True if any non-negated rule matches; negated rules are not consulted."""
+        return self._combined.search(rel_path) is not None
+
+    def matching_rule(self, rel_path: str):
+        """A non-negated rule that matches rel_path, or None (for diagnostics)."""
+        index = self._combined.search(rel_path)
+        return self.rules[index] if index is not None else None
 
     def __str__(self):
         return f"Base Directory: {self.base_dir}\nPatterns: {self.patterns}"
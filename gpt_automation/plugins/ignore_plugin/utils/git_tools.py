@@ -1,4 +1,6 @@
 import os
+import stat
+import struct
 import subprocess
 from pathlib import Path
 
@@ -13,8 +15,8 @@ def find_git_root(start_path):
         git_root = subprocess.check_output(['git', '-C', start_path, 'rev-parse', '--show-toplevel'],
                                            stderr=subprocess.STDOUT).strip().decode('utf-8')
         return git_root
-    except subprocess.CalledProcessError:
-        # Not in a git repository
+    except (subprocess.CalledProcessError, OSError):
+        # Not in a git repository, or no git executable
         return None
 
 
@@ -30,3 +32,125 @@ def is_git_repository(path):
     Check if the given path is within a git repository.
     """
     return find_git_root(path) is not None
+
+
+def git_dir_of(git_root):
+    """
+    The .git directory of a work tree; follows the `gitdir:` file that
+    linked worktrees and submodules use instead of a directory.
+    """
+    dot_git = os.path.join(git_root, '.git')
+    if os.path.isfile(dot_git):
+        with open(dot_git, 'r') as f:
+            line = f.readline().strip()
+        if line.startswith('gitdir:'):
+            return os.path.normpath(os.path.join(git_root, line[len('gitdir:'):].strip()))
+    return dot_git
+
+
+class UnsupportedIndexError(ValueError):
+    """The index uses a layout read_index_paths does not handle (sparse, split)."""
+
+
+_INDEX_ENTRY_FIXED = 62          # ctime..sha1 + flags
+_EXTENDED_FLAG = 0x4000
+_STAGE_SHIFT = 12
+
+
+def read_index_paths(index_file):
+    """
+    Paths (bytes, relative to the work tree) of the files and symlinks
+    tracked in a git index, versions 2 to 4, each listed once.
+
+    Gitlinks (submodules) are skipped. Raises UnsupportedIndexError for
+    sparse or split indexes and ValueError for anything malformed; callers
+    fall back to `git ls-files`.
+    """
+    with open(index_file, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'DIRC':
+        raise ValueError(f"{index_file} is not a git index")
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in (2, 3, 4):
+        raise UnsupportedIndexError(f"git index version {version}")
+
+    paths = []
+    pos = 12
+    previous = b''
+    for _ in range(count):
+        mode = struct.unpack_from('>I', data, pos + 24)[0]
+        flags = struct.unpack_from('>H', data, pos + 60)[0]
+        name_start = pos + _INDEX_ENTRY_FIXED
+        if version >= 3 and flags & _EXTENDED_FLAG:
+            name_start += 2
+
+        if version == 4:
+            # Name is prefix-compressed against the previous entry
+            strip, name_start = _read_offset_varint(data, name_start)
+            end = data.index(b'\0', name_start)
+            name = previous[:len(previous) - strip] + data[name_start:end]
+            pos = end + 1
+        else:
+            end = data.index(b'\0', name_start)
+            name = data[name_start:end]
+            # Entries are NUL-padded to a multiple of eight bytes
+            pos += (name_start - pos + len(name) + 8) & ~7
+        previous = name
+
+        kind = stat.S_IFMT(mode)
+        if kind == stat.S_IFDIR:
+            raise UnsupportedIndexError("sparse index")
+        if kind in (stat.S_IFREG, stat.S_IFLNK) and (not paths or paths[-1] != name):
+            paths.append(name)  # Conflict stages of one path are adjacent
+
+    _check_extensions(data, pos)
+    return paths
+
+
+def _read_offset_varint(data, pos):
+    """git's offset varint (varint.c): each continuation adds one before shifting."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+
+def _check_extensions(data, pos):
+    """Reject indexes whose entries live elsewhere (split index)."""
+    end = len(data) - 20  # Trailing checksum
+    while pos + 8 <= end:
+        signature = data[pos:pos + 4]
+        size = struct.unpack_from('>I', data, pos + 4)[0]
+        if signature in (b'link', b'sdir'):
+            raise UnsupportedIndexError(f"index extension {signature.decode()}")
+        pos += 8 + size
+
+
+def ls_files(directory, *options):
+    """
+    `git ls-files -z` run in directory; paths relative to it, as str.
+
+    Raises subprocess.CalledProcessError / OSError when git fails or is missing.
+    """
+    output = subprocess.check_output(['git', '-C', str(directory), 'ls-files', '-z', *options],
+                                     stderr=subprocess.DEVNULL)
+    return [os.fsdecode(p) for p in output.split(b'\0') if p]
+
+
+def diff_names(git_root, ref):
+    """
+    `git diff --name-only -z ref` in the work tree git_root: paths (relative
+    to it, as str) that differ between ref and the work tree, staged or not.
+
+    Renames are listed as their new path only. Raises
+    subprocess.CalledProcessError (stderr captured, e.g. for an unknown
+    ref) / OSError when git fails or is missing.
+    """
+    output = subprocess.check_output(['git', '-C', str(git_root), 'diff', '--name-only', '-z',
+                                      '--no-renames', '--no-relative', ref, '--'],
+                                     stderr=subprocess.PIPE)
+    return [os.fsdecode(p) for p in output.split(b'\0') if p]
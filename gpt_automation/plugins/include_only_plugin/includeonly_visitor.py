@@ -1,8 +1,8 @@
 from gpt_automation.impl.logging_utils import get_logger
 import os
-from gpt_automation.plugins.ignore_plugin.filters import should_include_by_include_only_list
+from gpt_automation.plugins.ignore_plugin.filters import should_include_by_include_only_list, load_ignore_matches
 from gpt_automation.impl.visitor.basevisitor import BaseVisitor
-from gpt_automation.plugins.ignore_plugin.ignore_file_parser import collect_patterns_from_ignore_files, generate_pattern_pairs
+from gpt_automation.plugins.ignore_plugin.ignore_file_parser import collect_patterns_from_ignore_files
 
 
 class IncludeOnlyVisitor(BaseVisitor):
@@ -36,11 +36,10 @@ class IncludeOnlyVisitor(BaseVisitor):
     def enter_directory(self, directory_path):
         local_include_only_patterns = collect_patterns_from_ignore_files(
             directory_path, self.include_only_filenames, self.profile_names)
-        # Fallback to include all files if no specific patterns are found
-
-        self.include_only_patterns_stack.append(
-            local_include_only_patterns if local_include_only_patterns else generate_pattern_pairs(directory_path,
-                                                                                                   ["*"]))
+        # Compile once here; should_visit_* reuse the matcher for every path below.
+        # A directory without include-only files pushes None, so the nearest
+        # enclosing patterns keep applying (the matcher skips empty levels)
+        self.include_only_patterns_stack.append(load_ignore_matches(local_include_only_patterns))
 
     def leave_directory(self, directory_path):
         self.include_only_patterns_stack.pop()
@@ -5,6 +5,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
+from gpt_automation.application.generate_prompts import PromptResult
 from gpt_automation.main import main, setup_cli_parser
 
 
@@ -92,6 +93,132 @@ class TestMain(unittest.TestCase):
         self.assertEqual(args.dir, ['p1'])
         self.assertEqual(args.content, ['p2'])
 
+    def test_prompt_walk_threads_flag(self):
+        parser = setup_cli_parser()
+        self.assertEqual(parser.parse_args(['prompt']).walk_threads, 1)
+        self.assertEqual(parser.parse_args(['prompt', '--walk_threads', '8']).walk_threads, 8)
+        with self.assertRaises(SystemExit):
+            parser.parse_args(['prompt', '--walk_threads', '0'])
+
+    def test_prompt_output_flags_are_exclusive(self):
+        parser = setup_cli_parser()
+        self.assertEqual(parser.parse_args(['prompt', '--output', 'p.txt']).output, 'p.txt')
+        self.assertTrue(parser.parse_args(['prompt', '--stdout']).stdout)
+        with self.assertRaises(SystemExit):
+            parser.parse_args(['prompt', '--stdout', '--output', 'p.txt'])
+
+    def test_prompt_output_streams_to_a_file(self):
+        """--output writes tree and contents to the file and leaves the clipboard alone."""
+        with open(os.path.join(self.test_prompt_dir, 'hello.py'), 'w') as f:
+            f.write('print("hi")\n')
+        target = os.path.join(self.test_dir, 'out', 'prompt.txt')
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir,
+                                '--prompt_dir', self.test_prompt_dir, '--no_cache', '--output', target]), \
+                patch('gpt_automation.main._send_to_clipboard') as clipboard:
+            self.assertEqual(main(), 0)
+        clipboard.assert_not_called()
+        with open(target) as f:
+            written = f.read()
+        self.assertTrue(written.startswith('Directory structure:'))
+        self.assertIn('print("hi")', written)
+
+    def test_prompt_git_index_flag(self):
+        parser = setup_cli_parser()
+        self.assertFalse(parser.parse_args(['prompt']).git_index)
+        self.assertTrue(parser.parse_args(['prompt', '--git_index']).git_index)
+
+    def test_prompt_max_tokens_flag(self):
+        parser = setup_cli_parser()
+        self.assertIsNone(parser.parse_args(['prompt']).max_tokens)
+        self.assertEqual(parser.parse_args(['prompt', '--max_tokens', '8000']).max_tokens, 8000)
+        with self.assertRaises(SystemExit):
+            parser.parse_args(['prompt', '--max_tokens', '0'])
+
+    def test_prompt_split_flags(self):
+        parser = setup_cli_parser()
+        args = parser.parse_args(['prompt', '--split_bytes', '1000', '--part_command', 'wc -c'])
+        self.assertEqual((args.split_bytes, args.split_tokens, args.part_command), (1000, None, 'wc -c'))
+        self.assertEqual(parser.parse_args(['prompt', '--split_tokens', '50']).split_tokens, 50)
+
+    def test_prompt_split_writes_parts(self):
+        for name in ('a.py', 'b.py'):
+            with open(os.path.join(self.test_prompt_dir, name), 'w') as f:
+                f.write(f'# {name}\n' + 'x = 1\n' * 100)
+        out = os.path.join(self.test_dir, 'parts')
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir, '--content',
+                                '--prompt_dir', self.test_prompt_dir, '--no_cache',
+                                '--split_bytes', '1000', '--output', out]):
+            self.assertEqual(main(), 0)
+        self.assertEqual(sorted(os.listdir(out)), ['.gitignore', 'part-001.txt', 'part-002.txt'])
+
+    def test_prompt_split_does_not_use_watcher(self):
+        """Split prompts are streamed block by block, so file blocks stay whole."""
+        for name in ('a.py', 'b.py'):
+            with open(os.path.join(self.test_prompt_dir, name), 'w') as f:
+                f.write(f'# {name}\n' + 'x = 1\n' * 100)
+        out = os.path.join(self.test_dir, 'parts')
+        reply = PromptResult(directory_tree='tree', file_contents='content')
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir, '--content',
+                                '--prompt_dir', self.test_prompt_dir,
+                                '--split_bytes', '1000', '--output', out]), \
+                patch('gpt_automation.main._prompt_from_watcher', return_value=reply) as ask:
+            self.assertEqual(main(), 0)
+        ask.assert_not_called()
+        parts = sorted(name for name in os.listdir(out) if name.startswith('part-'))
+        self.assertEqual(len(parts), 2)
+        for part in parts:
+            with open(os.path.join(out, part)) as f:
+                text = f.read()
+            self.assertTrue(text.startswith('### '))
+            self.assertEqual(text.count('### '), 1)
+
+    def test_prompt_since_last_flag(self):
+        parser = setup_cli_parser()
+        self.assertFalse(parser.parse_args(['prompt']).since_last)
+        self.assertTrue(parser.parse_args(['prompt', '--since_last']).since_last)
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir,
+                                '--since_last', '--no_cache', '--stdout']):
+            self.assertEqual(main(), 1)
+
+    def test_prompt_outline_flag(self):
+        parser = setup_cli_parser()
+        self.assertFalse(parser.parse_args(['prompt']).outline)
+        self.assertTrue(parser.parse_args(['prompt', '--outline']).outline)
+        self.assertTrue(parser.parse_args(['prompt', '--minify']).minify)
+
+    def test_prompt_tree_collapse_flags(self):
+        parser = setup_cli_parser()
+        args = parser.parse_args(['prompt', '--tree_depth', '2', '--tree_max_children', '50'])
+        self.assertEqual((args.tree_depth, args.tree_max_children), (2, 50))
+        with patch('sys.argv', ['autogpt', 'prompt', '--tree_depth', '0']):
+            with self.assertRaises(SystemExit):
+                main()
+
+    def test_prompt_changed_vs_flags(self):
+        parser = setup_cli_parser()
+        args = parser.parse_args(['prompt', '--changed_vs', 'origin/main', '--neighbours'])
+        self.assertEqual((args.changed_vs, args.neighbours), ('origin/main', True))
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir, '--neighbours']):
+            self.assertEqual(main(), 1)
+
+    def test_watch_flags(self):
+        parser = setup_cli_parser()
+        args = parser.parse_args(['watch', '--root_dir', '/root', '--poll', '--poll_interval', '0.5'])
+        self.assertEqual(args.command, 'watch')
+        self.assertTrue(args.poll)
+        self.assertEqual(args.poll_interval, 0.5)
+
+    def test_prompt_uses_running_watcher(self):
+        """A reply from the watcher is used without building the prompt locally."""
+        reply = PromptResult(directory_tree='tree', file_contents='content')
+        with patch('sys.argv', ['autogpt', 'prompt', '--root_dir', self.test_dir,
+                                '--prompt_dir', self.test_prompt_dir]), \
+                patch('gpt_automation.main._prompt_from_watcher', return_value=reply) as ask, \
+                patch('gpt_automation.main._generate') as generate:
+            self.assertEqual(main(), 0)
+        ask.assert_called_once()
+        generate.assert_not_called()
+
     # ── error handling ─────────────────────────────────────────────────────
 
     def test_invalid_command_exits(self):
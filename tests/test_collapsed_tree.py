@@ -0,0 +1,156 @@
+"""
+Test collapsed trees: deep or crowded directories become one summary line,
+and their sizes come from the walk's stat data, or the index's rollups
+while every summed file is unchanged.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.tree_sizes import DirectorySizes
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, EntryKind
+from gpt_automation.domain.tree import Collapse, collapsed_tree, format_size, render_tree
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.output.sinks import BufferSink
+
+_PATHS = sorted([
+    ('README.md',),
+    ('node_modules', 'x', 'i.js'),
+    ('node_modules', 'y.js'),
+    ('node_modules', 'z.js'),
+    ('src', 'app.py'),
+    ('src', 'lib', 'a.py'),
+    ('src', 'lib', 'b.py'),
+])
+
+
+def _sizes(directory, names):
+    return 100 * len(names)
+
+
+def test_max_depth_summarises_deeper_directories():
+    assert list(collapsed_tree(_PATHS, Collapse(max_depth=2), _sizes)) == [
+        '├── README.md',
+        '├── node_modules',
+        '│   ├── x/ (1 file, 100 B)',
+        '│   ├── y.js',
+        '│   └── z.js',
+        '└── src',
+        '    ├── app.py',
+        '    └── lib/ (2 files, 200 B)',
+    ]
+
+
+def test_max_children_summarises_crowded_directories():
+    assert list(collapsed_tree(_PATHS, Collapse(max_children=2), _sizes)) == [
+        '├── README.md',
+        '├── node_modules/ (3 files, 300 B)',
+        '└── src',
+        '    ├── app.py',
+        '    └── lib',
+        '        ├── a.py',
+        '        └── b.py',
+    ]
+
+
+def test_sizes_are_asked_per_directory_inside_collapsed_ones_only():
+    asked = []
+    list(collapsed_tree(_PATHS, Collapse(max_depth=1), lambda d, names: asked.append((d, names)) or 0))
+    assert asked == [
+        (('node_modules', 'x'), ['i.js']),
+        (('node_modules',), ['y.js', 'z.js']),
+        (('src',), ['app.py']),
+        (('src', 'lib'), ['a.py', 'b.py']),
+    ]
+
+
+def test_no_rule_renders_the_full_tree():
+    assert list(collapsed_tree(_PATHS, Collapse(), _sizes)) == list(render_tree(_PATHS))
+
+
+def test_format_size():
+    assert [format_size(size) for size in (0, 1023, 1536, 5 * 1024 ** 3)] == \
+        ['0 B', '1023 B', '1.5 KB', '5.0 GB']
+
+
+# ── DirectorySizes ──
+
+
+def _entries(directory: Path, sizes: dict) -> list[DirectoryEntry]:
+    return [
+        DirectoryEntry(directory / name, EntryKind.FILE, os.stat_result((0o644, 0, 0, 1, 0, 0, size, 0, 1, 1)))
+        for name, size in sizes.items()
+    ]
+
+
+def test_sizes_are_summed_from_the_walks_stat_data(tmp_path):
+    sizes = DirectorySizes(tmp_path, _entries(tmp_path / 'd', {'a': 10, 'b': 20}), None)
+    with patch('os.stat', side_effect=AssertionError("stat again")):
+        assert sizes(('d',), ['a', 'b']) == 30
+
+
+def test_totals_are_reused_while_every_file_is_unchanged(tmp_path):
+    index = FileIndex(tmp_path / 'file_index.bin')
+    DirectorySizes(tmp_path, _entries(tmp_path / 'd', {'a': 10, 'b': 20}), index)(('d',), ['a', 'b'])
+
+    again = DirectorySizes(tmp_path, _entries(tmp_path / 'd', {'a': 10, 'b': 20}), index)
+    assert again(('d',), ['a', 'b']) == 30
+    assert again.stats['cached_directories'] == 1
+
+    rewritten = DirectorySizes(tmp_path, _entries(tmp_path / 'd', {'a': 10, 'b': 25}), index)
+    assert rewritten(('d',), ['a', 'b']) == 35
+    assert rewritten.stats['summed_directories'] == 1
+
+
+# ── GeneratePrompts ──
+
+
+def _project(tmp_path: Path) -> Path:
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    (root / 'deep' / 'inner').mkdir(parents=True)
+    (root / 'deep' / 'a.txt').write_text('a' * 10)
+    (root / 'deep' / 'inner' / 'b.txt').write_text('b' * 20)
+    (root / 'top.txt').write_text('top\n')
+    return root
+
+
+def _tree(root: Path, **kwargs) -> str:
+    sink = BufferSink()
+    AppContainer(root).generate_prompts.write(sink, root, [], None, collapse=Collapse(max_depth=1), **kwargs)
+    return sink.getvalue()
+
+
+def test_prompt_collapses_with_sizes(tmp_path):
+    root = _project(tmp_path)
+    tree = _tree(root)
+    assert '├── deep/ (2 files, 30 B)\n' in tree
+    assert tree.endswith('└── top.txt')
+
+
+def test_tree_only_walks_carry_stat_data(tmp_path):
+    root = _project(tmp_path)
+    container = AppContainer(root)
+    walker = container.generate_prompts._walker
+    with patch.object(walker, 'iter_matching_entries', wraps=walker.iter_matching_entries) as walk:
+        sink = BufferSink()
+        container.generate_prompts.write(sink, root, [], None, collapse=Collapse(max_depth=1))
+    assert walk.call_args.kwargs['with_stat'] is True
+
+
+def test_a_file_rewritten_in_place_is_summed_again(tmp_path):
+    root = _project(tmp_path)
+    _tree(root)
+    directory = os.stat(root / 'deep' / 'inner')
+    (root / 'deep' / 'inner' / 'b.txt').write_text('b' * 90)
+    os.utime(root / 'deep' / 'inner', ns=(directory.st_atime_ns, directory.st_mtime_ns))
+    assert '├── deep/ (2 files, 100 B)\n' in _tree(root)
+
+
+def test_a_changed_directory_is_summed_again(tmp_path):
+    root = _project(tmp_path)
+    _tree(root)
+    (root / 'deep' / 'inner' / 'c.txt').write_text('c' * 70)
+    assert '├── deep/ (3 files, 100 B)\n' in _tree(root)
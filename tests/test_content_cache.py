@@ -0,0 +1,139 @@
+"""
+Test the persistent content cache: unchanged files are served without a
+read, changed files are re-read, and the store stays within its budget.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent, FileSignature
+
+_HOUR_NS = 3600 * 10**9
+
+
+def _write_old(path: Path, data: bytes, age_ns: int = _HOUR_NS) -> None:
+    """Write data with an mtime old enough to be outside the racy window."""
+    path.write_bytes(data)
+    mtime = time.time_ns() - age_ns
+    os.utime(path, ns=(mtime, mtime))
+
+
+def _signature(path: Path) -> FileSignature:
+    return FileSignature.of(os.stat(path))
+
+
+class TestContentCache:
+    def test_entries_survive_a_new_instance(self, tmp_path):
+        db = tmp_path / 'cache' / 'contents.sqlite'
+        src = tmp_path / 'a.py'
+        _write_old(src, b'x = 1\n')
+        cache = ContentCache(db, budget_bytes=1 << 20)
+        cache.put(src, _signature(src), FileContent('x = 1\n', 'ascii', 'h', 1))
+        cache.save()
+
+        again = ContentCache(db, budget_bytes=1 << 20)
+        assert again.get(src, _signature(src)) == FileContent('x = 1\n', 'ascii', 'h', 1)
+        assert (tmp_path / 'cache' / '.gitignore').read_text() == '*\n'
+
+    def test_different_signature_misses(self, tmp_path):
+        db, src = tmp_path / 'contents.sqlite', tmp_path / 'a.py'
+        _write_old(src, b'x = 1\n')
+        cache = ContentCache(db, budget_bytes=1 << 20)
+        cache.put(src, _signature(src), FileContent('x = 1\n', 'ascii', 'h', 1))
+        cache.save()
+
+        _write_old(src, b'x = 22\n', age_ns=_HOUR_NS // 2)
+        assert cache.get(src, _signature(src)) is None
+
+    def test_recently_modified_files_are_not_stored(self, tmp_path):
+        db, src = tmp_path / 'contents.sqlite', tmp_path / 'a.py'
+        src.write_bytes(b'fresh\n')
+        cache = ContentCache(db, budget_bytes=1 << 20)
+        cache.put(src, _signature(src), FileContent('fresh\n', 'ascii', 'h', 1))
+        cache.save()
+        assert cache.get(src, _signature(src)) is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        db = tmp_path / 'contents.sqlite'
+        files = [tmp_path / f'f{i}.txt' for i in range(3)]
+        for path in files:
+            _write_old(path, b'x' * 100)
+
+        cache = ContentCache(db, budget_bytes=250)
+        for path in files[:2]:
+            cache.put(path, _signature(path), FileContent('x' * 100, 'ascii', 'h', 1))
+        cache.save()
+        assert cache.get(files[0], _signature(files[0])) is not None   # f0 is now the most recent
+        cache.save()
+        cache.put(files[2], _signature(files[2]), FileContent('x' * 100, 'ascii', 'h', 1))
+        cache.save()
+
+        fresh = ContentCache(db, budget_bytes=250)
+        assert [fresh.get(p, _signature(p)) is not None for p in files] == [True, False, True]
+
+    def test_two_processes_share_the_database(self, tmp_path):
+        db = tmp_path / 'contents.sqlite'
+        a, b = tmp_path / 'a.txt', tmp_path / 'b.txt'
+        _write_old(a, b'a')
+        _write_old(b, b'b')
+        first, second = ContentCache(db, 1 << 20), ContentCache(db, 1 << 20)
+        first.put(a, _signature(a), FileContent('a', 'ascii', 'ha', 1))
+        second.put(b, _signature(b), FileContent('b', 'ascii', 'hb', 1))
+        first.save()
+        second.save()
+
+        assert first.get(b, _signature(b)).text == 'b'
+        assert second.get(a, _signature(a)).text == 'a'
+
+    def test_corrupt_database_is_recreated(self, tmp_path):
+        db, src = tmp_path / 'contents.sqlite', tmp_path / 'a.py'
+        db.write_bytes(b'this is not sqlite' * 100)
+        _write_old(src, b'x')
+        cache = ContentCache(db, 1 << 20)
+        assert cache.get(src, _signature(src)) is None
+        cache.put(src, _signature(src), FileContent('x', 'ascii', 'h', 1))
+        cache.save()
+        assert sqlite3.connect(db).execute('SELECT COUNT(*) FROM contents').fetchone() == (1,)
+
+
+class TestReaderWithCache:
+    def test_hit_skips_the_read(self, tmp_path):
+        db, src = tmp_path / 'contents.sqlite', tmp_path / 'legacy.txt'
+        _write_old(src, "café\n".encode('latin-1'))
+        first = FileContentReader(cache=ContentCache(db, 1 << 20))
+        content = first.read_content(src)
+        assert content.text == "café\n" and content.encoding != 'utf-8' and content.content_hash
+        first._cache.save()
+
+        reader = FileContentReader(cache=ContentCache(db, 1 << 20))
+        with patch('builtins.open', side_effect=AssertionError("file was read")), \
+                patch('chardet.detect', side_effect=AssertionError("detection ran")):
+            assert reader.read(src) == "café\n"
+
+    def test_binary_placeholder_is_cached(self, tmp_path):
+        db, blob = tmp_path / 'contents.sqlite', tmp_path / 'blob.bin'
+        _write_old(blob, b'\0' * 100)
+        reader = FileContentReader(cache=ContentCache(db, 1 << 20))
+        assert reader.read_content(blob).encoding == 'binary'
+        reader._cache.save()
+        assert ContentCache(db, 1 << 20).get(blob, _signature(blob)).encoding == 'binary'
+
+
+def test_second_prompt_run_is_served_from_the_cache(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    for i in range(5):
+        _write_old(root / f'm{i}.py', f'value = {i}\n'.encode())
+
+    first = AppContainer(root).generate_prompts.run(root, [], include_tree=False)
+    container = AppContainer(root)
+    second = container.generate_prompts.run(root, [], include_tree=False)
+
+    assert second == first
+    assert container.content_cache.hits == 5 and container.content_cache.misses == 0
+    assert (root / '.gpt' / 'cache' / 'contents.sqlite').exists()
@@ -0,0 +1,58 @@
+"""
+Test content-hash deduplication: the first copy of a file is shown in
+full, later copies as a reference to it.
+"""
+
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.config.settings_loader import SettingsWriter
+from gpt_automation.infrastructure.config.settings_model import ContentReadingSettings, ProjectSettings
+
+LICENSE = 'Permission is hereby granted, free of charge, to any person obtaining a copy.\n' * 5
+
+
+def _project(tmp_path, **reading):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    if reading:
+        settings = ProjectSettings.defaults()
+        settings.content_reading = ContentReadingSettings(**reading)
+        SettingsWriter(root / '.gpt' / 'settings' / 'base_settings.json').write(settings)
+    for vendor in ('a', 'b', 'c'):
+        (root / 'vendor' / vendor).mkdir(parents=True)
+        (root / 'vendor' / vendor / 'LICENSE').write_text(LICENSE)
+    (root / 'vendor' / 'b' / 'empty.txt').write_text('')
+    (root / 'vendor' / 'c' / 'empty.txt').write_text('')
+    (root / 'main.py').write_text('print("hi")\n')
+    return root
+
+
+def _contents(root, profiles=(), use_cache=False) -> str:
+    return AppContainer(root, use_cache=use_cache).generate_prompts.run(
+        root, list(profiles), include_tree=False,
+    ).file_contents
+
+
+def test_later_copies_refer_to_the_first(tmp_path):
+    root = _project(tmp_path)
+    contents = _contents(root)
+
+    first = root / 'vendor' / 'a' / 'LICENSE'
+    assert contents.count(LICENSE) == 1
+    assert f"### {first}\n{LICENSE}" in contents
+    for vendor in ('b', 'c'):
+        assert f"### {root / 'vendor' / vendor / 'LICENSE'}\n[Same content as {first}]" in contents
+    assert 'print("hi")' in contents
+    assert contents.endswith(f"### {root / 'vendor' / 'c' / 'empty.txt'}\n")  # Shorter than any reference
+
+
+def test_output_is_deterministic_with_and_without_the_cache(tmp_path):
+    root = _project(tmp_path)
+    expected = _contents(root)
+    assert _contents(root, use_cache=True) == expected
+    assert _contents(root, use_cache=True) == expected
+
+
+def test_profiles_can_turn_it_off(tmp_path):
+    root = _project(tmp_path, deduplicate_by_profile={'full': False})
+    assert _contents(root).count(LICENSE) == 1
+    assert _contents(root, ['full']).count(LICENSE) == 3
@@ -7,7 +7,13 @@ No real files — just pure logic. Runs instantly.
 from pathlib import Path
 from unittest.mock import MagicMock
 
-from gpt_automation.domain.traversal.directory_reader import DirectoryWalker, FilesystemQuery
+from gpt_automation.domain.traversal.directory_reader import (
+    DirectoryEntry,
+    DirectoryWalker,
+    FilesystemQuery,
+    EntryKind,
+)
+from gpt_automation.domain.traversal.parallel_walker import ParallelDirectoryWalker
 from gpt_automation.domain.filters.file_filter import IncludeEverythingFilter, AllFilters, FileFilter
 
 
@@ -50,6 +56,10 @@ def _make_filesystem(tree: dict) -> FilesystemQuery:
     fs.is_file.side_effect = _is_file
     fs.is_directory.side_effect = _is_dir
     fs.list_directory.side_effect = _list
+    # Typed listing goes through the ABC's default, built on the three fakes above
+    fs.scan_directory.side_effect = (
+        lambda p, with_stat=False: FilesystemQuery.scan_directory(fs, p, with_stat)
+    )
     return fs
 
 
@@ -123,3 +133,190 @@ class TestDirectoryWalker:
 
         files = walker.collect_matching_files(ROOT, IncludeEverythingFilter())
         assert files == []
+
+
+class TestIterMatchingFiles:
+
+    def test_yields_same_sequence_as_collect(self):
+        fs = _make_filesystem(_TREE)
+        walker = DirectoryWalker(fs)
+        assert list(walker.iter_matching_files(ROOT, IncludeEverythingFilter())) == \
+            walker.collect_matching_files(ROOT, IncludeEverythingFilter())
+
+    def test_first_match_needs_only_first_listing(self):
+        fs = _make_filesystem(_TREE)
+        files = DirectoryWalker(fs).iter_matching_files(ROOT, IncludeEverythingFilter())
+
+        assert next(files) == ROOT / '.hidden'
+        assert [call.args[0] for call in fs.list_directory.call_args_list] == [ROOT]
+
+    def test_entries_stat_only_matching_files(self):
+        class OnlyMarkdown(FileFilter):
+            def should_include_file(self, p: Path) -> bool:
+                return p.suffix == '.md'
+
+            def should_include_directory(self, d: Path) -> bool:
+                return True
+
+        fs = _make_filesystem(_TREE)
+        fs.stat.side_effect = lambda p: f'stat of {p.name}'
+        entries = list(DirectoryWalker(fs).iter_matching_entries(ROOT, OnlyMarkdown(), with_stat=True))
+
+        assert [(e.path, e.kind, e.stat) for e in entries] == [(ROOT / 'README.md', EntryKind.FILE, 'stat of README.md')]
+        assert [call.args[0] for call in fs.stat.call_args_list] == [ROOT / 'README.md']
+
+    def test_entries_keep_the_stat_of_their_listing(self):
+        fs = _make_filesystem(_TREE)
+        fs.scan_directory.side_effect = lambda p, with_stat=False: [
+            DirectoryEntry(e.path, e.kind, f'listed {e.path.name}' if with_stat and e.is_file else None)
+            for e in FilesystemQuery.scan_directory(fs, p)
+        ]
+        entries = list(DirectoryWalker(fs).iter_matching_entries(ROOT, IncludeEverythingFilter(), with_stat=True))
+
+        assert [e.stat for e in entries][:2] == ['listed .hidden', 'listed README.md']
+        fs.stat.assert_not_called()
+
+    def test_shared_listing_without_stat_is_rescanned_for_stat(self):
+        fs = _make_filesystem(_TREE)
+        walker = DirectoryWalker(fs)
+        with walker.shared_listings():
+            walker.collect_matching_files(ROOT, IncludeEverythingFilter())
+            list(walker.iter_matching_entries(ROOT, IncludeEverythingFilter(), with_stat=True))
+            list(walker.iter_matching_entries(ROOT, IncludeEverythingFilter(), with_stat=True))
+        calls = [(call.args[0], call.args[1] if len(call.args) > 1 else False)
+                 for call in fs.scan_directory.call_args_list]
+        assert calls.count((ROOT, False)) == 1 and calls.count((ROOT, True)) == 1
+
+
+class TestSharedListings:
+
+    def test_listings_reused_inside_block_only(self):
+        fs = _make_filesystem(_TREE)
+        walker = DirectoryWalker(fs)
+
+        with walker.shared_listings():
+            first = walker.collect_matching_files(ROOT, IncludeEverythingFilter())
+            second = walker.collect_matching_files(ROOT, IncludeEverythingFilter())
+        listed_inside = fs.list_directory.call_count
+
+        walker.collect_matching_files(ROOT, IncludeEverythingFilter())
+
+        assert first == second
+        assert listed_inside == 3  # ROOT, src, src/tests — once each
+        assert fs.list_directory.call_count == 6
+
+
+class TestTypedListing:
+
+    def test_default_scan_classifies_entries(self):
+        fs = _make_filesystem(_TREE)
+        kinds = {e.path.name: e.kind for e in fs.scan_directory(ROOT)}
+        assert kinds == {
+            'src': EntryKind.DIRECTORY,
+            'README.md': EntryKind.FILE,
+            '.hidden': EntryKind.FILE,
+        }
+
+    def test_walker_does_not_query_kinds_per_entry(self):
+        """Only the root is checked; entries are classified by the listing."""
+        fs = MagicMock(spec=FilesystemQuery)
+        fs.is_directory.return_value = True
+        fs.scan_directory.return_value = []
+
+        DirectoryWalker(fs).collect_matching_files(ROOT, IncludeEverythingFilter())
+
+        fs.is_directory.assert_called_once_with(ROOT)
+        fs.is_file.assert_not_called()
+
+
+class _RecordingFilter(FileFilter):
+    """Include everything except dirs named 'tests'; record traversal events."""
+
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+
+    def should_include_file(self, p: Path) -> bool:
+        return True
+
+    def should_include_directory(self, d: Path) -> bool:
+        return d.name != 'tests'
+
+    def enter_directory(self, d: Path) -> None:
+        self.events.append(('enter', d.name or '/'))
+
+    def leave_directory(self, d: Path) -> None:
+        self.events.append(('leave', d.name or '/'))
+
+
+class TestTraversalEvents:
+
+    def test_enter_and_leave_bracket_each_traversed_directory(self):
+        fs = _make_filesystem(_TREE)
+        recorder = _RecordingFilter()
+
+        DirectoryWalker(fs).collect_matching_files(ROOT, recorder)
+
+        assert recorder.events == [
+            ('enter', 'project'),
+            ('enter', 'src'),
+            ('leave', 'src'),
+            ('leave', 'project'),
+        ]
+
+    def test_pruned_directory_is_never_entered_or_listed(self):
+        fs = _make_filesystem(_TREE)
+        recorder = _RecordingFilter()
+
+        DirectoryWalker(fs).collect_matching_files(ROOT, recorder)
+
+        assert ('enter', 'tests') not in recorder.events
+        listed = [call.args[0] for call in fs.list_directory.call_args_list]
+        assert ROOT / 'src' / 'tests' not in listed
+
+    def test_all_filters_forwards_events(self):
+        first, second = _RecordingFilter(), _RecordingFilter()
+        combined = AllFilters([first, second])
+
+        combined.enter_directory(ROOT)
+        combined.leave_directory(ROOT)
+
+        assert first.events == second.events == [('enter', 'project'), ('leave', 'project')]
+
+
+class TestParallelDirectoryWalker:
+
+    def test_prefetches_stay_bounded_on_wide_trees(self):
+        wide = {f'd{i:03}': {'f.txt': None} for i in range(200)}
+        fs = _make_filesystem(wide)
+        walker = ParallelDirectoryWalker(fs, max_workers=2)
+
+        for count, path in enumerate(walker.iter_matching_files(ROOT, IncludeEverythingFilter()), start=1):
+            # The root, the directories walked so far, and a few per worker ahead
+            assert fs.scan_directory.call_count <= 1 + count + 2 * 4
+        assert count == 200
+
+    def test_same_sorted_result_as_serial_walker(self):
+        fs = _make_filesystem(_TREE)
+        serial = DirectoryWalker(fs).collect_matching_files(ROOT, IncludeEverythingFilter())
+        parallel = ParallelDirectoryWalker(fs, max_workers=4).collect_matching_files(
+            ROOT, IncludeEverythingFilter())
+
+        assert parallel == serial
+        assert parallel == sorted(parallel)
+
+    def test_filter_sees_same_events_and_prunes_before_listing(self):
+        serial_fs, parallel_fs = _make_filesystem(_TREE), _make_filesystem(_TREE)
+        serial_filter, parallel_filter = _RecordingFilter(), _RecordingFilter()
+
+        DirectoryWalker(serial_fs).collect_matching_files(ROOT, serial_filter)
+        ParallelDirectoryWalker(parallel_fs, max_workers=4).collect_matching_files(ROOT, parallel_filter)
+
+        assert parallel_filter.events == serial_filter.events
+        listed = [call.args[0] for call in parallel_fs.list_directory.call_args_list]
+        assert ROOT / 'src' / 'tests' not in listed
+
+    def test_requires_a_worker(self):
+        import pytest
+
+        with pytest.raises(ValueError, match="at least one"):
+            ParallelDirectoryWalker(_make_filesystem({}), max_workers=0)
@@ -0,0 +1,224 @@
+"""
+Test the persistent walk index: cached listings, replayed filter decisions,
+and invalidation when directories, rule files or settings change.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryWalker, EntryKind
+from gpt_automation.infrastructure.cache.file_index import FileIndex
+from gpt_automation.infrastructure.filesystem.indexed_filesystem_query import IndexedFilesystemQuery
+from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+from gpt_automation.infrastructure.plugins.decision_cache import CachedDecisionFilter
+
+
+def _age(*paths: Path) -> None:
+    """Backdate mtimes past the racy window so results are cacheable."""
+    past = time.time() - 60
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'app.py').write_text('print(1)\n')
+    (tmp_path / 'src' / 'app.log').write_text('log\n')
+    (tmp_path / 'README.md').write_text('readme\n')
+    (tmp_path / '.gitignore').write_text('*.log\n')
+    _age(tmp_path / '.gitignore', tmp_path / 'src', tmp_path)
+    return tmp_path
+
+
+class _NameFilter(FileFilter):
+    """Excludes *.log and records every decision and event it sees."""
+
+    def __init__(self):
+        self.calls = []
+
+    def should_include_file(self, file_path):
+        self.calls.append(('file', Path(file_path).name))
+        return not str(file_path).endswith('.log')
+
+    def should_include_directory(self, dir_path):
+        self.calls.append(('dir', Path(dir_path).name))
+        return True
+
+    def enter_directory(self, dir_path):
+        self.calls.append(('enter', Path(dir_path).name))
+
+    def leave_directory(self, dir_path):
+        self.calls.append(('leave', Path(dir_path).name))
+
+
+class TestFileIndexPersistence:
+    def test_round_trip(self, tmp_path):
+        index_file = tmp_path / 'cache' / 'file_index.bin'
+        index = FileIndex.load(index_file)
+        index.listings['/x'] = (1, index.run, ('a',), 'f')
+        index.decisions_for('ctx', b'cfg')['/x'] = (b'fp', index.run, {'a': True})
+        index.save()
+
+        reloaded = FileIndex.load(index_file)
+        assert reloaded.run == index.run + 1
+        assert reloaded.listings['/x'][2] == ('a',)
+        assert reloaded.decisions_for('ctx', b'cfg')['/x'][2] == {'a': True}
+
+    def test_changed_config_starts_an_empty_table(self, tmp_path):
+        index = FileIndex(tmp_path / 'file_index.bin')
+        index.decisions_for('ctx', b'old')['/x'] = (b'fp', index.run, {})
+        assert index.decisions_for('ctx', b'new') == {}
+
+    def test_corrupt_file_loads_empty(self, tmp_path):
+        index_file = tmp_path / 'file_index.bin'
+        index_file.write_bytes(b'\x00garbage')
+        index = FileIndex.load(index_file)
+        assert index.listings == {} and index.run == 1
+
+    def test_cache_dir_is_excluded_from_walks(self, tmp_path):
+        FileIndex(tmp_path / 'cache' / 'file_index.bin').save()
+        assert (tmp_path / 'cache' / '.gitignore').read_text() == '*\n'
+
+
+class TestIndexedFilesystemQuery:
+    def _query(self, tmp_path):
+        inner = MagicMock(wraps=OsFilesystemQuery())
+        index = FileIndex(tmp_path / 'index.bin')
+        return IndexedFilesystemQuery(inner, index), inner, index
+
+    def test_unchanged_directory_is_not_listed_again(self, tree):
+        query, inner, _ = self._query(tree)
+        first = query.scan_directory(tree / 'src')
+        second = query.scan_directory(tree / 'src')
+
+        assert inner.scan_directory.call_count == 1
+        assert sorted((e.path, e.kind) for e in first) == sorted((e.path, e.kind) for e in second)
+
+    def test_added_entry_forces_a_relist(self, tree):
+        query, inner, _ = self._query(tree)
+        query.scan_directory(tree / 'src')
+        (tree / 'src' / 'new.py').write_text('')
+        os.utime(tree / 'src', ns=(time.time_ns() - 30_000_000_000,) * 2)
+
+        names = {e.path.name for e in query.scan_directory(tree / 'src')}
+        assert 'new.py' in names
+        assert inner.scan_directory.call_count == 2
+
+    def test_recently_modified_directory_is_not_cached(self, tree):
+        query, inner, index = self._query(tree)
+        (tree / 'src' / 'fresh.py').write_text('')
+        query.scan_directory(tree / 'src')
+        assert str(tree / 'src') not in index.listings
+
+    def test_kinds_survive_the_cache(self, tree):
+        query, _, _ = self._query(tree)
+        query.scan_directory(tree)
+        kinds = {e.path.name: e.kind for e in query.scan_directory(tree)}
+        assert kinds['src'] is EntryKind.DIRECTORY
+        assert kinds['README.md'] is EntryKind.FILE
+
+    def test_stat_listings_use_the_cache_but_never_cache_stat(self, tree):
+        query, inner, index = self._query(tree)
+        listed = query.scan_directory(tree, with_stat=True)
+        assert all(e.stat is not None for e in listed if e.is_file)
+        assert str(tree) in index.listings
+
+        cached = query.scan_directory(tree, with_stat=True)
+        assert inner.scan_directory.call_count == 1
+        assert all(e.stat is None for e in cached)   # The walker stats what it yields
+
+    def test_walk_stats_only_files_of_cached_listings(self, tree):
+        query, inner, _ = self._query(tree)
+        walker = DirectoryWalker(query)
+        first = list(walker.iter_matching_entries(tree, _NameFilter(), with_stat=True))
+        assert inner.stat.call_count == 0        # Stat came with the listing
+        second = list(walker.iter_matching_entries(tree, _NameFilter(), with_stat=True))
+        assert inner.stat.call_count == len(second)
+        assert [(e.path, e.stat.st_size) for e in first] == [(e.path, e.stat.st_size) for e in second]
+
+
+class TestCachedDecisionFilter:
+    def _walk(self, tree, table, inner):
+        wrapped = CachedDecisionFilter(inner, table, 1, b'base', ['.gitignore'])
+        return DirectoryWalker(OsFilesystemQuery()).collect_matching_files(tree, wrapped)
+
+    def test_second_walk_replays_without_consulting_the_filter(self, tree):
+        table = {}
+        first = self._walk(tree, table, _NameFilter())
+        inner = _NameFilter()
+        second = self._walk(tree, table, inner)
+
+        assert first == second
+        assert tree / 'src' / 'app.log' not in second
+        # Only the walk root's own check is asked; nothing is entered
+        assert inner.calls == [('dir', tree.name)]
+
+    def test_rule_file_change_invalidates_the_subtree(self, tree):
+        table = {}
+        self._walk(tree, table, _NameFilter())
+        (tree / '.gitignore').write_text('*.log\n*.md\n')
+        _age(tree / '.gitignore')
+
+        inner = _NameFilter()
+        self._walk(tree, table, inner)
+        assert ('file', 'app.py') in inner.calls
+        # The filter state is rebuilt ancestors first before deciding
+        assert inner.calls.index(('enter', tree.name)) < inner.calls.index(('enter', 'src'))
+
+    def test_new_file_in_cached_directory_is_decided(self, tree):
+        table = {}
+        self._walk(tree, table, _NameFilter())
+        (tree / 'src' / 'other.log').write_text('')
+
+        inner = _NameFilter()
+        files = self._walk(tree, table, inner)
+        assert tree / 'src' / 'other.log' not in files
+        assert [c for c in inner.calls if c[0] == 'file'] == [('file', 'other.log')]
+
+
+class TestPromptsWithIndex:
+    def _contents(self, root, **kwargs):
+        container = AppContainer(root, **kwargs)
+        return container.generate_prompts.run(root, [], include_tree=False).file_contents
+
+    @pytest.fixture
+    def project(self, tree):
+        AppContainer(tree).initialize_project.run([])
+        for path in (tree / '.gpt').rglob('*'):
+            _age(path)
+        _age(tree / '.gpt', tree)
+        return tree
+
+    def test_repeated_runs_match_an_uncached_run(self, project):
+        uncached = self._contents(project, use_cache=False)
+        assert self._contents(project) == uncached
+        assert self._contents(project) == uncached
+        assert (project / '.gpt' / 'cache' / 'file_index.bin').exists()
+        assert 'file_index.bin' not in uncached
+
+    def test_gitignore_edit_is_picked_up(self, project):
+        self._contents(project)
+        (project / '.gitignore').write_text('*.log\n*.md\n')
+        assert 'README.md' not in self._contents(project)
+
+    def test_blocklist_edit_is_picked_up(self, project):
+        self._contents(project)
+        blocklist = project / '.gpt' / 'config' / 'gpt_automation' / 'bw_filter' / 'black_list.txt'
+        blocklist.write_text('*.py\n')
+        assert 'app.py' not in self._contents(project)
+
+    def test_settings_edit_is_picked_up(self, project):
+        assert 'app.log' not in self._contents(project)
+        settings_file = project / '.gpt' / 'settings' / 'base_settings.json'
+        settings = json.loads(settings_file.read_text())
+        settings['plugins'][0]['args']['enable'] = False  # gpt_ignore
+        settings_file.write_text(json.dumps(settings))
+        assert 'app.log' in self._contents(project)
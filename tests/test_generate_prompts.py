@@ -0,0 +1,123 @@
+"""
+Test the GeneratePrompts use case with fake collaborators.
+
+The walker and content reader are fakes, so these tests pin down how the
+use case drives them without touching the filesystem.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from gpt_automation.application.generate_prompts import GeneratePrompts
+from gpt_automation.domain.filters.file_filter import IncludeEverythingFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, EntryKind
+from gpt_automation.infrastructure.cache.content_cache import FileContent
+from gpt_automation.infrastructure.config.settings_model import ContentReadingSettings, ProjectSettings
+from gpt_automation.infrastructure.filesystem.project_paths import ProjectPaths
+from gpt_automation.infrastructure.logging.logger import NoOpLogger
+
+ROOT = Path('/project')
+FILES = [ROOT / 'a.py', ROOT / 'pkg' / 'b.py', ROOT / 'pkg' / 'c.py']
+
+
+class _FakeWalker:
+    """Yields FILES lazily and records when each one was produced."""
+
+    def __init__(self, events: list):
+        self._events = events
+
+    def iter_matching_files(self, root_dir, file_filter):
+        for path in FILES:
+            self._events.append(('walk', path.name))
+            yield path
+
+    def iter_matching_entries(self, root_dir, file_filter, with_stat=False):
+        for path in self.iter_matching_files(root_dir, file_filter):
+            yield DirectoryEntry(path, EntryKind.FILE)
+
+    def collect_matching_files(self, root_dir, file_filter):
+        return list(self.iter_matching_files(root_dir, file_filter))
+
+    @contextmanager
+    def shared_listings(self):
+        self._events.append(('share', 'begin'))
+        yield
+        self._events.append(('share', 'end'))
+
+
+class _FakeReader:
+    def __init__(self, events: list):
+        self._events = events
+
+    def read_content(self, file_path: Path, st=None, large_file_bytes: int = 0) -> FileContent:
+        self._events.append(('read', file_path.name))
+        text = f"content of {file_path.name}"
+        return FileContent(text, 'ascii', '', len(text.split()))
+
+
+def _use_case(events: list, filter_builder=None, threads: int = 1) -> GeneratePrompts:
+    if filter_builder is None:
+        filter_builder = MagicMock()
+        filter_builder.build_for_traversal.return_value = IncludeEverythingFilter()
+    return GeneratePrompts(
+        walker=_FakeWalker(events),
+        logger=NoOpLogger(),
+        content_reader=_FakeReader(events),
+        paths=ProjectPaths(ROOT),
+        settings=_settings(threads),
+        filter_builder=filter_builder,
+    )
+
+
+def _settings(threads: int) -> ProjectSettings:
+    settings = ProjectSettings.defaults()
+    settings.content_reading = ContentReadingSettings(threads=threads)
+    return settings
+
+
+class TestStreamingContents:
+
+    def test_contents_are_read_while_walking(self):
+        events = []
+        _use_case(events).run(ROOT, [], include_tree=False, include_contents=True)
+
+        assert events[:2] == [('walk', 'a.py'), ('read', 'a.py')]
+        assert events.count(('read', 'c.py')) == 1
+
+    def test_tree_and_contents_together(self):
+        events = []
+        result = _use_case(events).run(ROOT, [], include_tree=True, include_contents=True)
+
+        assert 'pkg' in result.directory_tree
+        assert result.file_contents.index('a.py') < result.file_contents.index('c.py')
+
+    def test_parallel_reads_keep_walk_order(self):
+        serial = _use_case([]).run(ROOT, [], include_tree=False)
+        parallel = _use_case([], threads=4).run(ROOT, [], include_tree=False)
+        assert parallel == serial
+
+
+class TestTreeAndContentsTogether:
+
+    def _builder(self):
+        builder = MagicMock()
+        builder.build_for_traversal.return_value = IncludeEverythingFilter()
+        return builder
+
+    def test_same_profiles_walk_once(self):
+        events, builder = [], self._builder()
+        result = _use_case(events, builder).run_tree_and_contents(ROOT, ['web'], ['web'])
+
+        assert builder.build_for_traversal.call_count == 1
+        assert events.count(('walk', 'a.py')) == 1
+        assert result.directory_tree and result.file_contents
+
+    def test_different_profiles_share_listings(self):
+        events, builder = [], self._builder()
+        result = _use_case(events, builder).run_tree_and_contents(ROOT, ['web'], ['api'])
+
+        assert builder.build_for_traversal.call_count == 2
+        assert events[0] == ('share', 'begin') and events[-1] == ('share', 'end')
+        assert events.count(('walk', 'a.py')) == 2
+        assert result.directory_tree and result.file_contents
@@ -0,0 +1,99 @@
+"""
+Test diff-scoped prompts: only files changed against a git ref go through
+the filters, optionally with their tests and tested files as neighbours.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.filesystem.git_diff_lister import GitDiffLister, find_neighbours
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git executable not available")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path.resolve()
+    for rel in ('src/app.py', 'src/util.py', 'src/test_util.py', 'tests/test_app.py',
+                'docs/guide.md', 'old.py'):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(f'# {rel}\n')
+    (root / '.gitignore').write_text('*.log\n')
+    _git(root, 'init', '-q')
+    _git(root, 'add', '.')
+    _git(root, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init')
+    return root
+
+
+def _changed(repo: Path, ref: str = 'HEAD', neighbours: bool = False) -> list[str]:
+    lister = GitDiffLister.for_ref(repo, ref, neighbours)
+    return [path.relative_to(repo).as_posix() for path in lister.list_files(repo)]
+
+
+class TestGitDiffLister:
+    def test_modified_staged_and_untracked_files(self, repo):
+        (repo / 'src' / 'app.py').write_text('changed\n')
+        (repo / 'docs' / 'guide.md').write_text('staged\n')
+        _git(repo, 'add', 'docs/guide.md')
+        (repo / 'new.py').write_text('new\n')
+        (repo / 'debug.log').write_text('ignored\n')
+        (repo / 'old.py').unlink()
+
+        assert _changed(repo) == ['docs/guide.md', 'new.py', 'src/app.py']
+
+    def test_committed_changes_against_an_older_ref(self, repo):
+        (repo / 'src' / 'util.py').write_text('v2\n')
+        _git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qam', 'v2')
+        assert _changed(repo, 'HEAD~1') == ['src/util.py']
+        assert _changed(repo) == []
+
+    def test_unknown_ref_is_an_error(self, repo):
+        with pytest.raises(ValueError, match="no-such-ref"):
+            GitDiffLister.for_ref(repo, 'no-such-ref')
+
+    def test_outside_git_is_an_error(self, tmp_path_factory):
+        with pytest.raises(ValueError, match="not inside a git checkout"):
+            GitDiffLister.for_ref(tmp_path_factory.mktemp('plain'), 'HEAD')
+
+    def test_symlinked_checkout_keeps_the_callers_paths(self, repo, tmp_path_factory):
+        (repo / 'src' / 'app.py').write_text('changed\n')
+        link = tmp_path_factory.mktemp('links') / 'link'
+        link.symlink_to(repo, target_is_directory=True)
+        assert GitDiffLister.for_ref(link, 'HEAD').list_files(link) == [link / 'src' / 'app.py']
+
+    def test_neighbours_are_tests_and_tested_files(self, repo):
+        (repo / 'src' / 'app.py').write_text('changed\n')
+        (repo / 'src' / 'test_util.py').write_text('changed\n')
+        assert _changed(repo, neighbours=True) == [
+            'src/app.py', 'src/test_util.py', 'src/util.py', 'tests/test_app.py',
+        ]
+
+    def test_neighbour_names(self, tmp_path):
+        for name in ('view.ts', 'view.spec.ts', 'view_test.ts', 'other.ts'):
+            (tmp_path / name).write_text('')
+        assert find_neighbours([tmp_path / 'view.ts'], tmp_path) == {
+            tmp_path / 'view.spec.ts', tmp_path / 'view_test.ts',
+        }
+
+
+def test_prompt_contains_only_changed_files_that_pass_the_filters(repo):
+    AppContainer(repo, use_cache=False).initialize_project.run([])
+    _git(repo, 'add', '.')
+    _git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'gpt')
+    (repo / 'src' / 'app.py').write_text('changed\n')
+    (repo / 'docs' / '.gptignore').write_text('*.md\n')
+    (repo / 'docs' / 'guide.md').write_text('changed too\n')
+
+    container = AppContainer(repo, use_cache=False, changed_vs='HEAD')
+    result = container.generate_prompts.run(repo, [])
+
+    assert result.directory_tree == 'Directory structure:\n\n├── docs\n│   └── .gptignore\n└── src\n    └── app.py'
+    assert 'changed too' not in result.file_contents
@@ -0,0 +1,192 @@
+"""
+Test the git-index enumeration backend: index parsing, the git file lister,
+and the walker that applies filters over a listed file set.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.filters.file_filter import FileFilter
+from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+from gpt_automation.domain.traversal.listed_files_walker import FileLister, ListedFilesWalker
+from gpt_automation.infrastructure.filesystem.git_file_lister import GitFileLister
+from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+from gpt_automation.main import main
+from gpt_automation.plugins.ignore_plugin.utils.git_tools import ls_files, read_index_paths
+
+requires_git = pytest.mark.skipif(shutil.which('git') is None, reason="git executable not available")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path.resolve()
+    (root / 'src' / 'pkg').mkdir(parents=True)
+    (root / 'src' / 'pkg' / 'mod.py').write_text('x = 1\n')
+    (root / 'src' / 'main.py').write_text('print(1)\n')
+    (root / 'docs').mkdir()
+    (root / 'docs' / 'guide.md').write_text('guide\n')
+    (root / 'tracked.log').write_text('tracked but ignored\n')
+    if shutil.which('git'):
+        _git(root, 'init', '-q')
+        _git(root, 'add', '.')
+        (root / '.gitignore').write_text('*.log\nbuild/\n')
+        _git(root, 'add', '.gitignore')
+        _git(root, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init')
+    (root / 'untracked.py').write_text('new\n')
+    (root / 'ignored.log').write_text('ignored\n')
+    (root / 'build').mkdir()
+    (root / 'build' / 'out.bin').write_text('bin\n')
+    return root
+
+
+@requires_git
+class TestReadIndexPaths:
+    @pytest.mark.parametrize('version', ['2', '3', '4'])
+    def test_matches_ls_files(self, repo, version):
+        _git(repo, 'update-index', '--index-version', version)
+        parsed = [os.fsdecode(p) for p in read_index_paths(repo / '.git' / 'index')]
+        assert parsed == ls_files(repo, '--cached')
+
+    def test_conflict_stages_are_listed_once(self, repo):
+        _git(repo, 'checkout', '-q', '-b', 'other')
+        (repo / 'src' / 'main.py').write_text('print("other")\n')
+        _git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qam', 'other')
+        _git(repo, 'checkout', '-q', '-')
+        (repo / 'src' / 'main.py').write_text('print("mine")\n')
+        _git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qam', 'mine')
+        subprocess.run(['git', '-C', str(repo), 'merge', 'other'], capture_output=True)
+
+        parsed = read_index_paths(repo / '.git' / 'index')
+        assert parsed.count(b'src/main.py') == 1
+
+
+@requires_git
+class TestGitFileLister:
+    def test_tracked_and_untracked_not_ignored(self, repo):
+        files = GitFileLister.for_directory(repo).list_files(repo)
+        rel = [p.relative_to(repo).as_posix() for p in files]
+
+        assert 'untracked.py' in rel
+        assert 'tracked.log' in rel           # Tracked files stay, as in git
+        assert 'ignored.log' not in rel
+        assert 'build/out.bin' not in rel
+        assert files == sorted(files)
+
+    def test_subdirectory_and_deleted_files(self, repo):
+        (repo / 'src' / 'main.py').unlink()
+        files = GitFileLister.for_directory(repo).list_files(repo / 'src')
+        assert files == [repo / 'src' / 'pkg' / 'mod.py']
+
+    def test_outside_the_repository_gives_none(self, repo, tmp_path_factory):
+        lister = GitFileLister.for_directory(repo)
+        assert lister.list_files(tmp_path_factory.mktemp('elsewhere')) is None
+
+    def test_symlinked_checkout_keeps_the_callers_paths(self, repo, tmp_path_factory):
+        link = tmp_path_factory.mktemp('links') / 'link'
+        link.symlink_to(repo, target_is_directory=True)
+        files = GitFileLister.for_directory(link).list_files(link / 'src')
+        assert files == [link / 'src' / 'main.py', link / 'src' / 'pkg' / 'mod.py']
+
+    def test_unreadable_index_falls_back_to_ls_files(self, repo):
+        lister = GitFileLister.for_directory(repo)
+        expected = lister.list_files(repo)
+        lister._index_file = repo / '.git' / 'missing-index'
+        assert lister.list_files(repo) == expected
+
+
+def test_not_a_repository(tmp_path):
+    assert GitFileLister.for_directory(tmp_path) is None
+
+
+class _StaticLister(FileLister):
+    def __init__(self, files):
+        self._files = files
+
+    def list_files(self, root_dir):
+        return sorted(self._files)
+
+
+class _Recorder(FileFilter):
+    """Excludes .git, directories named 'docs' and *.log files; records events."""
+
+    def __init__(self):
+        self.events = []
+
+    def should_include_file(self, p):
+        return p.suffix != '.log'
+
+    def should_include_directory(self, d):
+        return d.name not in ('docs', '.git')
+
+    def enter_directory(self, d):
+        self.events.append(('enter', d))
+
+    def leave_directory(self, d):
+        self.events.append(('leave', d))
+
+
+class TestListedFilesWalker:
+    def test_same_files_and_events_as_a_walk(self, repo):
+        (repo / 'empty').mkdir()
+        everything = [Path(d) / f for d, _, fs in os.walk(repo) for f in fs if '.git' not in Path(d).parts]
+
+        walked, listed = _Recorder(), _Recorder()
+        expected = DirectoryWalker(OsFilesystemQuery()).collect_matching_files(repo, walked)
+        actual = ListedFilesWalker(OsFilesystemQuery(), _StaticLister(everything)).collect_matching_files(repo, listed)
+
+        assert actual == expected
+        # The listed walk never sees empty directories; otherwise identical
+        assert listed.events == [e for e in walked.events if e[1].name != 'empty']
+
+    def test_none_from_the_lister_walks_instead(self, repo):
+        class _NoAnswer(FileLister):
+            def list_files(self, root_dir):
+                return None
+
+        expected = DirectoryWalker(OsFilesystemQuery()).collect_matching_files(repo, _Recorder())
+        actual = ListedFilesWalker(OsFilesystemQuery(), _NoAnswer()).collect_matching_files(repo, _Recorder())
+        assert actual == expected
+
+
+@requires_git
+class TestPromptsFromGit:
+    def _contents(self, root, use_git):
+        container = AppContainer(root, use_cache=False, use_git=use_git)
+        return container.generate_prompts.run(root, [], include_tree=False).file_contents
+
+    def test_git_rules_replace_gitignore_evaluation(self, repo):
+        AppContainer(repo, use_cache=False).initialize_project.run([])
+        (repo / 'src' / '.gptignore').write_text('pkg/\n')
+
+        from_git = self._contents(repo, use_git=True)
+        walked = self._contents(repo, use_git=False)
+
+        assert 'tracked but ignored' in from_git and 'tracked but ignored' not in walked
+        assert 'mod.py' not in from_git          # .gptignore still applies
+        assert from_git.replace('### ' + str(repo / 'tracked.log') + '\ntracked but ignored\n\n\n', '') == walked
+
+    def test_work_dir_reached_through_a_symlink(self, repo, tmp_path_factory, capsys):
+        AppContainer(repo, use_cache=False).initialize_project.run([])
+        link = tmp_path_factory.mktemp('links') / 'link'
+        link.symlink_to(repo, target_is_directory=True)
+        argv = ['autogpt', 'prompt', '--root_dir', str(link), '--prompt_dir', str(link / 'src'),
+                '--content', '--git_index', '--no_cache', '--stdout']
+        with patch('sys.argv', argv):
+            assert main() == 0
+        assert f"### {repo / 'src' / 'main.py'}\nprint(1)\n" in capsys.readouterr().out
+
+    def test_outside_git_falls_back_to_walking(self, tmp_path):
+        root = tmp_path.resolve()
+        AppContainer(root, use_cache=False).initialize_project.run([])
+        (root / 'a.py').write_text('a\n')
+        assert self._contents(root, use_git=True) == self._contents(root, use_git=False)
@@ -0,0 +1,247 @@
+"""
+Test the compiled ignore/include-only matchers used by the visitors.
+
+Uses real ignore files in temp directories — the visitors read from disk.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.plugins.ignore_plugin.Ignore_match import IgnoreMatch
+from gpt_automation.plugins.ignore_plugin.ignore_visitor import IgnoreVisitor
+from gpt_automation.plugins.include_only_plugin.includeonly_visitor import IncludeOnlyVisitor
+from gpt_automation.plugins.ignore_plugin.third_party.gitignore_parser2.parser2 import GitIgnoreParser
+
+
+class TestIgnoreVisitorCompiledStack:
+
+    def test_stack_holds_compiled_matchers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.gitignore').write_text('*.log\nbuild/\n')
+            (root / 'src').mkdir()
+
+            visitor = IgnoreVisitor(str(root), str(root / 'src'), ignore_filenames=['.gitignore'])
+
+            top, sub = visitor.ignore_patterns_stack
+            assert isinstance(top, IgnoreMatch)
+            assert sub is None  # src/ has no ignore file
+
+    def test_patterns_are_parsed_once_per_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.gitignore').write_text('*.log\nbuild/\n')
+            visitor = IgnoreVisitor(str(root), str(root), ignore_filenames=['.gitignore'])
+
+            with patch.object(GitIgnoreParser, 'parse_patterns') as parse:
+                for i in range(50):
+                    visitor.should_visit_file(str(root / f'file{i}.log'))
+                    visitor.should_visit_subdirectory(str(root / f'dir{i}'))
+
+            parse.assert_not_called()
+
+    def test_decisions_match_patterns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.gitignore').write_text('*.log\nbuild/\n')
+            visitor = IgnoreVisitor(str(root), str(root), ignore_filenames=['.gitignore'])
+
+            assert not visitor.should_visit_file(str(root / 'app.log'))
+            assert not visitor.should_visit_subdirectory(str(root / 'build'))
+            assert visitor.should_visit_file(str(root / 'app.py'))
+            assert visitor.should_visit_subdirectory(str(root / 'src'))
+
+    def test_sibling_with_shared_prefix_is_not_matched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'pkg').mkdir()
+            match = IgnoreMatch([(str(root / 'pkg'), '*.txt')])
+
+            assert match.match(str(root / 'pkg' / 'a.txt'))
+            assert not match.match(str(root / 'pkg2' / 'a.txt'))
+
+
+class TestIncludeOnlyVisitorCompiledStack:
+
+    def test_only_listed_paths_are_included(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.gptincludeonly').write_text('*.py\n')
+            visitor = IncludeOnlyVisitor(str(root), str(root))
+
+            assert all(isinstance(m, IgnoreMatch) for m in visitor.include_only_patterns_stack)
+            assert visitor.should_visit_file(str(root / 'main.py'))
+            assert not visitor.should_visit_file(str(root / 'notes.md'))
+
+    def test_nested_directories_inherit_the_enclosing_patterns(self):
+        from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+        from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+        from gpt_automation.infrastructure.plugins.visitor_adapter import IncludeOnlyVisitorFilter
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'src' / 'pkg').mkdir(parents=True)
+            (root / 'src' / 'docs').mkdir()
+            for rel in ('top.py', 'top.md', 'src/a.py', 'src/a.md', 'src/pkg/b.py', 'src/pkg/b.md',
+                        'src/docs/c.py', 'src/docs/c.md'):
+                (root / rel).write_text('x')
+            (root / '.gptincludeonly').write_text('*.py\nsrc\npkg\ndocs\n')
+            (root / 'src' / 'docs' / '.gptincludeonly').write_text('*.md\n')
+
+            file_filter = IncludeOnlyVisitorFilter(root, root, ['.gptincludeonly'], [])
+            files = DirectoryWalker(OsFilesystemQuery()).collect_matching_files(root, file_filter)
+
+            # src/ and src/pkg/ have no include file: the root's *.py still applies there,
+            # while src/docs/ has its own patterns
+            assert [p.relative_to(root).as_posix() for p in files] == \
+                ['src/a.py', 'src/docs/c.md', 'src/pkg/b.py', 'top.py']
+
+
+# ── differential: combined regex engine vs. gitignore_parser reference ───────
+
+_DIFF_PATTERNS = [
+    '*.log', 'build/', '/dist', 'docs/**/*.tmp', '**/cache', 'a?c.txt',
+    '[abc]*.py', '!keep.log', 'node_modules/', '!build/keep/', 'src/*.bak',
+    '# comment', '', 'out/**', '\\#literal', '*.py[cod]', '!important.pyc',
+    '*.egg-info/', 'foo.bar/', '.env', 'tmp_*.c',
+]
+
+_DIFF_RELATIVE_PATHS = [
+    'app.log', 'keep.log', 'build', 'build/x.o', 'build/keep', 'build/keep/',
+    'dist', 'sub/dist', 'docs/a/b/c.tmp', 'docs/c.tmp', 'x/cache', 'cache/y',
+    'abc.txt', 'a/abc.txt', 'b_main.py', 'z_main.py', 'node_modules/pkg/index.js',
+    'src/file.bak', 'src/deep/file.bak', 'out/any/thing', '#literal',
+    'mod.pyc', 'important.pyc', 'pkg/important.pyc', 'readme.md', 'sub/',
+    'x.egg-info/PKG-INFO', 'x.egg-info', 'foo.bar', 'a/foo.bar/b', 'a/.env',
+    'tmp_1.c', 'd/tmp_.c', 'app.log\n',
+]
+
+
+def _reference_match(base: str, patterns: list[str], file_path: str) -> bool:
+    """The pre-compilation decision: IgnoreRule.match via any()/handle_negation."""
+    from gitignore_parser import rule_from_pattern, handle_negation, _normalize_path
+
+    base_path = _normalize_path(base)
+    rules = [r for r in (rule_from_pattern(p, base_path=base_path) for p in patterns) if r]
+    if not any(r.negation for r in rules):
+        return any(r.match(file_path) for r in rules)
+    return handle_negation(file_path, rules)
+
+
+class TestCombinedRegexEngine:
+
+    def _assert_same(self, base: str, patterns: list[str]) -> None:
+        parser = GitIgnoreParser(base, patterns)
+        for rel in _DIFF_RELATIVE_PATHS:
+            path = f"{base}/{rel}"
+            assert parser.match(path) == _reference_match(base, patterns, path), (patterns, rel)
+
+    def test_all_patterns_with_negations(self):
+        self._assert_same('/project', _DIFF_PATTERNS)
+
+    def test_positive_patterns_only(self):
+        self._assert_same('/project', [p for p in _DIFF_PATTERNS if not p.startswith('!')])
+
+    def test_random_subsets(self):
+        import random
+
+        rng = random.Random(1234)
+        for _ in range(100):
+            patterns = rng.sample(_DIFF_PATTERNS, rng.randint(1, len(_DIFF_PATTERNS)))
+            self._assert_same('/project/sub', patterns)
+
+    def test_matching_rule_names_the_positive_rule(self):
+        parser = GitIgnoreParser('/project', ['*.md', '*.log'])
+        assert parser.matching_rule('app.log').pattern == '*.log'
+        assert parser.matching_rule('app.py') is None
+
+    def test_ignore_match_keeps_per_pattern_semantics(self):
+        """IgnoreMatch treats patterns independently, so negations never match."""
+        pairs = [('/project', p) for p in _DIFF_PATTERNS]
+        match = IgnoreMatch(pairs)
+        for rel in _DIFF_RELATIVE_PATHS:
+            path = f"/project/{rel}"
+            expected = any(_reference_match(base, [p], path) for base, p in pairs)
+            assert match.match(path) == expected, rel
+
+
+# ── nested ignore files driven by walker events ─────────────────────────────
+
+class TestNestedIgnoreFiles:
+
+    def _walk(self, root: Path, work_dir: Path, file_filter, listed: list):
+        from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+        from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+
+        class RecordingFilesystem(OsFilesystemQuery):
+            def list_directory(self, dir_path):
+                listed.append(Path(dir_path))
+                return super().list_directory(dir_path)
+
+        return DirectoryWalker(RecordingFilesystem()).collect_matching_files(work_dir, file_filter)
+
+    def test_ignore_file_below_work_dir_prunes_subtree(self):
+        from gpt_automation.infrastructure.plugins.visitor_adapter import IgnoreVisitorFilter
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            pkg = root / 'pkg'
+            (pkg / 'node_modules' / 'dep').mkdir(parents=True)
+            (pkg / 'node_modules' / 'dep' / 'index.js').write_text('x')
+            (pkg / 'main.py').write_text('x')
+            (pkg / '.gitignore').write_text('node_modules/\n')
+
+            listed = []
+            file_filter = IgnoreVisitorFilter(root, root, ['.gitignore'], [])
+            files = self._walk(root, root, file_filter, listed)
+
+            assert pkg / 'main.py' in files
+            assert not any('node_modules' in p.parts for p in files)
+            assert pkg / 'node_modules' not in listed
+
+    def test_each_directory_ignore_files_read_once(self):
+        from gpt_automation.infrastructure.plugins.visitor_adapter import IgnoreVisitorFilter
+        from gpt_automation.plugins.ignore_plugin import ignore_visitor
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for name in ('a', 'b', 'a/c'):
+                (root / name).mkdir()
+                (root / name / 'f.txt').write_text('x')
+
+            original = ignore_visitor.collect_patterns_from_ignore_files
+            with patch.object(ignore_visitor, 'collect_patterns_from_ignore_files',
+                              side_effect=original) as collect:
+                file_filter = IgnoreVisitorFilter(root, root, ['.gitignore'], [])
+                self._walk(root, root, file_filter, [])
+
+            read_dirs = sorted(call.args[0] for call in collect.call_args_list)
+            assert read_dirs == sorted(str(root / d) if d else str(root) for d in ('', 'a', 'b', 'a/c'))
+            assert len(file_filter._visitor.ignore_patterns_stack) == 1
+
+    def test_parallel_walker_matches_serial_with_nested_ignores(self):
+        from gpt_automation.domain.traversal.directory_reader import DirectoryWalker
+        from gpt_automation.domain.traversal.parallel_walker import ParallelDirectoryWalker
+        from gpt_automation.infrastructure.filesystem.os_filesystem_query import OsFilesystemQuery
+        from gpt_automation.infrastructure.plugins.visitor_adapter import IgnoreVisitorFilter
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.gitignore').write_text('*.log\n')
+            for pkg in ('a', 'b', 'c'):
+                (root / pkg / 'build' / 'out').mkdir(parents=True)
+                (root / pkg / 'build' / 'out' / 'x.o').write_text('x')
+                (root / pkg / 'keep.py').write_text('x')
+                (root / pkg / 'debug.log').write_text('x')
+            (root / 'b' / '.gitignore').write_text('build/\n')
+
+            def walk(walker):
+                return walker.collect_matching_files(root, IgnoreVisitorFilter(root, root, ['.gitignore'], []))
+
+            serial = walk(DirectoryWalker(OsFilesystemQuery()))
+            parallel = walk(ParallelDirectoryWalker(OsFilesystemQuery(), max_workers=3))
+
+            assert parallel == serial
+            assert root / 'b' / 'build' / 'out' / 'x.o' not in parallel
+            assert root / 'a' / 'build' / 'out' / 'x.o' in parallel
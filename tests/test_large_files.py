@@ -0,0 +1,82 @@
+"""
+Test the large-file policy: files above the threshold are shown as a head
+and a tail excerpt, decided from the walk's stat data.
+"""
+
+import os
+from unittest.mock import patch
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.config.settings_loader import SettingsWriter
+from gpt_automation.infrastructure.config.settings_model import ContentReadingSettings, ProjectSettings
+
+
+def _log_lines(count: int) -> bytes:
+    return b''.join(b'line %05d of the log\n' % i for i in range(count))
+
+
+class TestExcerpts:
+    def test_head_and_tail_around_an_elision_marker(self, tmp_path):
+        log = tmp_path / 'big.log'
+        data = _log_lines(5000)   # 22 bytes per line
+        log.write_bytes(data)
+        reader = FileContentReader(excerpt_bytes=100)
+
+        content = reader.read_content(log, os.stat(log), large_file_bytes=1000)
+
+        head, rest = content.text.split('[... ', 1)
+        marker, tail = rest.split(' ...]\n', 1)
+        assert head.splitlines() == [f'line {i:05d} of the log' for i in (0, 1, 2, 3)]
+        assert tail.splitlines() == [f'line {i:05d} of the log' for i in (4996, 4997, 4998, 4999)]
+        assert marker == f'{len(data) - 8 * 22} bytes elided'
+        assert reader.stats['excerpted_files'] == 1
+        assert reader.stats['excerpt_bytes_elided'] == len(data) - 8 * 22
+
+    def test_threshold_decision_uses_the_given_stat(self, tmp_path):
+        src = tmp_path / 'small.txt'
+        src.write_text('short\n')
+        st = os.stat(src)
+        with patch('gpt_automation.application.content_reader.os.stat', side_effect=AssertionError("stat again")):
+            assert FileContentReader().read_content(src, st, large_file_bytes=1000).text == 'short\n'
+
+    def test_files_at_or_below_the_threshold_are_read_in_full(self, tmp_path):
+        src = tmp_path / 'edge.txt'
+        src.write_bytes(_log_lines(10))
+        content = FileContentReader(excerpt_bytes=16).read_content(src, large_file_bytes=220)
+        assert content.text == _log_lines(10).decode()
+
+    def test_files_the_excerpts_would_cover_are_read_in_full(self, tmp_path):
+        src = tmp_path / 'medium.log'
+        data = _log_lines(323)   # 7106 bytes: above the threshold, below two excerpts
+        src.write_bytes(data)
+        reader = FileContentReader(excerpt_bytes=16 * 1024)
+
+        content = reader.read_content(src, os.stat(src), large_file_bytes=1000)
+
+        assert content.text == data.decode()
+        assert reader.stats['excerpted_files'] == 0
+        assert reader.estimated_tokens(src, os.stat(src), large_file_bytes=1000) == \
+            reader.estimated_tokens(src, os.stat(src))
+
+    def test_binary_files_stay_placeholders(self, tmp_path):
+        blob = tmp_path / 'blob.bin'
+        blob.write_bytes(b'\0' * 5000)
+        assert FileContentReader(excerpt_bytes=100).read_content(blob, large_file_bytes=1000).encoding == 'binary'
+
+
+def test_profiles_pick_the_threshold(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    settings = ProjectSettings.defaults()
+    settings.content_reading = ContentReadingSettings(
+        large_file_bytes=0, excerpt_bytes=1024, large_file_bytes_by_profile={'brief': 4096},
+    )
+    SettingsWriter(root / '.gpt' / 'settings' / 'base_settings.json').write(settings)
+    (root / 'app.log').write_bytes(_log_lines(1000))
+
+    full = AppContainer(root, use_cache=False).generate_prompts.run(root, [], include_tree=False)
+    brief = AppContainer(root, use_cache=False).generate_prompts.run(root, ['brief'], include_tree=False)
+
+    assert 'bytes elided' not in full.file_contents and 'line 00500' in full.file_contents
+    assert 'bytes elided' in brief.file_contents and 'line 00500' not in brief.file_contents
@@ -0,0 +1,102 @@
+"""
+Test minify mode: comments and redundant whitespace removed without
+changing what the code means, cached by content hash, with stats.
+"""
+
+import ast
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.minifier import ContentMinifier
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.minify import minify, minify_python
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, EntryKind
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent
+from gpt_automation.infrastructure.output.sinks import BufferSink
+
+_SOURCE = '''#!/usr/bin/env python
+# Module comment
+
+
+import os  # trailing comment
+x = "# not a comment"   \n\
+s = """keep   \n\
+   # inside the string
+
+
+end"""  # after the string
+def f():
+    # only a comment
+    return 1   \n\
+\n\
+\n\
+'''
+
+
+class TestMinify:
+    def test_python_comments_and_whitespace(self):
+        assert minify('m.py', _SOURCE) == (
+            'import os\n'
+            'x = "# not a comment"\n'
+            's = """keep   \n'
+            '   # inside the string\n'
+            '\n'
+            '\n'
+            'end"""\n'
+            'def f():\n'
+            '    return 1\n'
+        )
+
+    def test_python_meaning_is_unchanged(self):
+        with open(Path(__file__).parent.parent / 'gpt_automation' / 'domain' / 'minify.py') as f:
+            source = f.read()
+        assert ast.dump(ast.parse(minify('minify.py', source))) == ast.dump(ast.parse(source))
+
+    def test_other_files_get_the_whitespace_pass(self):
+        assert minify('notes.md', '\n\n# Title  \n\n\n\ntext\t\n\n') == '# Title\n\ntext\n'
+        assert minify_python('def broken(:\n    """\n') is None
+        assert minify('broken.py', 'def broken(:   \n\n\n  # x\n') == 'def broken(:\n\n  # x\n'
+
+
+def test_results_are_cached_by_content_hash(tmp_path):
+    db = tmp_path / 'contents.sqlite'
+    files = [(DirectoryEntry(Path('a.py'), EntryKind.FILE), FileContent(_SOURCE, 'utf-8', 'h', 60))]
+    first = ContentMinifier(ContentCache(db, 1 << 20), processes=1)
+    [(_, content)] = first.transformed(files)
+    first._cache.save()
+    assert first.stats['computed_files'] == 1
+    assert first.stats['bytes_saved'] == len(_SOURCE) - len(content.text)
+
+    again = ContentMinifier(ContentCache(db, 1 << 20), processes=2)
+    assert list(again.transformed(files)) == [(files[0][0], content)]
+    assert again.stats['computed_files'] == 0 and again.stats['cached_files'] == 1
+
+
+def test_minified_prompt(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    (root / 'm.py').write_text(_SOURCE)
+    old = time.time() - 3600
+    os.utime(root / 'm.py', (old, old))
+
+    sink = BufferSink()
+    AppContainer(root).generate_prompts.write(sink, root, None, [], minify=True)
+
+    assert 'import os\nx = ' in sink.getvalue()
+    assert 'comment' not in sink.getvalue().replace('# not a comment', '')
+
+
+def test_minify_log_counts_files_kept_as_they_are(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    (root / 'm.py').write_text(_SOURCE)
+    (root / 'tight.py').write_text('x = 1\n')   # Nothing to remove
+
+    generate_prompts = AppContainer(root).generate_prompts
+    with patch.object(generate_prompts, '_logger') as logger:
+        generate_prompts.write(BufferSink(), root, None, [], minify=True)
+
+    logged = [call.args[0] for call in logger.info.call_args_list]
+    assert any(line.startswith('Minified 1 of 2 files (2 processed, 0 from cache;') for line in logged), logged
@@ -0,0 +1,61 @@
+"""
+Test OsFilesystemQuery against real temp directories.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from gpt_automation.domain.traversal.directory_reader import EntryKind
+from gpt_automation.infrastructure.filesystem.os_filesystem_query import (
+    OsFilesystemQuery,
+    FilesystemAccessError,
+)
+
+
+@pytest.fixture
+def tree():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'sub').mkdir()
+        (root / 'file.txt').write_text('hello')
+        if hasattr(os, 'symlink'):
+            try:
+                os.symlink(root / 'sub', root / 'link_to_sub')
+                os.symlink(root / 'missing', root / 'broken')
+            except OSError:
+                pass  # Symlinks not permitted (e.g. unprivileged Windows)
+        yield root
+
+
+class TestScanDirectory:
+
+    def test_entries_are_typed(self, tree):
+        kinds = {e.path.name: e.kind for e in OsFilesystemQuery().scan_directory(tree)}
+
+        assert kinds['sub'] == EntryKind.DIRECTORY
+        assert kinds['file.txt'] == EntryKind.FILE
+        if 'link_to_sub' in kinds:
+            assert kinds['link_to_sub'] == EntryKind.DIRECTORY  # follows symlinks like is_dir
+            assert kinds['broken'] == EntryKind.OTHER
+
+    def test_kinds_agree_with_is_file_and_is_directory(self, tree):
+        fs = OsFilesystemQuery()
+        for entry in fs.scan_directory(tree):
+            assert entry.is_file == fs.is_file(entry.path)
+            assert entry.is_directory == fs.is_directory(entry.path)
+
+    def test_stat_only_when_requested(self, tree):
+        fs = OsFilesystemQuery()
+        plain = {e.path.name: e for e in fs.scan_directory(tree)}
+        stated = {e.path.name: e for e in fs.scan_directory(tree, with_stat=True)}
+
+        assert plain['file.txt'].stat is None
+        assert stated['file.txt'].stat.st_size == 5
+
+    def test_missing_directory_raises_os_error(self, tree):
+        with pytest.raises(FilesystemAccessError) as info:
+            OsFilesystemQuery().scan_directory(tree / 'nope')
+        assert isinstance(info.value, OSError)
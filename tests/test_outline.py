@@ -0,0 +1,141 @@
+"""
+Test outline mode: Python modules reduced to classes, signatures and first
+docstring lines, parsed on a process pool and cached by content hash.
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.outlines import PythonOutliner
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.outline import python_outline
+from gpt_automation.domain.traversal.directory_reader import DirectoryEntry, EntryKind
+from gpt_automation.infrastructure.cache.content_cache import ContentCache, FileContent
+from gpt_automation.infrastructure.output.sinks import BufferSink
+
+_MODULE = '''"""Shapes.
+
+More detail.
+"""
+import math
+
+RATIO = 2
+
+
+@dataclass(frozen=True)
+class Circle(Shape, metaclass=Meta):
+    """A circle."""
+    radius: float
+
+    def area(self) -> float:
+        return math.pi * self.radius ** 2
+
+    class Unit:
+        pass
+
+
+async def fetch(url: str, *, retries: int = 3) -> bytes:
+    """Download url.
+
+    Retries on errors.
+    """
+    def helper():
+        pass
+    return b''
+'''
+
+
+def _content(text: str, content_hash: str = 'h') -> FileContent:
+    return FileContent(text, 'utf-8', content_hash, len(text))
+
+
+def _outline(outliner: PythonOutliner, files: dict[str, FileContent]) -> dict[str, str]:
+    pairs = ((DirectoryEntry(Path(name), EntryKind.FILE), content) for name, content in files.items())
+    return {str(entry.path): content.text for entry, content in outliner.transformed(pairs)}
+
+
+class TestPythonOutline:
+    def test_signatures_and_first_docstring_lines(self):
+        assert python_outline(_MODULE) == (
+            '"""Shapes."""\n'
+            '\n'
+            '@dataclass(frozen=True)\n'
+            'class Circle(Shape, metaclass=Meta):\n'
+            '    """A circle."""\n'
+            '    def area(self) -> float: ...\n'
+            '    class Unit: ...\n'
+            '\n'
+            'async def fetch(url: str, *, retries: int=3) -> bytes:\n'
+            '    """Download url."""\n'
+        )
+
+    def test_unparsable_source_gives_none(self):
+        assert python_outline('def broken(:\n') is None
+        assert python_outline('x = 1\n') == ''
+
+
+class TestOutliner:
+    def test_only_python_files_are_outlined(self):
+        outlined = _outline(PythonOutliner(processes=1), {
+            'a.py': _content('def f(x): return x\n'),
+            'b.txt': _content('def f(x): return x\n'),
+            'c.py': _content('def broken(:\n'),
+            'd.py': FileContent('[Binary file, 10 bytes, not shown]', 'binary', '', 8),
+        })
+        assert outlined == {
+            'a.py': 'def f(x): ...\n',
+            'b.txt': 'def f(x): return x\n',
+            'c.py': 'def broken(:\n',
+            'd.py': '[Binary file, 10 bytes, not shown]',
+        }
+
+    def test_process_pool_keeps_the_order(self):
+        files = {f'm{i}.py': _content(f'def f{i}(): pass\n', f'h{i}') for i in range(20)}
+        outliner = PythonOutliner(processes=2)
+        outlined = _outline(outliner, files)
+        assert list(outlined) == list(files)
+        assert outlined['m7.py'] == 'def f7(): ...\n'
+        assert outliner.stats['computed_files'] == 20
+
+    def test_cached_outlines_are_not_parsed_again(self, tmp_path):
+        db = tmp_path / 'contents.sqlite'
+        first = PythonOutliner(ContentCache(db, 1 << 20), processes=1)
+        _outline(first, {'a.py': _content(_MODULE, 'same')})
+        first._cache.save()
+
+        again = PythonOutliner(ContentCache(db, 1 << 20), processes=1)
+        assert _outline(again, {'moved.py': _content(_MODULE, 'same')}) == {'moved.py': python_outline(_MODULE)}
+        assert again.stats['computed_files'] == 0 and again.stats['cached_files'] == 1
+
+
+def test_outline_prompt(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    (root / 'shapes.py').write_text(_MODULE)
+    (root / 'notes.md').write_text('# Notes\n')
+    old = time.time() - 3600
+    for name in ('shapes.py', 'notes.md'):
+        os.utime(root / name, (old, old))
+
+    sink = BufferSink()
+    AppContainer(root).generate_prompts.write(sink, root, None, [], outline=True)
+
+    assert 'def area(self) -> float: ...' in sink.getvalue()
+    assert 'math.pi' not in sink.getvalue()
+    assert '# Notes' in sink.getvalue()
+
+
+def test_outline_log_counts_files_kept_as_they_are(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    (root / 'shapes.py').write_text(_MODULE)
+    (root / 'stub.py').write_text('def f(): ...\n')   # Its outline is no shorter
+
+    generate_prompts = AppContainer(root).generate_prompts
+    with patch.object(generate_prompts, '_logger') as logger:
+        generate_prompts.write(BufferSink(), root, None, [], outline=True)
+
+    logged = [call.args[0] for call in logger.info.call_args_list]
+    assert any(line.startswith('Outlined 1 of 2 files (2 parsed, 0 from cache;') for line in logged), logged
@@ -0,0 +1,153 @@
+"""
+Test the output sinks and streaming a prompt through them.
+"""
+
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.output.sinks import (
+    BufferSink, ClipboardSink, CommandSink, FileSink, PartFiles, SplitSink, StreamSink,
+)
+
+
+class TestSinks:
+    def test_stream_sink_writes_through(self):
+        stream = io.StringIO()
+        with StreamSink(stream) as sink:
+            sink.write('a')
+            sink.write('')
+            sink.write('bc')
+        assert stream.getvalue() == 'abc' and sink.written == 3
+
+    def test_file_sink_replaces_the_file_on_success_only(self, tmp_path):
+        target = tmp_path / 'out' / 'prompt.txt'
+        with FileSink(target) as sink:
+            sink.write('first')
+            assert not target.exists()  # Nothing visible until close
+        assert target.read_text() == 'first'
+
+        with pytest.raises(RuntimeError):
+            with FileSink(target) as sink:
+                sink.write('partial')
+                raise RuntimeError("walk failed")
+        assert target.read_text() == 'first'
+        assert os.listdir(target.parent) == ['prompt.txt']
+
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="needs named pipes")
+    def test_file_sink_writes_a_named_pipe_directly(self, tmp_path):
+        fifo = tmp_path / 'pipe'
+        os.mkfifo(fifo)
+        reader = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            with FileSink(fifo) as sink:
+                sink.write('through the pipe')
+            assert os.read(reader, 100) == b'through the pipe'
+        finally:
+            os.close(reader)
+
+    def test_clipboard_sink_copies_once_on_close(self):
+        with patch('pyperclip.copy') as copy:
+            with ClipboardSink() as sink:
+                sink.write('a')
+                sink.write('b')
+            copy.assert_called_once_with('ab')
+
+    def test_buffer_sink(self):
+        sink = BufferSink()
+        sink.write('x')
+        assert sink.getvalue() == 'x'
+
+
+class TestSplitSink:
+    def _split(self, **limits):
+        parts = []
+
+        def open_part(number):
+            assert all(part.closed for part in parts), "previous part still open"
+            part = BufferSink()
+            part.closed = False
+            part.close = lambda: setattr(part, 'closed', True)
+            parts.append(part)
+            return part
+
+        return SplitSink(open_part, **limits), parts
+
+    def test_blocks_stay_whole_and_parts_open_one_at_a_time(self):
+        sink, parts = self._split(max_bytes=20)
+        with sink:
+            sink.write_block('tree\n')
+            sink.write_block('### a\n', 'a' * 8)
+            sink.write_block('### b\n', 'b' * 8, separator='\n\n')
+        assert [part.getvalue() for part in parts] == ['tree\n### a\naaaaaaaa', '### b\nbbbbbbbb']
+        assert sink.parts == 2 and parts[-1].closed
+
+    def test_block_larger_than_a_part_is_cut_at_lines(self):
+        sink, parts = self._split(max_bytes=10)
+        with sink:
+            sink.write_block('### a\n', 'line1\nline2\nline3\n')
+        assert [part.getvalue() for part in parts] == ['### a\n', 'line1\n', 'line2\n', 'line3\n']
+
+    def test_token_limit(self):
+        sink, parts = self._split(max_tokens=4)
+        with sink:
+            sink.write_block('x = 1\n')
+            sink.write_block('y = 2\n', separator='\n\n')
+        assert [part.getvalue() for part in parts] == ['x = 1\n', 'y = 2\n']
+
+    def test_part_files_replace_an_earlier_run(self, tmp_path):
+        out = tmp_path / 'out'
+        for limit in (4, 8):
+            with SplitSink(PartFiles(out), max_bytes=limit) as sink:
+                for name in 'abcd':
+                    sink.write_block(f'{name}\n', name * 2)
+        assert sorted(os.listdir(out)) == ['.gitignore', 'part-001.txt', 'part-002.txt']
+        assert (out / 'part-001.txt').read_text() == 'a\naab\nbb'
+
+    def test_command_sink_pipes_each_part(self, tmp_path):
+        sink = SplitSink(
+            lambda n: CommandSink(f'cat > {tmp_path}/part-$AUTOGPT_PART', env={'AUTOGPT_PART': str(n)}),
+            max_bytes=3,
+        )
+        with sink:
+            sink.write_block('ab\n')
+            sink.write_block('cd\n')
+        assert (tmp_path / 'part-1').read_text() == 'ab\n'
+        assert (tmp_path / 'part-2').read_text() == 'cd\n'
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path.resolve()
+    AppContainer(root, use_cache=False).initialize_project.run([])
+    (root / 'pkg').mkdir()
+    (root / 'pkg' / 'a.py').write_text('a = 1\n')
+    (root / 'pkg' / 'b.py').write_text('b = 2\n')
+    return root
+
+
+class TestStreamingPrompts:
+    def _write(self, root, tree_profiles, content_profiles) -> str:
+        sink = BufferSink()
+        AppContainer(root, use_cache=False).generate_prompts.write(sink, root, tree_profiles, content_profiles)
+        return sink.getvalue()
+
+    def test_matches_the_rendered_blocks(self, project):
+        result = AppContainer(project, use_cache=False).generate_prompts.run(project, [])
+        assert self._write(project, [], []) == result.directory_tree + '\n\n' + result.file_contents
+        assert self._write(project, None, []) == result.file_contents
+        assert self._write(project, [], None) == result.directory_tree
+
+    def test_blocks_reach_the_sink_one_at_a_time(self, project):
+        chunks = []
+
+        class _Recording(BufferSink):
+            def _write(self, text):
+                chunks.append(text)
+
+        AppContainer(project, use_cache=False).generate_prompts.write(_Recording(), project, None, [])
+        assert chunks == [f'### {project / "pkg" / "a.py"}\n', 'a = 1\n',
+                          f'\n\n### {project / "pkg" / "b.py"}\n', 'b = 2\n']
@@ -0,0 +1,78 @@
+"""
+Test read_in_order: concurrent reads come back in input order, and read-ahead
+stays within its file-count and byte caps.
+"""
+
+import random
+import threading
+import time
+from pathlib import Path
+
+from gpt_automation.application.parallel_reads import read_in_order
+
+
+class _SlowReader:
+    """Sleeps a random moment per read and tracks how far reads ran ahead."""
+
+    def __init__(self):
+        self.started: list[Path] = []
+        self._lock = threading.Lock()
+
+    def read(self, path: Path) -> str:
+        with self._lock:
+            self.started.append(path)
+        time.sleep(random.uniform(0, 0.005))
+        return f"content of {path.name}"
+
+
+def _files(tmp_path: Path, count: int, size: int = 10) -> list[Path]:
+    files = []
+    for i in range(count):
+        path = tmp_path / f'f{i:03}.txt'
+        path.write_bytes(b'x' * size)
+        files.append(path)
+    return files
+
+
+def test_results_keep_input_order(tmp_path):
+    files = _files(tmp_path, 60)
+    result = list(read_in_order(_SlowReader().read, iter(files), threads=8, max_buffered_bytes=1 << 20))
+    assert [path for path, _ in result] == files
+    assert all(content == f"content of {path.name}" for path, content in result)
+
+
+def test_serial_mode_reads_on_the_calling_thread(tmp_path):
+    files = _files(tmp_path, 3)
+    threads = set()
+
+    def read(path):
+        threads.add(threading.get_ident())
+        return path.name
+
+    assert [c for _, c in read_in_order(read, files, threads=1, max_buffered_bytes=1)] == ['f000.txt', 'f001.txt', 'f002.txt']
+    assert threads == {threading.get_ident()}
+
+
+def test_byte_cap_limits_read_ahead(tmp_path):
+    files = _files(tmp_path, 20, size=1000)
+    reader = _SlowReader()
+    results = read_in_order(reader.read, files, threads=8, max_buffered_bytes=3000)
+
+    for consumed, (path, _) in enumerate(results, start=1):
+        # At most 3000 bytes (three files) in flight beyond what was consumed
+        assert len(reader.started) <= consumed + 2
+    assert len(reader.started) == 20
+
+
+def test_a_file_larger_than_the_cap_is_still_read(tmp_path):
+    [big] = _files(tmp_path, 1, size=5000)
+    assert list(read_in_order(lambda p: 'big', [big], threads=4, max_buffered_bytes=10)) == [(big, 'big')]
+
+
+def test_closing_early_stops_reading(tmp_path):
+    files = _files(tmp_path, 200)
+    reader = _SlowReader()
+    results = read_in_order(reader.read, files, threads=2, max_buffered_bytes=1 << 20)
+    next(results)
+    results.close()
+    assert len(reader.started) <= 2 * 4 + 1
@@ -6,8 +6,10 @@ import json
 import tempfile
 from pathlib import Path
 
-from gpt_automation.infrastructure.config.settings_model import ProjectSettings, BuiltinPlugin
-from gpt_automation.infrastructure.config.settings_loader import SettingsReader, SettingsWriter
+import pytest
+
+from gpt_automation.infrastructure.config.settings_model import ProjectSettings, BuiltinPlugin, ContentReadingSettings
+from gpt_automation.infrastructure.config.settings_loader import SettingsReader, SettingsWriter, SettingsParseError
 
 
 class TestProjectSettings:
@@ -67,3 +69,62 @@ class TestSettingsRoundtrip:
         reader = SettingsReader(existing)
         s = reader.read()
         assert isinstance(s, ProjectSettings)
+
+
+class TestContentReadingSettings:
+    def _read(self, tmpdir, data) -> ProjectSettings:
+        f = Path(tmpdir) / 'settings.json'
+        f.write_text(json.dumps(data))
+        return SettingsReader(f).read()
+
+    def test_missing_section_uses_defaults(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert self._read(tmpdir, {'plugins': []}).content_reading == ContentReadingSettings()
+
+    def test_section_is_parsed_and_round_trips(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            s = self._read(tmpdir, {'plugins': [], 'content_reading': {
+                'threads': 2, 'max_buffered_mb': 5, 'transform_processes': 1,
+            }})
+            assert s.content_reading == ContentReadingSettings(
+                threads=2, max_buffered_bytes=5 * 1024 * 1024, transform_processes=1,
+            )
+
+            f = Path(tmpdir) / 'written.json'
+            SettingsWriter(f).write(s)
+            assert SettingsReader(f).read().content_reading == s.content_reading
+
+    def test_invalid_values_are_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(SettingsParseError):
+                self._read(tmpdir, {'plugins': [], 'content_reading': {'threads': 0}})
+
+    def test_large_file_thresholds_per_profile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            s = self._read(tmpdir, {'plugins': [], 'content_reading': {
+                'large_file_kb': 100, 'excerpt_kb': 4, 'large_file_kb_by_profile': {'logs': 8, 'full': 0},
+            }})
+            reading = s.content_reading
+            assert (reading.large_file_bytes, reading.excerpt_bytes) == (100 * 1024, 4 * 1024)
+            assert reading.large_file_threshold([]) == 100 * 1024
+            assert reading.large_file_threshold(['logs', 'other']) == 8 * 1024
+            assert reading.large_file_threshold(['logs', 'full']) == 0
+
+            f = Path(tmpdir) / 'written.json'
+            SettingsWriter(f).write(s)
+            assert SettingsReader(f).read().content_reading == reading
+
+            with pytest.raises(SettingsParseError):
+                self._read(tmpdir, {'plugins': [], 'content_reading': {'large_file_kb_by_profile': {'x': -1}}})
+
+    def test_deduplication_per_profile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            s = self._read(tmpdir, {'plugins': [], 'content_reading': {
+                'deduplicate': True, 'deduplicate_by_profile': {'full': False, 'lean': True},
+            }})
+            assert s.content_reading.deduplicate_for([]) is True
+            assert s.content_reading.deduplicate_for(['lean']) is True
+            assert s.content_reading.deduplicate_for(['lean', 'full']) is False
+
+            with pytest.raises(SettingsParseError):
+                self._read(tmpdir, {'plugins': [], 'content_reading': {'deduplicate': 'yes'}})
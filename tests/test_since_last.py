@@ -0,0 +1,102 @@
+"""
+Test --since_last prompts: only files added, modified or deleted since the
+previous snapshot are shown, and files with unchanged stat data are not read.
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.cache.prompt_snapshot import PromptSnapshots
+from gpt_automation.infrastructure.output.sinks import BufferSink
+
+
+def _write(path: Path, text: str, age_s: int = 3600) -> None:
+    """Write text with an mtime outside the snapshot's racy window."""
+    path.write_text(text)
+    mtime = time.time() - age_s
+    os.utime(path, (mtime, mtime))
+
+
+def _prompt(root: Path, **kwargs) -> str:
+    sink = BufferSink()
+    AppContainer(root).generate_prompts.write(sink, root, None, [], since_last=True, **kwargs)
+    return sink.getvalue()
+
+
+def _project(tmp_path: Path) -> Path:
+    root = tmp_path.resolve()
+    AppContainer(root).initialize_project.run([])
+    _write(root / 'keep.py', 'keep = 1\n')
+    _write(root / 'edit.py', 'edit = 1\n')
+    _write(root / 'gone.py', 'gone = 1\n')
+    return root
+
+
+def test_first_run_shows_every_file_without_annotations(tmp_path):
+    root = _project(tmp_path)
+    output = _prompt(root)
+    assert f"### {root / 'keep.py'}\nkeep = 1\n" in output
+    assert '(added)' not in output
+
+
+def test_second_run_shows_only_changes(tmp_path):
+    root = _project(tmp_path)
+    _prompt(root)
+    _write(root / 'edit.py', 'edit = 22\n', age_s=60)
+    _write(root / 'new.py', 'new = 1\n')
+    (root / 'gone.py').unlink()
+
+    output = _prompt(root)
+
+    assert 'keep.py' not in output
+    assert f"### {root / 'edit.py'} (modified)\nedit = 22\n" in output
+    assert f"### {root / 'new.py'} (added)\nnew = 1\n" in output
+    assert output.endswith(f"### {root / 'gone.py'} (deleted)\n")
+    assert _prompt(root) == ''
+
+
+def test_unchanged_files_are_not_read(tmp_path):
+    root = _project(tmp_path)
+    _prompt(root)
+    _write(root / 'edit.py', 'edit = 22\n', age_s=60)
+    read = []
+    original = FileContentReader._read_content
+
+    def recording(reader, path, *args):
+        read.append(path.name)
+        return original(reader, path, *args)
+
+    with patch.object(FileContentReader, '_read_content', recording):
+        _prompt(root)
+    assert read == ['edit.py']
+
+
+def test_touched_file_with_same_bytes_is_unchanged(tmp_path):
+    root = _project(tmp_path)
+    _prompt(root)
+    _write(root / 'keep.py', 'keep = 1\n', age_s=60)      # New mtime, same content
+
+    assert _prompt(root) == ''
+    snapshot = PromptSnapshots(root / '.gpt' / 'cache' / 'snapshots').load(root, [])
+    assert snapshot.get(root / 'keep.py').matches(os.stat(root / 'keep.py'))
+
+
+def test_files_left_out_by_the_budget_are_shown_next_time(tmp_path):
+    root = _project(tmp_path)
+    _prompt(root)
+    _write(root / 'edit.py', 'edit = 2\n' + 'word ' * 400, age_s=60)
+
+    assert 'edit.py' not in _prompt(root, max_tokens=50)
+    assert f"### {root / 'edit.py'} (modified)" in _prompt(root)
+
+
+def test_snapshots_are_per_profile_set(tmp_path):
+    root = _project(tmp_path)
+    _prompt(root)
+    sink = BufferSink()
+    AppContainer(root).generate_prompts.write(sink, root, None, ['other'], since_last=True)
+    assert 'keep = 1' in sink.getvalue()
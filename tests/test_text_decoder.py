@@ -0,0 +1,128 @@
+"""
+Test the tiered text decoder behind FileContentReader: cheap tiers settle
+ASCII and UTF-8, detection runs on a sample, and its result is reused.
+Binary files are recognised from their leading block alone.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.infrastructure.filesystem.text_decoder import SNIFF_SIZE, TextDecoder, looks_binary
+
+LATIN = "# Überprüfung der Eingabe, café résumé\nvalue = compute()\n" * 50
+JAPANESE = "入力の検証を行います。日本語のコメントです。\n" * 50
+
+
+def _detect_calls(decoder: TextDecoder, *inputs: tuple[bytes, Path]) -> list[bytes]:
+    """Decode each input, returning the samples chardet was asked about."""
+    import chardet
+    samples = []
+    real = chardet.detect
+
+    def spy(sample):
+        samples.append(sample)
+        return real(sample)
+
+    with patch.object(chardet, 'detect', spy):
+        for raw, path in inputs:
+            decoder.decode(raw, path)
+    return samples
+
+
+class TestTiers:
+    @pytest.mark.parametrize('text', ["plain ascii\n", "naïve café ✓\n"])
+    def test_ascii_and_utf8_skip_detection(self, text):
+        decoder = TextDecoder()
+        assert _detect_calls(decoder, (text.encode('utf-8'), Path('/p/a.py'))) == []
+        assert decoder.decode(text.encode('utf-8'), Path('/p/a.py')) == text
+
+    @pytest.mark.parametrize('encoding', ['utf-8-sig', 'utf-16', 'utf-32'])
+    def test_byte_order_marks(self, encoding):
+        assert TextDecoder().decode("héllo\n".encode(encoding), Path('/p/a.txt')) == "héllo\n"
+
+    def test_legacy_encoding_is_detected(self):
+        assert TextDecoder().decode(JAPANESE.encode('shift_jis'), Path('/p/a.txt')) == JAPANESE
+
+    def test_detection_sees_a_bounded_sample_around_the_first_bad_byte(self):
+        raw = b'x = 1\n' * 20_000 + LATIN.encode('latin-1') * 20
+        decoder = TextDecoder(sample_size=1024)
+        [sample] = _detect_calls(decoder, (raw, Path('/p/a.txt')))
+        assert len(sample) == 1024 and not sample.isascii()
+        assert decoder.decode(raw, Path('/p/b.txt')).endswith(LATIN)
+
+    def test_undetectable_bytes_fall_back_to_utf8_with_replacement(self):
+        with patch('chardet.detect', return_value={'encoding': None, 'confidence': 0.0}):
+            assert TextDecoder().decode(b'ok \xff\xfe\xfd', Path('/p/a.bin')) == 'ok ���'
+
+
+class TestEncodingCache:
+    def test_same_directory_reuses_detection(self):
+        decoder = TextDecoder()
+        raw = LATIN.encode('latin-1')
+        samples = _detect_calls(decoder, (raw, Path('/p/a.txt')), (raw, Path('/p/b.cfg')))
+        assert len(samples) == 1
+        assert decoder.stats['cached'] == 1
+
+    def test_same_extension_reuses_multibyte_detection(self):
+        decoder = TextDecoder()
+        raw = JAPANESE.encode('shift_jis')
+        samples = _detect_calls(decoder, (raw, Path('/p/a.txt')), (raw, Path('/q/b.txt')))
+        assert len(samples) == 1
+
+    def test_single_byte_guess_does_not_spread_by_extension(self):
+        decoder = TextDecoder()
+        decoder.decode(LATIN.encode('latin-1'), Path('/legacy/a.txt'))
+        assert decoder.decode(JAPANESE.encode('shift_jis'), Path('/jp/b.txt')) == JAPANESE
+
+    def test_cached_encoding_that_fails_strictly_is_skipped(self):
+        decoder = TextDecoder()
+        decoder.decode(JAPANESE.encode('shift_jis'), Path('/p/a.txt'))
+        assert decoder.decode(LATIN.encode('latin-1'), Path('/p/b.txt')) == LATIN
+
+
+class TestFileContentReader:
+    def test_reads_files_through_the_decoder(self, tmp_path):
+        (tmp_path / 'legacy.txt').write_bytes(LATIN.encode('latin-1'))
+        (tmp_path / 'empty.txt').write_bytes(b'')
+        reader = FileContentReader()
+        assert reader.read(tmp_path / 'legacy.txt') == LATIN
+        assert reader.read(tmp_path / 'empty.txt') == ''
+        assert reader.read(tmp_path / 'missing.txt').startswith('[Could not read missing.txt')
+
+
+class TestBinarySniffing:
+    @pytest.mark.parametrize('block', [
+        b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR',
+        b'PK\x03\x04\x14\x00\x00\x00\x08\x00',
+        bytes(range(1, 32)) * 10,
+    ])
+    def test_binary_blocks(self, block):
+        assert looks_binary(block)
+
+    @pytest.mark.parametrize('block', [
+        b'',
+        b'def f():\n\treturn 1\r\n\x0c',
+        '\x1b[31mred\x1b[0m caf\xe9'.encode('latin-1'),
+        "héllo".encode('utf-16'),
+    ])
+    def test_text_blocks(self, block):
+        assert not looks_binary(block)
+
+    def test_binary_file_is_summarised_without_a_full_read(self, tmp_path):
+        blob = tmp_path / 'blob.bin'
+        blob.write_bytes(b'\x00' * (SNIFF_SIZE * 4))
+        reader = FileContentReader()
+
+        with patch('chardet.detect') as detect:
+            assert reader.read(blob) == f'[Binary file, {SNIFF_SIZE * 4} bytes, not shown]'
+        detect.assert_not_called()
+        assert reader.stats['binary_files'] == 1
+        assert reader.stats['binary_bytes_skipped'] == SNIFF_SIZE * 3
+
+    def test_text_longer_than_the_sniffed_block_is_read_in_full(self, tmp_path):
+        text = 'line of text\n' * SNIFF_SIZE
+        (tmp_path / 'long.txt').write_text(text)
+        assert FileContentReader().read(tmp_path / 'long.txt') == text
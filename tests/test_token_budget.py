@@ -0,0 +1,99 @@
+"""
+Test token estimates and budgeted prompts: files are chosen by priority,
+files that cannot fit are never read, and the report lists what was left out.
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from gpt_automation.application.content_reader import FileContentReader
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.tokens import estimate_tokens, estimate_tokens_from_size
+from gpt_automation.infrastructure.cache.content_cache import ContentCache
+from gpt_automation.infrastructure.output.sinks import BufferSink
+
+
+def _write(path: Path, text: str, age_s: int = 3600) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    mtime = time.time() - age_s
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestEstimate:
+    def test_empty_text_has_no_tokens(self):
+        assert estimate_tokens('') == 0
+
+    def test_counts_words_symbols_and_lines(self):
+        assert estimate_tokens('x') == 1
+        assert estimate_tokens('x = 1\n') == 4          # x, =, 1, newline
+        assert estimate_tokens('a_very_long_identifier_name') > 1
+
+    def test_errs_on_the_high_side_for_code(self):
+        code = 'def add(a, b):\n    return a + b\n' * 50
+        assert estimate_tokens(code) >= len(code) / 3
+
+    def test_size_estimate_rounds_up(self):
+        assert estimate_tokens_from_size(0) == 0
+        assert estimate_tokens_from_size(7) == 3
+
+
+class TestBudget:
+    def _project(self, tmp_path: Path) -> Path:
+        root = tmp_path.resolve()
+        AppContainer(root).initialize_project.run([])
+        _write(root / 'main.py', 'print(1)\n', age_s=10)
+        _write(root / 'pkg' / 'deep.py', 'x = 2\n', age_s=10)
+        _write(root / 'big.txt', 'word ' * 2000)
+        return root
+
+    def test_files_that_cannot_fit_are_not_read(self, tmp_path):
+        root = self._project(tmp_path)
+        container = AppContainer(root, use_cache=False)
+        read = []
+        original = FileContentReader._read_content
+
+        def recording(reader, path, *args):
+            read.append(path.name)
+            return original(reader, path, *args)
+
+        sink = BufferSink()
+        with patch.object(FileContentReader, '_read_content', recording):
+            report = container.generate_prompts.write(sink, root, [], [], max_tokens=200)
+
+        assert 'big.txt' not in read
+        assert [path.name for path, _ in report.dropped] == ['big.txt']
+        assert report.selected == 2 and report.used <= 200
+        output = sink.getvalue()
+        assert output.startswith('Directory structure:')
+        assert output.index('main.py\nprint(1)') < output.index('deep.py\nx = 2')
+        assert 'word word' not in output
+
+    def test_priority_prefers_shallow_then_recent_files(self, tmp_path):
+        root = tmp_path.resolve()
+        AppContainer(root).initialize_project.run([])
+        text = 'alpha beta gamma delta\n' * 100
+        _write(root / 'old.py', text, age_s=7200)
+        _write(root / 'new.py', text.upper(), age_s=60)
+        _write(root / 'pkg' / 'nested.py', text, age_s=1)
+
+        sink = BufferSink()
+        report = AppContainer(root, use_cache=False).generate_prompts.write(
+            sink, root, None, [], max_tokens=1000,
+        )
+
+        assert [path.name for path, _ in report.dropped] == ['old.py', 'nested.py']
+        assert 'ALPHA BETA' in sink.getvalue()
+
+    def test_cached_token_counts_replace_size_guesses(self, tmp_path):
+        db, src = tmp_path / 'contents.sqlite', _write(tmp_path / 'dense.py', '(' * 400)
+        first = FileContentReader(cache=ContentCache(db, 1 << 20))
+        assert first.estimated_tokens(src, os.stat(src)) == 134      # 400 bytes / 3
+        tokens = first.read_content(src).tokens
+        first._cache.save()
+
+        reader = FileContentReader(cache=ContentCache(db, 1 << 20))
+        assert reader.estimated_tokens(src, os.stat(src)) == tokens == 400
@@ -0,0 +1,82 @@
+"""
+Test the streaming tree renderer: byte-identical to the nested-dict
+renderer it replaced, and indifferent to depth.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.domain.tree import render_tree
+
+
+def _reference(files: list[Path], root: Path) -> str:
+    """The renderer GeneratePrompts used before: a nested dict, rendered recursively."""
+    if not files:
+        return ''
+    lines = ['Directory structure:', '']
+    tree: dict = {}
+    for file_path in sorted(files):
+        try:
+            rel = file_path.relative_to(root)
+        except ValueError:
+            rel = file_path
+        node = tree
+        for part in rel.parts[:-1]:
+            node = node.setdefault(part, {})
+        node[rel.parts[-1]] = None
+
+    def render(node: dict, prefix: str) -> None:
+        items = sorted(node.items())
+        for i, (name, children) in enumerate(items):
+            lines.append(f"{prefix}{'└── ' if i == len(items) - 1 else '├── '}{name}")
+            if isinstance(children, dict):
+                render(children, prefix + ('    ' if i == len(items) - 1 else '│   '))
+
+    render(tree, '')
+    return '\n'.join(lines)
+
+
+@pytest.fixture
+def build_tree(tmp_path):
+    return AppContainer(tmp_path, use_cache=False).generate_prompts._build_tree
+
+
+def _random_files(rng: random.Random, root: Path, count: int) -> list[Path]:
+    names = ['a', 'a-b', 'a.txt', 'B', 'b', 'é', 'z z', '_', '10', '9']
+    files, dirs = set(), set()
+    while len(files) < count:
+        parts = [rng.choice(names) for _ in range(rng.randint(1, 5))]
+        prefixes = {tuple(parts[:i]) for i in range(1, len(parts))}
+        if tuple(parts) in dirs or prefixes & files:
+            continue   # A name cannot be a file and a directory at once
+        files.add(tuple(parts))
+        dirs |= prefixes
+    return [root.joinpath(*parts) for parts in files]
+
+
+def test_identical_to_the_nested_dict_renderer(build_tree):
+    rng = random.Random(1234)
+    root = Path('/project')
+    for count in (1, 2, 5, 40, 300):
+        files = _random_files(rng, root, count)
+        rng.shuffle(files)
+        assert build_tree(files, root) == _reference(files, root)
+
+
+def test_files_outside_the_root_and_duplicates(build_tree):
+    root = Path('/project')
+    files = [root / 'x.py', Path('/elsewhere/y.py'), root / 'x.py']
+    assert build_tree(files, root) == _reference(files, root)
+
+
+def test_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    lines = list(render_tree([tuple(f'd{i}' for i in range(depth)) + ('leaf.py',),
+                              ('top.py',)]))
+    assert lines[0] == '├── d0'
+    assert lines[depth] == '│   ' + ' ' * 4 * (depth - 1) + '└── leaf.py'
+    assert lines[-1] == '└── top.py'
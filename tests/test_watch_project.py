@@ -0,0 +1,181 @@
+"""
+Test the watch mode: incremental updates must match a fresh walk, change
+sources must report edits, and the prompt server must round-trip requests.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from gpt_automation.container import AppContainer
+from gpt_automation.infrastructure.watch import prompt_server
+from gpt_automation.infrastructure.watch.change_source import InotifyChangeSource, PollingChangeSource
+
+
+@pytest.fixture
+def project():
+    # Short path: Unix socket paths are limited to ~100 bytes
+    root = Path(tempfile.mkdtemp(prefix='gw', dir='/tmp' if Path('/tmp').is_dir() else None)).resolve()
+    AppContainer(root, use_cache=False).initialize_project.run([])
+    (root / 'src' / 'pkg').mkdir(parents=True)
+    (root / 'src' / 'pkg' / 'mod.py').write_text('x = 1\n')
+    (root / 'src' / 'main.py').write_text('print(1)\n')
+    (root / 'build').mkdir()
+    (root / 'build' / 'out.bin').write_text('bin\n')
+    (root / '.gitignore').write_text('build/\n*.log\n')
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def _fresh(root: Path, work: Path) -> str:
+    """What a one-shot `autogpt prompt` would produce right now."""
+    result = AppContainer(root, use_cache=False).generate_prompts.run(work, [])
+    return result.directory_tree + '\n----\n' + result.file_contents
+
+
+def _watched(watch, work: Path) -> str:
+    result = watch.prompt(work, [], [])
+    return result.directory_tree + '\n----\n' + result.file_contents
+
+
+class TestIncrementalUpdates:
+    @pytest.fixture
+    def watch(self, project):
+        watch = AppContainer(project, use_cache=False).watch_project
+        assert _watched(watch, project) == _fresh(project, project)
+        return watch
+
+    def _check(self, watch, project, *changed):
+        assert watch.apply_changes(set(changed)) is False
+        assert _watched(watch, project) == _fresh(project, project)
+
+    def test_added_file(self, watch, project):
+        (project / 'src' / 'pkg' / 'new.py').write_text('y = 2\n')
+        self._check(watch, project, project / 'src' / 'pkg' / 'new.py')
+
+    def test_edited_file_content_is_reread(self, watch, project):
+        (project / 'src' / 'main.py').write_text('print(2)\n')
+        self._check(watch, project, project / 'src' / 'main.py')
+        assert 'print(2)' in _watched(watch, project)
+
+    def test_deleted_directory(self, watch, project):
+        shutil.rmtree(project / 'src' / 'pkg')
+        self._check(watch, project, project / 'src' / 'pkg')
+
+    def test_added_directory_with_files(self, watch, project):
+        (project / 'src' / 'sub' / 'deep').mkdir(parents=True)
+        (project / 'src' / 'sub' / 'deep' / 'a.py').write_text('')
+        (project / 'src' / 'sub' / 'app.log').write_text('')
+        self._check(watch, project, project / 'src' / 'sub')
+
+    def test_nested_ignore_file_rewalks_its_subtree(self, watch, project):
+        (project / 'src' / '.gptignore').write_text('pkg/\n')
+        self._check(watch, project, project / 'src' / '.gptignore')
+        assert 'mod.py' not in _watched(watch, project)
+
+    def test_root_ignore_file_rebuilds(self, watch, project):
+        (project / '.gitignore').write_text('*.log\n')
+        self._check(watch, project, project / '.gitignore')
+        assert 'out.bin' in _watched(watch, project)
+
+    def test_change_in_excluded_directory_is_ignored(self, watch, project):
+        (project / 'build' / 'more.bin').write_text('')
+        self._check(watch, project, project / 'build' / 'more.bin')
+
+    def test_subdirectory_work_dir(self, watch, project):
+        work = project / 'src'
+        assert _watched(watch, work) == _fresh(project, work)
+        (project / 'src' / 'extra.py').write_text('')
+        self._check(watch, project, project / 'src' / 'extra.py')
+        assert _watched(watch, work) == _fresh(project, work)
+
+    def test_settings_change_requests_a_rebuild(self, watch, project):
+        assert watch.apply_changes({project / '.gpt' / 'settings' / 'base_settings.json'}) is True
+
+
+def _poll_until(source, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    seen = set()
+    while time.monotonic() < deadline:
+        seen |= source.poll(0.1)
+        if predicate(seen):
+            return seen
+    return seen
+
+
+class TestChangeSources:
+    def test_polling_reports_created_modified_and_deleted(self, project):
+        source = PollingChangeSource(project, ignored=[project / '.gpt' / 'logs'], interval=0.05)
+        (project / 'src' / 'new.py').write_text('')
+        (project / 'src' / 'main.py').write_text('changed, and longer\n')
+        (project / 'build' / 'out.bin').unlink()
+
+        expected = {project / 'src' / 'new.py', project / 'src' / 'main.py', project / 'build' / 'out.bin'}
+        assert expected <= _poll_until(source, lambda seen: expected <= seen)
+
+    def test_polling_skips_ignored_directories(self, project):
+        logs = project / '.gpt' / 'logs'
+        source = PollingChangeSource(project, ignored=[logs], interval=0.05)
+        (logs / 'app.log').write_text('noise\n')
+        (project / 'src' / 'new.py').write_text('')
+        seen = _poll_until(source, lambda seen: project / 'src' / 'new.py' in seen)
+        assert not any(logs in path.parents for path in seen)
+
+    @pytest.mark.skipif(not InotifyChangeSource.is_available(), reason="inotify is Linux-only")
+    def test_inotify_follows_new_directories(self, project):
+        source = InotifyChangeSource(project)
+        try:
+            (project / 'fresh').mkdir()
+            _poll_until(source, lambda seen: project / 'fresh' in seen)
+            (project / 'fresh' / 'inside.py').write_text('')
+            seen = _poll_until(source, lambda seen: project / 'fresh' / 'inside.py' in seen)
+            assert project / 'fresh' / 'inside.py' in seen
+        finally:
+            source.close()
+
+
+@pytest.mark.skipif(not prompt_server.is_supported(), reason="needs Unix domain sockets")
+class TestPromptServer:
+    def test_round_trip(self, project):
+        socket_path = project / '.gpt' / 'cache' / 'watch.sock'
+        server = prompt_server.PromptServer(socket_path, handler=lambda message: {'echo': message['work_dir']})
+        server.start()
+        try:
+            assert prompt_server.request(socket_path, {'work_dir': 'x'}) == {'echo': 'x'}
+            with pytest.raises(RuntimeError):
+                prompt_server.PromptServer(socket_path, handler=dict).start()
+        finally:
+            server.close()
+        assert prompt_server.request(socket_path, {'work_dir': 'x'}) is None
+
+    def test_watcher_answers_prompts_end_to_end(self, project):
+        container = AppContainer(project, use_cache=False)
+        server = prompt_server.PromptServer(container.paths.watch_socket,
+                                            container.watch_project.handle_request)
+        source = container.create_change_source(force_polling=True, interval=0.05)
+        stop = threading.Event()
+        worker = threading.Thread(target=container.watch_project.run, args=(source, stop, 0.05))
+        server.start()
+        worker.start()
+        try:
+            message = {'work_dir': str(project), 'tree_profiles': [], 'content_profiles': []}
+            first = prompt_server.request(container.paths.watch_socket, message)
+            assert first['file_contents'] == _fresh(project, project).split('\n----\n')[1]
+
+            (project / 'src' / 'late.py').write_text('late = True\n')
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                reply = prompt_server.request(container.paths.watch_socket, message)
+                if 'late = True' in reply['file_contents']:
+                    break
+                time.sleep(0.05)
+            assert 'late = True' in reply['file_contents']
+        finally:
+            stop.set()
+            worker.join()
+            server.close()
+            source.close()